@@ -0,0 +1,42 @@
+"""
+列式导出的读取谓词（get_agent_news 写入、report 与 peek_files 读取共用）
+pyarrow 为可选依赖，未安装时调用方应先判断并回退到 JSONL
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover
+    pa = None
+    ds = None
+
+
+def _to_utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def time_range_filter(start_dt: datetime, end_dt: datetime, partition_key: str = "date") -> Any:
+    """资讯导出的时间范围谓词：date 分区前后各放宽一天裁剪，再按 published_at（缺失时 fetched_at）精确过滤
+
+    分区按条目自身时区的日期划分，因此分区范围需要放宽；无时区的时间视为 UTC。
+    """
+    ts = pa.timestamp("us", tz="UTC")
+    start_utc = _to_utc(start_dt)
+    end_utc = _to_utc(end_dt)
+    lo = (start_utc.date() - timedelta(days=1)).isoformat()
+    hi = (end_utc.date() + timedelta(days=1)).isoformat()
+    start_s, end_s = pa.scalar(start_utc, ts), pa.scalar(end_utc, ts)
+    pub = ds.field("published_at")
+    fetched = ds.field("fetched_at")
+    return (
+        (ds.field(partition_key) >= lo)
+        & (ds.field(partition_key) <= hi)
+        & (
+            (pub.is_valid() & (pub >= start_s) & (pub <= end_s))
+            | (pub.is_null() & (fetched >= start_s) & (fetched <= end_s))
+        )
+    )
@@ -23,6 +23,7 @@ if __package__ is None or __package__ == "":
 import argparse
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -30,15 +31,28 @@ import yaml
 
 from src.models import NewsItem
 from src.pipelines.normalize import normalize_items
-from src.pipelines.deduplicate import deduplicate_items, get_deduplication_stats
+from src.pipelines.deduplicate import commit_seen_hashes, deduplicate_items, get_deduplication_stats, configure_persistent_store
+from src.pipelines.near_dedup import near_deduplicate_items, get_near_dedup_stats
+from src.pipelines.rank import HeuristicScorer, rank_items, rank_items_llm
 from src.sources.rss_adapter import fetch_rss
 from src.sources.web_adapter import fetch_web
-from src.sources.wechat_adapter import fetch_wechat_search
+from src.sources.wechat_adapter import fetch_wechat_sources
 from src.sources.aibase_daily import export_aibase_daily
+from src.sources.common import request_stats, source_scope
+from src.sources.html_backend import HTML_PARSERS, set_default_parser
+from src.sources.source_spec import CompiledSources, SourceSpecError, compile_sources
+from src.pipelines.prefilter import compile_prefilter
 from src.storage.file_storage import save_items_to_directory, FileStorage
+from src.storage.dedup_store import DEFAULT_DEDUP_DB_PATH
+from src.storage.watermarks import DEFAULT_WATERMARK_PATH, WatermarkStore
+from src.storage.score_cache import DEFAULT_SCORE_CACHE_PATH, ScoreCache
+from src.storage.content_cache import DEFAULT_CONTENT_CACHE_PATH, ContentCache
+from src.storage.news_index import DEFAULT_NEWS_INDEX_PATH, NewsSearchIndex
+from src.storage.run_manifest import RunManifest
 from src.config import get_sources_path, get_log_path
 from src.pipelines.markdown_export import export_news_items_by_date
 from src.pipelines.markdown_index import build_index
+from src.tools.url_canon import UrlCanonicalizer
 
 
 logger = logging.getLogger("main")
@@ -61,35 +75,50 @@ def load_sources(path: str) -> Dict[str, Any]:
         return yaml.safe_load(f) or {}
 
 
-def iter_items_from_sources(sources_cfg: Dict[str, Any], since_days: int, web_since_days: Optional[int] = None) -> Iterable[NewsItem]:
+def iter_items_from_sources(
+    sources_cfg: Dict[str, Any],
+    since_days: int,
+    web_since_days: Optional[int] = None,
+    watermarks: Optional[WatermarkStore] = None,
+    compiled: Optional[CompiledSources] = None,
+    wechat_workers: int = 4,
+    manifest: Optional[RunManifest] = None,
+) -> Iterable[NewsItem]:
     cutoff = datetime.now(timezone.utc) - timedelta(days=since_days)
     web_cutoff = datetime.now(timezone.utc) - timedelta(days=web_since_days if web_since_days is not None else since_days)
 
     rss_list = (sources_cfg.get("rss", []) or [])
     web_list = (sources_cfg.get("web", []) or [])
     wechat_list = (sources_cfg.get("wechat", []) or [])
-    daily_list = (sources_cfg.get("daily", []) or [])
 
-    enabled_rss = [s for s in rss_list if s.get("enabled", True)]
-    enabled_web = [s for s in web_list if s.get("enabled", True)]
-    enabled_wechat = [s for s in wechat_list if s.get("enabled", True)]
-    enabled_daily = [s for s in daily_list if s.get("enabled", True)]
+    # 配置在抓取前一次性校验并编译，不合法的来源已记录错误并跳过
+    if compiled is None:
+        compiled = compile_sources(sources_cfg)
     logger.info(
-        "来源统计: rss(total=%s, enabled=%s), web(total=%s, enabled=%s), wechat(total=%s, enabled=%s)",
-        len(rss_list), len(enabled_rss), len(web_list), len(enabled_web), len(wechat_list), len(enabled_wechat)
+        "来源统计: rss(total=%s, enabled=%s), web(total=%s, enabled=%s), wechat(total=%s, enabled=%s), invalid=%s",
+        len(rss_list), len(compiled.rss), len(web_list), len(compiled.web), len(wechat_list), len(compiled.wechat),
+        len(compiled.errors),
     )
 
     # RSS
-    for rss_entry in enabled_rss:
-        name = rss_entry.get("name")
-        url = rss_entry.get("url")
-        tags = rss_entry.get("tags", [])
+    for rss_plan in compiled.rss:
+        name = rss_plan.name
+        url = rss_plan.url
+        tags = rss_plan.tags
+        t0 = time.perf_counter()
         try:
-            raw_items = list(fetch_rss(name, url, tags))
+            with source_scope(name):
+                raw_items = list(fetch_rss(name, url, tags))
         except Exception as e:
             logger.exception("RSS 抓取失败: name=%s url=%s err=%s", name, url, e)
+            if manifest is not None:
+                manifest.record_source(name, kind="rss", seconds=round(time.perf_counter() - t0, 3), failed=str(e))
             continue
         kept = [i for i in raw_items if not i.published_at or i.published_at >= cutoff]
+        if manifest is not None:
+            manifest.record_source(
+                name, kind="rss", raw=len(raw_items), kept=len(kept), seconds=round(time.perf_counter() - t0, 3)
+            )
         logger.info(
             "RSS 完成: name=%s url=%s raw=%s kept=%s cutoff=%s",
             name, url, len(raw_items), len(kept), cutoff.isoformat()
@@ -98,43 +127,40 @@ def iter_items_from_sources(sources_cfg: Dict[str, Any], since_days: int, web_si
             yield item
 
     # Web
-    for web_entry in enabled_web:
-        name = web_entry.get("name")
-        url = web_entry.get("url")
-        tags = web_entry.get("tags", [])
-        selector = (web_entry.get("selector") or {})
-        filters = (web_entry.get("filters") or {})
-        pagination = (web_entry.get("pagination") or {})
-        include_keywords = filters.get("include_keywords", [])
-        if not selector or not selector.get("item"):
-            logger.warning("Web 来源缺少 selector.item: name=%s url=%s", name, url)
-            continue
+    for web_plan in compiled.web:
+        name = web_plan.name
+        url = web_plan.url
+        t0 = time.perf_counter()
         try:
             logger.info(
                 "Web 调用配置: name=%s selector.item=%s url_attr=%s title_attr=%s pagination=%s include_keywords=%s",
                 name,
-                selector.get("item"),
-                selector.get("url_attr", "href"),
-                selector.get("title_attr", "text"),
-                pagination or {},
-                include_keywords,
+                web_plan.item_selector.selector,
+                web_plan.url_attr,
+                web_plan.title_attr,
+                web_plan.pagination or {},
+                web_plan.include_keywords,
             )
-            raw_items = list(
-                fetch_web(
-                    name=name,
-                    url=url,
-                    selector_item=selector.get("item"),
-                    url_attr=selector.get("url_attr", "href"),
-                    title_attr=selector.get("title_attr", "text"),
-                    include_keywords=include_keywords,
-                    tags=tags,
-                    pagination=pagination,
+            with source_scope(name):
+                raw_items = list(
+                    fetch_web(
+                        name=name,
+                        url=url,
+                        selector_item=web_plan.item_selector.selector,
+                        plan=web_plan,
+                        watermark=watermarks.get(name) if watermarks else None,
+                    )
                 )
-            )
         except Exception as e:
             logger.exception("Web 抓取失败: name=%s url=%s err=%s", name, url, e)
+            if manifest is not None:
+                manifest.record_source(name, kind="web", seconds=round(time.perf_counter() - t0, 3), failed=str(e))
             continue
         kept = [i for i in raw_items if i.fetched_at >= web_cutoff]
+        if manifest is not None:
+            manifest.record_source(
+                name, kind="web", raw=len(raw_items), kept=len(kept), seconds=round(time.perf_counter() - t0, 3)
+            )
         logger.info(
             "Web 完成: name=%s url=%s raw=%s kept=%s cutoff(web)=%s",
             name, url, len(raw_items), len(kept), web_cutoff.isoformat()
@@ -142,21 +168,20 @@ def iter_items_from_sources(sources_cfg: Dict[str, Any], since_days: int, web_si
         for item in kept:
             yield item
 
-    # WeChat (via Sogou search)
-    for w_entry in enabled_wechat:
-        name = w_entry.get("name")
-        query = w_entry.get("query")
-        tags = w_entry.get("tags", [])
-        max_pages = int(w_entry.get("max_pages", 1))
-        if not query:
-            logger.warning("WeChat 来源缺少 query: name=%s", name)
-            continue
-        try:
-            raw_items = list(fetch_wechat_search(name=name, query=query, tags=tags, max_pages=max_pages))
-        except Exception as e:
-            logger.exception("WeChat 抓取失败: name=%s query=%s err=%s", name, query, e)
+    # WeChat (via Sogou search)：多个查询共享会话并发抓取，逐页预取
+    # 不挂水位：搜狗跳转链接的 url 参数每次请求都变、结果没有发布时间，水位永远无法命中
+    wechat_results = fetch_wechat_sources(compiled.wechat, max_workers=wechat_workers)
+    for w_plan, raw_items, err, seconds in wechat_results:
+        name = w_plan.name
+        query = w_plan.query
+        if err is not None:
+            logger.error("WeChat 抓取失败: name=%s query=%s err=%s", name, query, err, exc_info=err)
+            if manifest is not None:
+                manifest.record_source(name, kind="wechat", seconds=round(seconds, 3), failed=str(err))
             continue
         kept = [i for i in raw_items if i.fetched_at >= web_cutoff]
+        if manifest is not None:
+            manifest.record_source(name, kind="wechat", raw=len(raw_items), kept=len(kept), seconds=round(seconds, 3))
         logger.info(
             "WeChat 完成: name=%s query=%s raw=%s kept=%s cutoff(web)=%s",
             name, query, len(raw_items), len(kept), web_cutoff.isoformat()
@@ -167,6 +192,24 @@ def iter_items_from_sources(sources_cfg: Dict[str, Any], since_days: int, web_si
     # AIbase Daily 导出移动至 main 中按 CLI 控制执行
 
 
+def _write_run_manifest(manifest: RunManifest, args: argparse.Namespace) -> None:
+    """汇总请求统计并写入运行清单；清单写入失败只告警，不影响运行结果
+
+    仅日报的运行没有导出目录，不写清单也不登记到 runs.json，避免留下只有清单的运行目录；
+    --no-run-manifest 只跳过 run_manifest.json，runs.json 照常登记（报告按索引列出运行目录）。
+    """
+    if args.source == "daily":
+        return
+    try:
+        if args.no_run_manifest:
+            manifest.write_index(args.export_dir)
+            return
+        manifest.merge_request_stats(request_stats.snapshot())
+        manifest.write(args.export_dir)
+    except Exception as exc:
+        logger.warning("写入运行清单失败: %s", exc)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Weekly AI Agent/LLM news fetcher")
     parser.add_argument("--once", action="store_true", help="单次运行一次抓取流程")
@@ -178,9 +221,32 @@ def main() -> int:
     parser.add_argument("--export-markdown", action="store_true", help="将抓取结果导出为 Markdown 到 content/")
     parser.add_argument("--stop-on-duplicate-daily", action="store_true", default=True, help="日报遇重复即停止分页")
     parser.add_argument("--max-pages-daily", type=int, default=0, help="日报抓取最大页数（0 表示按配置）")
+    parser.add_argument("--wechat-workers", type=int, default=4, help="微信搜索来源并发数（共享会话，仍受主机级速率限制）")
+    parser.add_argument("--daily-workers", type=int, default=4, help="日报详情页并发抓取线程数（仍受主机级速率限制）")
+    parser.add_argument("--dedup-db", default=DEFAULT_DEDUP_DB_PATH, help="跨运行去重索引（SQLite）路径，传空字符串关闭")
+    parser.add_argument("--dedup-ttl-days", type=float, default=90, help="去重索引条目过期天数（<=0 表示永不过期）")
+    parser.add_argument("--near-dedup", choices=["off", "drop", "group"], default="off", help="跨来源近重复处理：drop 仅保留代表条目，group 保留全部并标记 cluster_id")
+    parser.add_argument("--rank", choices=["off", "heuristic", "llm"], default="off", help="排序打分：heuristic 启发式；llm 仅对未缓存条目调用大模型分批打分")
+    parser.add_argument("--score-cache", default=DEFAULT_SCORE_CACHE_PATH, help="LLM 打分缓存（SQLite）路径")
+    parser.add_argument("--rank-batch-size", type=int, default=20, help="LLM 打分每批条目数")
+    parser.add_argument("--rank-workers", type=int, default=4, help="LLM 打分并发批次数")
+    parser.add_argument("--enrich", action="store_true", help="抓取文章正文并抽取主体文本（按 url_hash 缓存，补全空摘要）")
+    parser.add_argument("--content-cache", default=DEFAULT_CONTENT_CACHE_PATH, help="正文抽取缓存（SQLite）路径")
+    parser.add_argument("--enrich-concurrency", type=int, default=8, help="正文抓取并发数（同一主机仍按速率限制间隔请求）")
+    parser.add_argument("--export-background-flush", action="store_true", help="导出由后台线程写入并定期 flush")
+    parser.add_argument("--no-parquet", action="store_true", help="不写入按日期分区的 Parquet 列式导出")
+    parser.add_argument("--news-index", default=DEFAULT_NEWS_INDEX_PATH, help="全部导出的全文检索索引（SQLite FTS5）路径，传空字符串关闭")
+    parser.add_argument("--watermark-path", default=DEFAULT_WATERMARK_PATH, help="来源增量水位文件路径，传空字符串关闭（关闭后每次按 max_pages 全量翻页）")
+    parser.add_argument("--file-metrics", default=os.path.join("data", "state", "file_metrics"), help="文件 I/O 指标输出前缀（写入 .json 与 .prom），传空字符串关闭")
+    parser.add_argument("--near-dedup-threshold", type=float, default=0.6, help="近重复判定的相似度阈值（0..1）")
+    parser.add_argument("--html-parser", choices=list(HTML_PARSERS), default=None, help="默认 HTML 解析器（来源可用 parser 字段单独指定；未安装时回退到 html.parser）")
+    parser.add_argument("--no-prefilter", action="store_true", help="忽略 sources.yaml 中的 prefilter 配置，不做入库前预过滤")
+    parser.add_argument("--no-run-manifest", action="store_true", help="不写入运行目录下的 run_manifest.json（导出根目录的 runs.json 仍会登记本次运行）")
+    parser.add_argument("--check-sources", action="store_true", help="只校验并编译 sources.yaml 中的来源配置后退出（有错误时返回 2）")
     args = parser.parse_args()
 
     setup_logging(args.log_level)
+    set_default_parser(args.html_parser)
 
     try:
         sources_path = get_sources_path()
@@ -190,9 +256,39 @@ def main() -> int:
         logger.error("未找到 sources.yaml: %s", get_sources_path())
         return 2
 
+    # 抓取前一次性校验并编译来源配置
+    compiled_sources = compile_sources(sources)
+    prefilter = None
+    try:
+        prefilter = compile_prefilter(sources)
+    except SourceSpecError as exc:
+        logger.error("%s", exc)
+        compiled_sources.errors.append(exc)
+    if args.check_sources:
+        logger.info(
+            "来源配置校验: rss=%s web=%s wechat=%s errors=%s",
+            len(compiled_sources.rss), len(compiled_sources.web), len(compiled_sources.wechat),
+            len(compiled_sources.errors),
+        )
+        return 2 if compiled_sources.errors else 0
+
     # 创建本次运行目录（用于保存导出数据）
     run_time = datetime.now()
     run_dir_name = run_time.strftime("%Y%m%d_%H%M%S")
+    manifest = RunManifest(
+        run_time,
+        run_dir_name,
+        params={
+            "source": args.source,
+            "since_days": args.since_days,
+            "news_since_days": args.news_since_days,
+            "near_dedup": args.near_dedup,
+            "rank": args.rank,
+            "enrich": args.enrich,
+            "prefilter": prefilter is not None and not args.no_prefilter,
+            "export_markdown": args.export_markdown,
+        },
+    )
 
     try:
         # 初始化文件系统存储
@@ -216,38 +312,142 @@ def main() -> int:
                 max_pages = args.max_pages_daily if args.max_pages_daily > 0 else max_pages_cfg
                 try:
                     logger.info("AIbase 日报导出: name=%s url=%s max_pages=%s api=%s", name, url, max_pages, bool(api_cfg))
-                    written = export_aibase_daily(
-                        url,
-                        output_dir=content_root,
-                        max_pages=max_pages,
-                        api_config=api_cfg,
-                        stop_on_duplicate=args.stop_on_duplicate_daily,
-                        # storage=storage, # Removed SQLiteStorage
-                    )
+                    t0 = time.perf_counter()
+                    with manifest.stage("daily"), source_scope(name):
+                        written = export_aibase_daily(
+                            url,
+                            output_dir=content_root,
+                            max_pages=max_pages,
+                            api_config=api_cfg,
+                            stop_on_duplicate=args.stop_on_duplicate_daily,
+                            max_workers=args.daily_workers,
+                            parser=d_entry.get("parser"),
+                            # storage=storage, # Removed SQLiteStorage
+                        )
                     new_daily_written += len(written)
+                    manifest.record_source(
+                        name, kind="daily", written=len(written), seconds=round(time.perf_counter() - t0, 3)
+                    )
                     logger.info("AIbase 日报导出完成: name=%s written=%s", name, len(written))
                 except Exception as e:
                     logger.exception("AIbase 日报导出失败: name=%s url=%s err=%s", name, url, e)
+                    manifest.record_source(name, kind="daily", failed=str(e))
+            manifest.counts["daily_written"] = new_daily_written
 
         # 处理资讯（news）
         items: List[NewsItem] = []
         new_news_written = 0
         if args.source in ("news", "all"):
-            items = list(iter_items_from_sources(sources, since_days=args.since_days, web_since_days=args.news_since_days))
+            configure_persistent_store(args.dedup_db, ttl_days=args.dedup_ttl_days if args.dedup_ttl_days > 0 else None)
+            canonicalizer = UrlCanonicalizer.from_config(sources.get("url_canonicalization"))
+            watermarks = WatermarkStore(args.watermark_path, canonicalizer=canonicalizer) if args.watermark_path else None
+            raw_iter = iter_items_from_sources(
+                sources,
+                since_days=args.since_days,
+                web_since_days=args.news_since_days,
+                watermarks=watermarks,
+                compiled=compiled_sources,
+                wechat_workers=args.wechat_workers,
+                manifest=manifest,
+            )
+            # 预过滤在归一化、去重与导出之前丢弃不相关条目
+            use_prefilter = prefilter is not None and not args.no_prefilter
+            with manifest.stage("fetch"):
+                items = list(prefilter.filter(raw_iter) if use_prefilter else raw_iter)
+            if use_prefilter:
+                prefilter.log_stats()
+                manifest.caches["prefilter"] = prefilter.get_stats()
+            manifest.counts["candidates"] = len(items)
             if not items:
                 logger.warning("未获取到任何候选项，请检查网络、代理、sources.yaml 或选择器/关键词设置。")
             else:
                 logger.info("候选项数量: %s", len(items))
-            items = normalize_items(items)
-            items = deduplicate_items(items)
-            export_path = save_items_to_directory(items, base_dir=args.export_dir, run_time=run_time)
+            with manifest.stage("normalize"):
+                items = normalize_items(items, canonicalizer=canonicalizer)
+            with manifest.stage("dedup"):
+                items = deduplicate_items(items)
+            # 跨运行去重索引在导出成功后才写入（与水位一致），失败运行不会把条目标记为已见
+            seen_hashes = [i.url_hash for i in items]
+            manifest.counts["after_dedup"] = len(items)
+            if args.near_dedup != "off":
+                with manifest.stage("near_dedup"):
+                    items = near_deduplicate_items(items, mode=args.near_dedup, threshold=args.near_dedup_threshold)
+                manifest.caches["near_dedup"] = get_near_dedup_stats()
+            if args.enrich and items:
+                from src.pipelines.enrich import enrich_items
+
+                content_cache = ContentCache(args.content_cache)
+                try:
+                    with manifest.stage("enrich"):
+                        enrich_items(items, content_cache, max_concurrency=args.enrich_concurrency)
+                    manifest.caches["content"] = content_cache.get_stats()
+                    logger.info("正文缓存统计: %s", manifest.caches["content"])
+                finally:
+                    content_cache.close()
+            scorer = HeuristicScorer.from_config(sources.get("ranking"))
+            if args.rank == "heuristic":
+                with manifest.stage("rank"):
+                    items = rank_items(items, scorer=scorer)
+            elif args.rank == "llm" and items:
+                from src.llm.deepseek_client import DeepSeekClient
+
+                score_cache = ScoreCache(args.score_cache)
+                try:
+                    with manifest.stage("rank"):
+                        items = rank_items_llm(
+                            items,
+                            DeepSeekClient(),
+                            cache=score_cache,
+                            batch_size=args.rank_batch_size,
+                            max_workers=args.rank_workers,
+                            scorer=scorer,
+                        )
+                    manifest.caches["score"] = score_cache.get_stats()
+                    logger.info("打分缓存统计: %s", manifest.caches["score"])
+                finally:
+                    score_cache.close()
+            with manifest.stage("export"):
+                export_path = save_items_to_directory(
+                    items,
+                    base_dir=args.export_dir,
+                    run_time=run_time,
+                    background_flush=args.export_background_flush,
+                    columnar=not args.no_parquet,
+                    stats=file_storage.stats_collector,
+                )
             logger.info("已保存到目录: %s", export_path)
+            manifest.counts["exported"] = len(items)
+            manifest.observe_items(items)
+            manifest.observe_outputs(export_path)
+            if args.news_index:
+                # 增量并入本次运行（以及尚未索引的历史运行）；索引失败不影响导出结果
+                try:
+                    news_index = NewsSearchIndex(args.news_index)
+                    try:
+                        with manifest.stage("index"):
+                            news_index.update_from_exports(args.export_dir)
+                        manifest.caches["news_index"] = news_index.get_stats()
+                        logger.info("资讯全文索引: %s", manifest.caches["news_index"])
+                    finally:
+                        news_index.close()
+                except Exception:
+                    logger.exception("更新资讯全文索引失败")
+            # 导出成功后再写入去重索引、推进水位，避免失败运行跳过未落盘的条目
+            commit_seen_hashes(seen_hashes)
+            if watermarks is not None:
+                watermarks.save()
+                manifest.caches["watermarks"] = watermarks.get_stats()
+                logger.info("增量水位: %s", manifest.caches["watermarks"])
 
             # 可选：资讯 Markdown（按日期分组）
             if args.export_markdown and items:
                 try:
-                    exported_paths = export_news_items_by_date(items, base_dir=content_root)
+                    with manifest.stage("markdown"):
+                        exported_paths = export_news_items_by_date(
+                            items, base_dir=content_root, stats=file_storage.stats_collector
+                        )
                     new_news_written = len(exported_paths)
+                    manifest.counts["news_markdown_files"] = new_news_written
                     logger.info("已导出 %s 个日期的资讯文件", new_news_written)
                 except Exception:
                     logger.exception("导出资讯 Markdown 失败")
@@ -267,6 +467,8 @@ def main() -> int:
             logger.info("目录页生成: %s", index_path)
     except Exception as exc:
         logger.exception("抓取流程失败: %s", exc)
+        manifest.status = "failed"
+        _write_run_manifest(manifest, args)
         return 2
 
     # 对于仅日报场景，items 可能为空
@@ -275,11 +477,23 @@ def main() -> int:
     # 输出存储统计
     storage_stats = file_storage.get_storage_stats()
     logger.info("存储统计: %s", storage_stats)
+    if args.file_metrics:
+        try:
+            file_storage.stats_collector.export(
+                json_path=args.file_metrics + ".json", prom_path=args.file_metrics + ".prom"
+            )
+        except Exception as exc:
+            logger.warning("写入文件指标失败: %s", exc)
     
     # 输出去重统计
     dedup_stats = get_deduplication_stats()
     logger.info("去重统计: %s", dedup_stats)
-    
+    if args.near_dedup != "off":
+        logger.info("近重复统计: %s", get_near_dedup_stats())
+
+    manifest.caches["dedup"] = dedup_stats
+    manifest.status = "ok"
+    _write_run_manifest(manifest, args)
     return 0
 
 
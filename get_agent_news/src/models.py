@@ -18,6 +18,7 @@ class NewsItem:
     fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     url_hash: str = ""
     score: Optional[float] = None  # ranking score 0..1
+    cluster_id: Optional[str] = None  # near-duplicate cluster (canonical url_hash)
 
     def ensure_hash(self) -> None:
         if not self.url_hash:
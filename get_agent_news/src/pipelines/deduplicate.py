@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import logging
 from collections import OrderedDict
-from typing import Iterable, List, Set
+from typing import Iterable, List, Optional, Set
 
 from src.models import NewsItem
+from src.storage.dedup_store import PersistentDedupStore
 
 log = logging.getLogger("dedup")
 
@@ -75,31 +76,69 @@ class LRUDeduplicator:
 # 全局LRU去重器实例
 _lru_deduplicator = LRUDeduplicator()
 
+# 跨运行的持久化去重索引（可选，由 configure_persistent_store 启用）
+_persistent_store: Optional[PersistentDedupStore] = None
+
+
+def configure_persistent_store(db_path: Optional[str], ttl_days: Optional[float] = None) -> Optional[PersistentDedupStore]:
+    """启用（或关闭）跨运行持久化去重索引
+
+    Args:
+        db_path: SQLite 文件路径；为空则关闭持久化去重
+        ttl_days: 条目过期天数；为空表示永不过期
+
+    Returns:
+        当前生效的持久化索引实例
+    """
+    global _persistent_store
+    if _persistent_store is not None:
+        _persistent_store.close()
+        _persistent_store = None
+    if db_path:
+        _persistent_store = PersistentDedupStore(db_path, ttl_days=ttl_days)
+        log.info("持久化去重索引: path=%s size=%s ttl_days=%s", db_path, _persistent_store.size(), ttl_days)
+    return _persistent_store
+
 
 def deduplicate_items(items: Iterable[NewsItem]) -> List[NewsItem]:
-    """使用LRU缓存进行去重"""
+    """使用LRU缓存进行本轮去重；若已启用持久化索引，同时剔除历史运行中出现过的条目
+
+    本轮保留条目的哈希不会在此写入持久化索引，需在导出成功后调用 commit_seen_hashes，
+    避免失败运行把未落盘的条目标记为已见。本批次内的重复由不限容量的集合判定，
+    候选数超过 LRU 容量时也不会因淘汰而重复导出同一 url_hash。
+    """
     unique: List[NewsItem] = []
+    seen: Set[str] = set()
     duplicates = 0
+    history_duplicates = 0
     
     for item in items:
         item.ensure_hash()
         
-        if _lru_deduplicator.is_duplicate(item.url_hash):
+        # LRU 仍参与判定以保留命中率统计；本批次是否重复以 seen 为准
+        lru_hit = _lru_deduplicator.is_duplicate(item.url_hash)
+        if lru_hit or item.url_hash in seen:
             duplicates += 1
             continue
+        seen.add(item.url_hash)
         
         # 添加到缓存
         _lru_deduplicator.add_url_hash(item.url_hash)
+
+        if _persistent_store is not None and _persistent_store.contains(item.url_hash):
+            history_duplicates += 1
+            continue
         unique.append(item)
-    
+
     # 获取缓存统计
     cache_stats = _lru_deduplicator.get_cache_stats()
     
     log.info(
-        "去重: 原始=%s 唯一=%s 重复=%s 缓存大小=%s/%s 命中率=%.2f%%",
-        len(unique) + duplicates,
+        "去重: 原始=%s 唯一=%s 重复=%s 历史重复=%s 缓存大小=%s/%s 命中率=%.2f%%",
+        len(unique) + duplicates + history_duplicates,
         len(unique),
         duplicates,
+        history_duplicates,
         cache_stats["cache_size"],
         cache_stats["cache_capacity"],
         cache_stats["hit_rate"] * 100
@@ -108,6 +147,16 @@ def deduplicate_items(items: Iterable[NewsItem]) -> List[NewsItem]:
     return unique
 
 
+def commit_seen_hashes(url_hashes: Iterable[str]) -> int:
+    """把已成功导出的条目哈希写入持久化索引（未启用时忽略），返回写入数量"""
+    if _persistent_store is None:
+        return 0
+    return _persistent_store.add_many(url_hashes)
+
+
 def get_deduplication_stats() -> dict:
-    """获取去重统计信息"""
-    return _lru_deduplicator.get_cache_stats()
+    """获取去重统计信息（启用持久化索引时附带 persistent 字段）"""
+    stats = _lru_deduplicator.get_cache_stats()
+    if _persistent_store is not None:
+        stats["persistent"] = _persistent_store.get_stats()
+    return stats
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from src.models import NewsItem
+from src.sources.common import DEFAULT_HEADERS_HTML, HostRateLimiter
+from src.sources.html_backend import make_soup
+from src.storage.content_cache import STATUS_EMPTY, STATUS_ERROR, STATUS_OK, ContentCache
+
+log = logging.getLogger("enrich")
+
+# 常见正文容器，按优先级匹配（#js_content 为微信公众号文章）
+_CONTENT_SELECTORS = [
+    "#js_content",
+    "[itemprop='articleBody']",
+    "article",
+    ".article-content",
+    ".post-content",
+    ".entry-content",
+    ".article",
+    ".content",
+    "main",
+    "#content",
+]
+_NOISE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe"]
+_BLOCK_SELECTOR = "p, li, h2, h3, h4, pre, blockquote"
+_MIN_CONTAINER_CHARS = 200
+_WS_RE = re.compile(r"[ \t　\xa0]+")
+
+
+def extract_main_text(html: str, max_chars: int = 20000) -> str:
+    """从 HTML 中抽取正文纯文本（段落以换行分隔）
+
+    先按常见正文容器匹配；都不满足最小长度时，选取直接包含段落文本最多的元素作为正文容器。
+    """
+    soup = make_soup(html)
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+
+    container = None
+    for sel in _CONTENT_SELECTORS:
+        el = soup.select_one(sel)
+        if el is not None and len(el.get_text(strip=True)) >= _MIN_CONTAINER_CHARS:
+            container = el
+            break
+    if container is None:
+        # 段落密度：以段落父元素为单位累计文本长度
+        weights: Dict[int, Tuple[Any, int]] = {}
+        for p in soup.find_all("p"):
+            parent = p.parent
+            if parent is None:
+                continue
+            prev = weights.get(id(parent))
+            weights[id(parent)] = (parent, (prev[1] if prev else 0) + len(p.get_text(strip=True)))
+        if weights:
+            container = max(weights.values(), key=lambda kv: kv[1])[0]
+    container = container or soup.body or soup
+
+    lines: List[str] = []
+    seen = set()
+    total = 0
+    blocks = container.select(_BLOCK_SELECTOR) or [container]
+    block_ids = {id(b) for b in blocks}
+    for block in blocks:
+        # 嵌套块（如 li 内的 p）只取最外层
+        if any(id(parent) in block_ids for parent in block.parents):
+            continue
+        text = _WS_RE.sub(" ", block.get_text(" ", strip=True)).strip()
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        lines.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(lines)[:max_chars]
+
+
+def _excerpt(text: str, limit: int) -> str:
+    flat = " ".join(text.split())
+    return flat if len(flat) <= limit else flat[:limit].rstrip() + "…"
+
+
+class _Fetcher:
+    """线程池侧的抓取器：每线程独立 Session，每个主机独立速率限制"""
+
+    def __init__(self, per_host_interval_s: float, timeout: float, max_chars: int) -> None:
+        self.per_host_interval_s = per_host_interval_s
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._local = threading.local()
+        self._limiters: Dict[str, HostRateLimiter] = defaultdict(lambda: HostRateLimiter(self.per_host_interval_s))
+        self._lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+
+    def _session(self) -> requests.Session:
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            sess = requests.Session()
+            self._local.session = sess
+            with self._lock:
+                self._sessions.append(sess)
+        return sess
+
+    def _limiter(self, url: str) -> HostRateLimiter:
+        with self._lock:
+            return self._limiters[urlparse(url).netloc.lower()]
+
+    def fetch_and_extract(self, url: str) -> str:
+        self._limiter(url).wait()
+        resp = self._session().get(url, headers=DEFAULT_HEADERS_HTML, timeout=self.timeout)
+        resp.raise_for_status()
+        if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
+            resp.encoding = resp.apparent_encoding
+        return extract_main_text(resp.text, max_chars=self.max_chars)
+
+    def close(self) -> None:
+        for sess in self._sessions:
+            sess.close()
+
+
+async def _enrich_async(
+    pending: List[NewsItem],
+    fetcher: _Fetcher,
+    cache: ContentCache,
+    max_concurrency: int,
+) -> Dict[str, str]:
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+    results: Dict[str, str] = {}
+    counts = {"ok": 0, "empty": 0, "error": 0}
+
+    async def _one(item: NewsItem) -> None:
+        async with sem:
+            try:
+                text = await asyncio.to_thread(fetcher.fetch_and_extract, item.url)
+            except Exception as exc:
+                counts["error"] += 1
+                log.debug("正文抓取失败: url=%s err=%s", item.url, exc)
+                await asyncio.to_thread(cache.put, item.url_hash, item.url, STATUS_ERROR, "", str(exc)[:500])
+                return
+        status = STATUS_OK if text else STATUS_EMPTY
+        counts[status] += 1
+        await asyncio.to_thread(cache.put, item.url_hash, item.url, status, text)
+        if text:
+            results[item.url_hash] = text
+
+    await asyncio.gather(*(_one(it) for it in pending))
+    log.info("正文抓取完成: %s", counts)
+    return results
+
+
+def enrich_items(
+    items: List[NewsItem],
+    cache: ContentCache,
+    max_concurrency: int = 8,
+    per_host_interval_s: float = 1.0,
+    timeout: float = 10.0,
+    max_chars: int = 20000,
+    summary_chars: int = 300,
+    max_attempts: int = 2,
+) -> Dict[str, str]:
+    """正文补全：抓取缺少缓存的文章正文并抽取主体文本，按 url_hash 写入缓存
+
+    已缓存（含已判定为空正文）的条目不再抓取；失败的条目在后续运行中最多重试到 max_attempts 次。
+    摘要为空的条目以正文开头截取 summary_chars 字作为摘要。
+
+    Args:
+        items: 资讯条目（需已计算 url_hash）
+        cache: 正文缓存
+        max_concurrency: 同时进行的抓取数
+        per_host_interval_s: 同一主机两次请求的最小间隔
+
+    Returns:
+        url_hash -> 正文文本（本批条目中可用的正文）
+    """
+    for it in items:
+        it.ensure_hash()
+    cached = cache.get_many(it.url_hash for it in items)
+    texts: Dict[str, str] = {h: c.text for h, c in cached.items() if c.status == STATUS_OK and c.text}
+    pending: List[NewsItem] = []
+    queued = set()
+    for it in items:
+        c = cached.get(it.url_hash)
+        if it.url_hash in queued or not it.url.startswith(("http://", "https://")):
+            continue
+        if c is None or (c.status == STATUS_ERROR and c.attempts < max_attempts):
+            pending.append(it)
+            queued.add(it.url_hash)
+    log.info("正文补全: 条目=%s 缓存命中=%s 待抓取=%s", len(items), len(texts), len(pending))
+
+    if pending:
+        fetcher = _Fetcher(per_host_interval_s, timeout, max_chars)
+        try:
+            texts.update(asyncio.run(_enrich_async(pending, fetcher, cache, max_concurrency)))
+        finally:
+            fetcher.close()
+
+    filled = 0
+    for it in items:
+        text = texts.get(it.url_hash)
+        if text and not (it.summary or "").strip():
+            it.summary = _excerpt(text, summary_chars)
+            filled += 1
+    log.info("正文补全摘要: %s 条", filled)
+    return texts
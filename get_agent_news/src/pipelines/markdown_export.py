@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import logging
 import os
-from collections import defaultdict
+import time
 from datetime import datetime
 from typing import List, Optional
 
 from src.models import NewsItem
+from src.storage.date_file_index import group_items_by_date, merge_items_into_date_file
+from src.storage.file_stats import FileStatsCollector
 from src.tools.slugify import slugify
 from src.tools.date_structure import ensure_date_structure
 
+log = logging.getLogger("markdown_export")
+
 
 def _ensure_dir(path: str) -> None:
 	os.makedirs(path, exist_ok=True)
@@ -44,48 +49,45 @@ def _generate_item_markdown(item: NewsItem) -> str:
 	return "\n".join(lines)
 
 
-def export_news_items_by_date(items: List[NewsItem], base_dir: str = os.path.join("content")) -> List[str]:
+def export_news_items_by_date(
+	items: List[NewsItem],
+	base_dir: str = os.path.join("content"),
+	stats: Optional[FileStatsCollector] = None,
+) -> List[str]:
 	"""
-	按日期将多条资讯合并导出到 Markdown 文件：content/news/YYYY/MM/DD.md
-	同一天的新闻会合并到一个文件中。
+	按日期将多条资讯合并导出到 Markdown 文件：content/news/YYYY/MM/DD/YYYY-MM-DD.md
+	同一天的新闻会合并到一个文件中；已有文件按 url_hash 索引增量追加，历史条目保留。
+	返回本次有新增条目的文件路径；传入 stats 时记录建目录与写入耗时。
 	"""
 	_ensure_dir(base_dir)
 	
-	# 按日期分组
-	items_by_date = defaultdict(list)
-	for item in items:
-		date_obj = (item.published_at or item.fetched_at or datetime.utcnow()).date()
-		items_by_date[date_obj].append(item)
-	
-	# 为每个日期创建文件
+	# 按日期分组后逐个日期文件增量合并
 	exported_paths = []
-	for date_obj, date_items in items_by_date.items():
+	added_total = 0
+	for date_obj, date_items in group_items_by_date(items).items():
 		# 创建日期目录结构
+		start = time.perf_counter()
 		date_dir = ensure_date_structure(
 			os.path.join(base_dir, "news"),
 			datetime.combine(date_obj, datetime.min.time()),
 			"%Y/%m/%d"
 		)
+		if stats is not None:
+			stats.record_directory_creation(date_dir, True, time.perf_counter() - start)
 		
 		# 文件名：YYYY-MM-DD.md
 		filename = f"{date_obj.isoformat()}.md"
 		file_path = os.path.join(date_dir, filename)
 		
-		# 生成 Markdown 内容
-		lines = [f"# {date_obj.isoformat()} 资讯", ""]
-		
-		for idx, item in enumerate(date_items, 1):
-			lines.append(_generate_item_markdown(item))
-			if idx < len(date_items):
-				lines.append("---")
-				lines.append("")
-		
-		# 写入文件
-		with open(file_path, "w", encoding="utf-8") as f:
-			f.write("\n".join(lines))
-		
-		exported_paths.append(file_path)
+		start = time.perf_counter()
+		added, bytes_written = merge_items_into_date_file(file_path, date_obj, date_items, _generate_item_markdown)
+		if stats is not None and added:
+			stats.record_file_write(file_path, bytes_written, time.perf_counter() - start)
+		if added:
+			added_total += added
+			exported_paths.append(file_path)
 	
+	log.info("资讯 Markdown 增量合并: files=%s added=%s", len(exported_paths), added_total)
 	return exported_paths
 
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+log = logging.getLogger("markdown_index")
+
 
 def _parse_entry(filename: str) -> Tuple[str, str]:
 	"""
@@ -47,15 +51,133 @@ def _scan_flat(content_root: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str
 	return (daily, news)
 
 
-def build_index(content_root: str, new_daily: int = 0, new_news: int = 0, params: Dict[str, str] | None = None) -> str:
+MANIFEST_NAME = ".index_manifest.json"
+_MANIFEST_VERSION = 1
+
+
+def _render_section(date_key: str, names: List[str]) -> str:
+	lines = [f"### {date_key}"]
+	for relpath in sorted(names):
+		lines.append(f"- [{relpath}]({relpath})")
+	return "\n".join(lines)
+
+
+class IndexManifest:
+	"""
+	目录页清单：记录已知条目（文件名 -> 类型、日期、mtime）与按日期预渲染的分段。
+	content_root 目录 mtime 未变化时跳过扫描；变化时只解析新增/删除的文件名，
+	并只重渲染受影响日期的分段。
+	"""
+
+	def __init__(self, content_root: str) -> None:
+		self.path = os.path.join(content_root, MANIFEST_NAME)
+		self.content_root = content_root
+		self.dir_mtime_ns = 0
+		self.entries: Dict[str, Dict[str, object]] = {}
+		self.sections: Dict[str, Dict[str, str]] = {"daily": {}, "news": {}}
+		self.scanned = False
+		self.changed_dates = 0
+		self._load()
+
+	def _load(self) -> None:
+		if not os.path.exists(self.path):
+			return
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				data = json.load(f) or {}
+		except Exception:
+			return
+		if data.get("version") != _MANIFEST_VERSION:
+			return
+		self.dir_mtime_ns = int(data.get("dir_mtime_ns") or 0)
+		self.entries = data.get("entries") or {}
+		sections = data.get("sections") or {}
+		self.sections = {"daily": sections.get("daily") or {}, "news": sections.get("news") or {}}
+
+	def refresh(self) -> None:
+		"""应用目录变化的增量"""
+		try:
+			dir_mtime_ns = os.stat(self.content_root).st_mtime_ns
+		except OSError:
+			return
+		if self.entries and dir_mtime_ns == self.dir_mtime_ns:
+			return
+		self.scanned = True
+		try:
+			names = set(os.listdir(self.content_root))
+		except Exception:
+			return
+		affected: Dict[str, set] = {"daily": set(), "news": set()}
+		for name in [n for n in self.entries if n not in names]:
+			entry = self.entries.pop(name)
+			affected[str(entry["type"])].add(str(entry["date"]))
+		for name in names:
+			if name in self.entries:
+				continue
+			tp, date_key = _parse_entry(name)
+			if not tp or not date_key:
+				continue
+			try:
+				mtime_ns = os.stat(os.path.join(self.content_root, name)).st_mtime_ns
+			except OSError:
+				continue
+			self.entries[name] = {"type": tp, "date": date_key, "mtime_ns": mtime_ns}
+			affected[tp].add(date_key)
+		for tp, dates in affected.items():
+			if not dates:
+				continue
+			by_date: Dict[str, List[str]] = {d: [] for d in dates}
+			for name, entry in self.entries.items():
+				if entry["type"] == tp and entry["date"] in by_date:
+					by_date[str(entry["date"])].append(name)
+			for date_key, date_names in by_date.items():
+				if date_names:
+					self.sections[tp][date_key] = _render_section(date_key, date_names)
+				else:
+					self.sections[tp].pop(date_key, None)
+			self.changed_dates += len(dates)
+		self.dir_mtime_ns = dir_mtime_ns
+
+	def render(self, tp: str) -> List[str]:
+		sections = self.sections[tp]
+		if not sections:
+			return ["- 暂无"]
+		return ["\n\n".join(sections[d] for d in sorted(sections))]
+
+	def save(self) -> None:
+		# 原地覆盖写入（不新建目录项），避免清单本身改变 content_root 的 mtime
+		try:
+			self.dir_mtime_ns = os.stat(self.content_root).st_mtime_ns if os.path.exists(self.path) else 0
+		except OSError:
+			self.dir_mtime_ns = 0
+		with open(self.path, "w", encoding="utf-8") as f:
+			json.dump(
+				{
+					"version": _MANIFEST_VERSION,
+					"dir_mtime_ns": self.dir_mtime_ns,
+					"entries": self.entries,
+					"sections": self.sections,
+				},
+				f,
+				ensure_ascii=False,
+			)
+
+
+def build_index(
+	content_root: str,
+	new_daily: int = 0,
+	new_news: int = 0,
+	params: Dict[str, str] | None = None,
+	use_manifest: bool = True,
+) -> str:
 	"""
 	扫描 content_root 下的 daily 与 news，生成 index.md。
+	use_manifest=True 时基于 .index_manifest.json 增量更新，只处理新增/删除的文件与受影响的日期分段，
+	输出与全量扫描一致。
 	"""
 	os.makedirs(content_root, exist_ok=True)
 	index_path = os.path.join(content_root, "index.md")
 
-	daily, news = _scan_flat(content_root)
-
 	params = params or {}
 	now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 
@@ -70,6 +192,26 @@ def build_index(content_root: str, new_daily: int = 0, new_news: int = 0, params
 			lines.append(f"- {k}：{v}")
 	lines.append("")
 
+	if use_manifest:
+		manifest = IndexManifest(content_root)
+		manifest.refresh()
+		lines.append("## 日报（按日期）")
+		lines.extend(manifest.render("daily"))
+		lines.append("")
+		lines.append("## 资讯（按日期）")
+		lines.extend(manifest.render("news"))
+		lines.append("")
+		with open(index_path, "w", encoding="utf-8") as f:
+			f.write("\n".join(lines))
+		manifest.save()
+		log.info(
+			"目录页增量更新: entries=%s scanned=%s changed_dates=%s",
+			len(manifest.entries), manifest.scanned, manifest.changed_dates,
+		)
+		return index_path
+
+	daily, news = _scan_flat(content_root)
+
 	lines.append("## 日报（按日期）")
 	if not daily:
 		lines.append("- 暂无")
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from src.models import NewsItem
+
+log = logging.getLogger("near_dedup")
+
+# ASCII 词作为一个单元，CJK 单字作为一个单元（中文无空格分词，按字切分后再取 n-gram）
+_UNIT_RE = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64
+
+_near_dedup_stats: Dict[str, float] = {
+    "input": 0,
+    "clusters": 0,
+    "duplicates": 0,
+    "candidate_pairs": 0,
+}
+
+
+def shingle_text(text: str, n: int = 3) -> Set[str]:
+    """将文本切分为 n-gram 片段集合（CJK 按字、拉丁文按词）
+
+    Args:
+        text: 原始文本
+        n: n-gram 长度
+
+    Returns:
+        片段集合；单元数不足 n 时返回整体作为唯一片段
+    """
+    units = _UNIT_RE.findall((text or "").lower())
+    if not units:
+        return set()
+    if len(units) <= n:
+        return {" ".join(units)}
+    return {" ".join(units[i:i + n]) for i in range(len(units) - n + 1)}
+
+
+def minhash_signature(shingles: Iterable[str], num_perm: int = 64) -> Tuple[int, ...]:
+    """单次哈希 MinHash（one-permutation hashing + 旋转致密化）
+
+    每个片段只哈希一次，按哈希值分桶取桶内最小值，空桶向右借用最近非空桶，
+    整体开销与片段数线性相关，而非 片段数 × 排列数。
+    签名依赖进程内 hash()，仅用于本轮聚类，不应持久化。
+    """
+    bins = [_EMPTY] * num_perm
+    for sh in shingles:
+        h = hash(sh) & _MASK64
+        idx = h % num_perm
+        val = h // num_perm
+        if val < bins[idx]:
+            bins[idx] = val
+    if all(v == _EMPTY for v in bins):
+        return tuple(bins)
+    # 旋转致密化：空桶取右侧最近非空桶的值，并按距离偏移以区分来源
+    dense = list(bins)
+    for i in range(num_perm):
+        if bins[i] != _EMPTY:
+            continue
+        j, dist = (i + 1) % num_perm, 1
+        while bins[j] == _EMPTY:
+            j, dist = (j + 1) % num_perm, dist + 1
+        dense[i] = (bins[j] + dist * 0x9E3779B97F4A7C15) & _MASK64
+    return tuple(dense)
+
+
+def estimate_similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """根据签名估计 Jaccard 相似度"""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    same = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+    return same / len(sig_a)
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 保持较小下标为根，使聚类结果与输入顺序一致
+            if ra < rb:
+                self.parent[rb] = ra
+            else:
+                self.parent[ra] = rb
+
+
+def _canonical_key(item: NewsItem) -> Tuple[int, float]:
+    """代表条目选择：摘要更完整者优先，其次发布时间更早者优先"""
+    ts = item.published_at or item.fetched_at or datetime.now(timezone.utc)
+    return (-len(item.summary or ""), ts.timestamp())
+
+
+def cluster_near_duplicates(
+    items: Sequence[NewsItem],
+    threshold: float = 0.6,
+    num_perm: int = 64,
+    bands: int = 16,
+    ngram: int = 3,
+) -> List[List[int]]:
+    """基于 MinHash + LSH 的近重复聚类
+
+    Args:
+        items: 新闻项列表
+        threshold: 估计 Jaccard 相似度阈值，达到即视为同一事件
+        num_perm: 签名长度
+        bands: LSH 分带数（num_perm 需能被整除）
+        ngram: 片段长度
+
+    Returns:
+        聚类列表，每个聚类为条目下标列表（仅包含大小 > 1 的聚类）
+    """
+    if num_perm % bands != 0:
+        raise ValueError(f"num_perm({num_perm}) 必须能被 bands({bands}) 整除")
+    rows = num_perm // bands
+
+    signatures: List[Tuple[int, ...]] = []
+    for item in items:
+        text = f"{item.title or ''} {item.summary or ''}"
+        sh = shingle_text(text, n=ngram)
+        signatures.append(minhash_signature(sh, num_perm=num_perm) if sh else ())
+
+    uf = _UnionFind(len(items))
+    checked: Set[Tuple[int, int]] = set()
+    for b in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        lo, hi = b * rows, (b + 1) * rows
+        for idx, sig in enumerate(signatures):
+            if sig:
+                buckets[sig[lo:hi]].append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # 桶内所有候选对都要比较：仅比较首个成员会漏掉与其不相似、彼此却相似的条目
+            for pos, left in enumerate(members):
+                for right in members[pos + 1:]:
+                    pair = (left, right)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    if uf.find(left) == uf.find(right):
+                        continue
+                    if estimate_similarity(signatures[left], signatures[right]) >= threshold:
+                        uf.union(left, right)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(len(items)):
+        groups[uf.find(idx)].append(idx)
+    _near_dedup_stats["candidate_pairs"] += len(checked)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def near_deduplicate_items(
+    items: Iterable[NewsItem],
+    mode: str = "drop",
+    threshold: float = 0.6,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> List[NewsItem]:
+    """跨来源近重复去重（应在 deduplicate_items 之后执行）
+
+    Args:
+        items: 已按 url_hash 去重的新闻项
+        mode: "drop" 仅保留每个聚类的代表条目；"group" 保留全部条目并写入 cluster_id
+        threshold: 估计 Jaccard 相似度阈值
+
+    Returns:
+        处理后的新闻项列表（保持原有顺序）
+    """
+    if mode not in ("drop", "group"):
+        raise ValueError(f"不支持的近重复处理模式: {mode}")
+    items = list(items)
+    clusters = cluster_near_duplicates(items, threshold=threshold, num_perm=num_perm, bands=bands)
+
+    dropped: Set[int] = set()
+    for members in clusters:
+        canonical = min(members, key=lambda i: _canonical_key(items[i]))
+        canonical_item = items[canonical]
+        canonical_item.ensure_hash()
+        for idx in members:
+            if mode == "group":
+                items[idx].cluster_id = canonical_item.url_hash
+            elif idx != canonical:
+                dropped.add(idx)
+
+    result = [it for idx, it in enumerate(items) if idx not in dropped]
+    duplicates = sum(len(m) - 1 for m in clusters)
+    _near_dedup_stats["input"] += len(items)
+    _near_dedup_stats["clusters"] += len(clusters)
+    _near_dedup_stats["duplicates"] += duplicates
+    log.info(
+        "近重复去重: mode=%s 原始=%s 聚类=%s 近重复=%s 输出=%s threshold=%.2f",
+        mode, len(items), len(clusters), duplicates, len(result), threshold,
+    )
+    return result
+
+
+def get_near_dedup_stats() -> dict:
+    """获取近重复去重统计信息"""
+    stats = dict(_near_dedup_stats)
+    total = stats["input"]
+    stats["duplicate_rate"] = stats["duplicates"] / total if total else 0.0
+    return stats
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 from datetime import datetime, timezone
 
-from src.models import NewsItem
+from src.models import NewsItem, compute_url_hash
+from src.tools.url_canon import UrlCanonicalizer
 
 
-def normalize_items(items: Iterable[NewsItem]) -> List[NewsItem]:
+def normalize_items(items: Iterable[NewsItem], canonicalizer: Optional[UrlCanonicalizer] = None) -> List[NewsItem]:
+    """清洗字段并计算 url_hash；提供 canonicalizer 时按规范化 URL 计算哈希（原始链接保持不变）"""
     normalized: List[NewsItem] = []
     for item in items:
         item.title = item.title.strip()
@@ -14,6 +16,8 @@ def normalize_items(items: Iterable[NewsItem]) -> List[NewsItem]:
         item.summary = (item.summary or "").strip() or None
         if item.published_at and item.published_at.tzinfo is None:
             item.published_at = item.published_at.replace(tzinfo=timezone.utc)
+        if canonicalizer is not None and not item.url_hash:
+            item.url_hash = compute_url_hash(canonicalizer.canonicalize(item.url))
         item.ensure_hash()
         normalized.append(item)
     return normalized
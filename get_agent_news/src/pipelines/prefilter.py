@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.models import NewsItem
+from src.sources.source_spec import SourceSpecError
+from src.tools.keyword_matcher import KeywordMatcher
+
+log = logging.getLogger("prefilter")
+
+# 未配置 topic.terms 时使用的 Agent/LLM 主题词表（权重之和达到 min_score 即视为相关）
+DEFAULT_TOPIC_TERMS: Dict[str, float] = {
+    "agent": 0.5,
+    "智能体": 0.5,
+    "大模型": 0.5,
+    "llm": 0.5,
+    "gpt": 0.4,
+    "rag": 0.4,
+    "mcp": 0.4,
+    "多模态": 0.3,
+    "生成式": 0.3,
+    "推理": 0.2,
+    "模型": 0.2,
+    "openai": 0.3,
+    "anthropic": 0.3,
+    "claude": 0.3,
+    "deepseek": 0.3,
+    "人工智能": 0.2,
+    "ai": 0.15,
+}
+_LANGUAGES = ("zh", "en", "other")
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+def detect_language(text: str) -> str:
+    """按字符类别粗判语言：含 CJK 汉字即为 zh，否则拉丁字母占多数为 en"""
+    if _CJK_RE.search(text):
+        return "zh"
+    letters = len(_LATIN_RE.findall(text))
+    return "en" if letters and letters * 2 >= len(text.replace(" ", "")) else "other"
+
+
+def _compile_regex(name: Any, key: str, patterns: Sequence[str]) -> Optional[re.Pattern]:
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    except re.error as exc:
+        raise SourceSpecError("prefilter", name, f"{key} 不是合法的正则: {exc}") from exc
+
+
+def _str_list(name: Any, key: str, value: Any) -> List[str]:
+    if value in (None, ""):
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise SourceSpecError("prefilter", name, f"{key} 必须是字符串列表")
+    return list(value)
+
+
+@dataclass
+class PrefilterRule:
+    """单个来源生效的过滤规则（关键词与正则均已编译）
+
+    判定顺序：语言 -> 排除词/排除正则 -> 包含词/包含正则（命中直接保留）-> 主题打分。
+    未配置主题打分时，配置了包含规则的来源只保留命中包含规则的条目。
+    """
+
+    languages: Optional[frozenset] = None
+    include: Optional[KeywordMatcher] = None
+    exclude: Optional[KeywordMatcher] = None
+    include_re: Optional[re.Pattern] = None
+    exclude_re: Optional[re.Pattern] = None
+    topic: Optional[KeywordMatcher] = None
+    topic_weights: Optional[Dict[str, float]] = None
+    min_score: float = 0.0
+
+    def topic_score(self, title: str, summary: str) -> float:
+        # 标题命中计全权重，仅摘要命中计半权重
+        in_title = self.topic.find(title)
+        score = sum(self.topic_weights[k] for k in in_title)
+        score += 0.5 * sum(self.topic_weights[k] for k in self.topic.find(summary) - in_title)
+        return score
+
+    def reason_to_drop(self, item: NewsItem) -> Optional[str]:
+        title = item.title or ""
+        summary = item.summary or ""
+        text = f"{title}\n{summary}" if summary else title
+        if self.languages is not None and detect_language(title) not in self.languages:
+            return "language"
+        if (self.exclude is not None and self.exclude.contains_any(text)) or (
+            self.exclude_re is not None and self.exclude_re.search(text)
+        ):
+            return "exclude"
+        if (self.include is not None and self.include.contains_any(text)) or (
+            self.include_re is not None and self.include_re.search(text)
+        ):
+            return None
+        if self.topic is not None:
+            return None if self.topic_score(title, summary) >= self.min_score else "topic"
+        if self.include is not None or self.include_re is not None:
+            return "include"
+        return None
+
+
+def compile_rule(name: Any, cfg: Dict[str, Any]) -> PrefilterRule:
+    """编译一段 prefilter 配置，配置不合法时抛出 SourceSpecError"""
+    languages = _str_list(name, "languages", cfg.get("languages"))
+    unknown = [lang for lang in languages if lang not in _LANGUAGES]
+    if unknown:
+        raise SourceSpecError("prefilter", name, f"languages 仅支持 {', '.join(_LANGUAGES)}，实际包含 {unknown}")
+    include = _str_list(name, "include_keywords", cfg.get("include_keywords"))
+    exclude = _str_list(name, "exclude_keywords", cfg.get("exclude_keywords"))
+    rule = PrefilterRule(
+        languages=frozenset(languages) if languages else None,
+        include=KeywordMatcher(include) if include else None,
+        exclude=KeywordMatcher(exclude) if exclude else None,
+        include_re=_compile_regex(name, "include_regex", _str_list(name, "include_regex", cfg.get("include_regex"))),
+        exclude_re=_compile_regex(name, "exclude_regex", _str_list(name, "exclude_regex", cfg.get("exclude_regex"))),
+    )
+    topic = cfg.get("topic")
+    if topic:
+        if not isinstance(topic, dict):
+            raise SourceSpecError("prefilter", name, "topic 必须是映射（terms/min_score）")
+        terms = topic.get("terms") or DEFAULT_TOPIC_TERMS
+        if not isinstance(terms, dict):
+            raise SourceSpecError("prefilter", name, "topic.terms 必须是 关键词 -> 权重 的映射")
+        try:
+            weights = {str(k).lower(): float(v) for k, v in terms.items()}
+            min_score = float(topic.get("min_score", 0.3))
+        except (TypeError, ValueError) as exc:
+            raise SourceSpecError("prefilter", name, f"topic 权重/min_score 必须是数字: {exc}") from exc
+        # 英文主题词按整词匹配（"ai" 不命中 "average"），中文主题词仍按子串匹配
+        rule.topic = KeywordMatcher(weights.keys(), latin_word_boundary=True)
+        rule.topic_weights = weights
+        rule.min_score = min_score
+    return rule
+
+
+class Prefilter:
+    """入库前预过滤：按来源选择规则，统计每个来源的保留/丢弃数与丢弃原因"""
+
+    def __init__(self, default: Optional[PrefilterRule], per_source: Dict[str, Optional[PrefilterRule]]) -> None:
+        self.default = default
+        self.per_source = per_source
+        self.seen: Counter = Counter()
+        self.dropped: Dict[str, Counter] = defaultdict(Counter)
+
+    def rule_for(self, source: str) -> Optional[PrefilterRule]:
+        return self.per_source[source] if source in self.per_source else self.default
+
+    def accept(self, item: NewsItem) -> bool:
+        self.seen[item.source] += 1
+        rule = self.rule_for(item.source)
+        reason = rule.reason_to_drop(item) if rule is not None else None
+        if reason is None:
+            return True
+        self.dropped[item.source][reason] += 1
+        return False
+
+    def filter(self, items: Iterable[NewsItem]) -> Iterator[NewsItem]:
+        for item in items:
+            if self.accept(item):
+                yield item
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats: Dict[str, Dict[str, Any]] = {}
+        for source, seen in self.seen.items():
+            reasons = self.dropped.get(source) or Counter()
+            dropped = sum(reasons.values())
+            stats[source] = {
+                "seen": seen,
+                "dropped": dropped,
+                "drop_rate": round(dropped / seen, 4) if seen else 0.0,
+                "reasons": dict(reasons),
+            }
+        return stats
+
+    def log_stats(self) -> None:
+        for source, s in sorted(self.get_stats().items()):
+            log.info(
+                "预过滤: source=%s seen=%s dropped=%s drop_rate=%.1f%% reasons=%s",
+                source, s["seen"], s["dropped"], s["drop_rate"] * 100, s["reasons"],
+            )
+
+
+def compile_prefilter(sources_cfg: Dict[str, Any]) -> Optional[Prefilter]:
+    """从 sources.yaml 编译预过滤器
+
+    顶层 prefilter 段为默认规则（enabled: true 时对所有来源生效），来源条目下的 prefilter 段
+    覆盖默认规则的同名字段，prefilter: false 对该来源关闭。没有任何规则生效时返回 None。
+    """
+    base = sources_cfg.get("prefilter") or {}
+    if not isinstance(base, dict):
+        raise SourceSpecError("prefilter", "<default>", "prefilter 必须是映射")
+    base_cfg = {k: v for k, v in base.items() if k != "enabled"}
+    default = compile_rule("<default>", base_cfg) if base.get("enabled", False) else None
+    per_source: Dict[str, Optional[PrefilterRule]] = {}
+    for kind in ("rss", "web", "wechat"):
+        for entry in sources_cfg.get(kind, []) or []:
+            override = entry.get("prefilter")
+            name = entry.get("name")
+            if override is None or not name:
+                continue
+            if override is False:
+                per_source[name] = None
+            elif isinstance(override, dict):
+                per_source[name] = compile_rule(name, {**base_cfg, **override})
+            else:
+                raise SourceSpecError("prefilter", name, "来源的 prefilter 必须是映射或 false")
+    if default is None and not any(r is not None for r in per_source.values()):
+        return None
+    return Prefilter(default, per_source)
@@ -1,34 +1,26 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from src.models import NewsItem
+from src.storage.score_cache import ScoreCache
+from src.tools.keyword_matcher import KeywordMatcher
 
 log = logging.getLogger("rank")
 
 
-def _heuristic_score(item: NewsItem) -> float:
-    title = (item.title or "").lower()
-    score = 0.0
-    keywords = [
-        ("agent", 0.25),
-        ("大模型", 0.25),
-        ("llm", 0.2),
-        ("生成式", 0.1),
-        ("ai", 0.05),
-    ]
-    for k, w in keywords:
-        if k in title:
-            score += w
-    ts = item.published_at or item.fetched_at
-    age_days = (datetime.now(timezone.utc) - ts).days
-    if age_days <= 1:
-        score += 0.2
-    elif age_days <= 3:
-        score += 0.1
-    priors = {
+DEFAULT_RANKING_CONFIG: Dict[str, Any] = {
+    "keywords": {
+        "agent": 0.25,
+        "大模型": 0.25,
+        "llm": 0.2,
+        "生成式": 0.1,
+        "ai": 0.05,
+    },
+    "source_priors": {
         "机器之心": 0.1,
         "雷峰网": 0.1,
         "InfoQ 中文站": 0.1,
@@ -36,16 +28,173 @@ def _heuristic_score(item: NewsItem) -> float:
         "腾讯云开发者（AI）": 0.1,
         "36氪（AI）": 0.1,
         "AIbase 资讯": 0.1,
-    }
-    score += priors.get(item.source, 0.0)
-    return max(0.0, min(1.0, score))
+    },
+    # [最大天数, 加分]，按天数升序匹配第一个
+    "recency": [[1, 0.2], [3, 0.1]],
+}
 
 
-def rank_items(items: List[NewsItem]) -> List[NewsItem]:
+class HeuristicScorer:
+    """启发式打分引擎：关键词权重、来源先验与时效加分均来自配置，初始化时一次性编译"""
+
+    def __init__(
+        self,
+        keywords: Dict[str, float],
+        source_priors: Optional[Dict[str, float]] = None,
+        recency: Optional[List[List[float]]] = None,
+    ) -> None:
+        self.weights: Dict[str, float] = {k.lower(): float(w) for k, w in keywords.items()}
+        self.source_priors: Dict[str, float] = {k: float(v) for k, v in (source_priors or {}).items()}
+        self.recency: List[Tuple[float, float]] = sorted((float(d), float(w)) for d, w in (recency or []))
+        self.matcher = KeywordMatcher(self.weights.keys())
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "HeuristicScorer":
+        """从 sources.yaml 的 ranking 段构建；缺省字段使用 DEFAULT_RANKING_CONFIG"""
+        cfg = cfg or {}
+        return cls(
+            keywords=cfg.get("keywords") or DEFAULT_RANKING_CONFIG["keywords"],
+            source_priors=cfg.get("source_priors") if cfg.get("source_priors") is not None else DEFAULT_RANKING_CONFIG["source_priors"],
+            recency=cfg.get("recency") if cfg.get("recency") is not None else DEFAULT_RANKING_CONFIG["recency"],
+        )
+
+    def score(self, item: NewsItem, now: datetime) -> float:
+        score = 0.0
+        for k in self.matcher.find(item.title or ""):
+            score += self.weights[k]
+        age_days = (now - (item.published_at or item.fetched_at)).days
+        for max_days, bonus in self.recency:
+            if age_days <= max_days:
+                score += bonus
+                break
+        score += self.source_priors.get(item.source, 0.0)
+        return max(0.0, min(1.0, score))
+
+    def score_batch(self, items: List[NewsItem], now: Optional[datetime] = None) -> None:
+        """以同一参考时间为整批条目打分（写入 item.score）"""
+        now = now or datetime.now(timezone.utc)
+        for it in items:
+            it.score = self.score(it, now)
+
+
+_default_scorer: Optional[HeuristicScorer] = None
+
+
+def _get_default_scorer() -> HeuristicScorer:
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = HeuristicScorer.from_config()
+    return _default_scorer
+
+
+def _heuristic_score(item: NewsItem, now: Optional[datetime] = None) -> float:
+    return _get_default_scorer().score(item, now or datetime.now(timezone.utc))
+
+
+def rank_items(items: List[NewsItem], scorer: Optional[HeuristicScorer] = None) -> List[NewsItem]:
     """使用启发式方法对新闻项进行排序"""
     log.info("使用启发式打分")
+    (scorer or _get_default_scorer()).score_batch(items)
+
+    items.sort(key=lambda x: (x.score or 0.0), reverse=True)
+    return items
+
+
+def _build_batches(items: List[NewsItem], batch_size: int, max_batch_chars: int) -> List[List[NewsItem]]:
+    """按条数与字符数双重上限切分批次，避免单次提示词过长"""
+    batches: List[List[NewsItem]] = []
+    cur: List[NewsItem] = []
+    cur_chars = 0
     for it in items:
-        it.score = _heuristic_score(it)
+        # score_batch 会将摘要截断到 200 字
+        size = len(it.title or "") + min(len(it.summary or ""), 200) + len(it.source or "")
+        if cur and (len(cur) >= batch_size or cur_chars + size > max_batch_chars):
+            batches.append(cur)
+            cur, cur_chars = [], 0
+        cur.append(it)
+        cur_chars += size
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+def rank_items_llm(
+    items: List[NewsItem],
+    client: Any,
+    cache: Optional[ScoreCache] = None,
+    batch_size: int = 20,
+    max_batch_chars: int = 6000,
+    max_workers: int = 4,
+    export_dir: Optional[str] = None,
+    scorer: Optional[HeuristicScorer] = None,
+) -> List[NewsItem]:
+    """增量 LLM 打分：仅对缓存中没有分数的条目分批并发调用 LLM
+
+    Args:
+        items: 新闻项列表（需已计算 url_hash）
+        client: 提供 score_batch(items, export_dir, batch_suffix) 的客户端（如 DeepSeekClient）
+        cache: 分数缓存；为空则每次全部重新打分
+        batch_size: 每批最多条目数
+        max_batch_chars: 每批标题+摘要字符数上限
+        max_workers: 并发批次数
+        export_dir: 若提供，保存每批的请求/响应 JSON 便于排查
+        scorer: 回退使用的启发式打分引擎（默认使用内置配置）
+
+    Returns:
+        按分数降序排列的新闻项；LLM 失败的条目回退到启发式分数（不写入缓存）
+    """
+    for it in items:
+        it.ensure_hash()
+    cached = cache.get_many(it.url_hash for it in items) if cache else {}
+    pending: List[NewsItem] = []
+    for it in items:
+        if it.url_hash in cached:
+            it.score = cached[it.url_hash]
+        else:
+            pending.append(it)
+
+    # 同一 url_hash 只打分一次
+    unique_pending = list({it.url_hash: it for it in pending}.values())
+    batches = _build_batches(unique_pending, batch_size, max_batch_chars)
+    log.info(
+        "LLM 增量打分: total=%s cached=%s pending=%s batches=%s workers=%s",
+        len(items), len(items) - len(pending), len(unique_pending), len(batches), max_workers,
+    )
+
+    scored: Dict[str, float] = {}
+    if batches and client is not None and client.available():
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(client.score_batch, batch, export_dir, f"_{idx}"): batch
+                for idx, batch in enumerate(batches)
+            }
+            for fut in as_completed(futures):
+                batch = futures[fut]
+                try:
+                    scores = fut.result()
+                except Exception as exc:
+                    log.warning("LLM 批次打分失败: size=%s err=%s", len(batch), exc)
+                    scores = None
+                if not scores:
+                    continue
+                for it, sc in zip(batch, scores):
+                    scored[it.url_hash] = sc
+        if cache is not None and scored:
+            cache.put_many(scored.items(), model=getattr(getattr(client, "client", None), "model", None))
+    elif batches:
+        log.info("LLM 不可用，未缓存条目使用启发式打分: %s", len(unique_pending))
+
+    fallback = 0
+    now = datetime.now(timezone.utc)
+    scorer = scorer or _get_default_scorer()
+    for it in pending:
+        if it.url_hash in scored:
+            it.score = scored[it.url_hash]
+        else:
+            it.score = scorer.score(it, now)
+            fallback += 1
+    if fallback:
+        log.info("LLM 打分回退启发式: %s", fallback)
 
     items.sort(key=lambda x: (x.score or 0.0), reverse=True)
     return items
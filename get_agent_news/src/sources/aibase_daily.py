@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import contextvars
 import os
 import re
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
@@ -14,7 +17,8 @@ from bs4 import BeautifulSoup
 
 log = logging.getLogger("aibase_daily")
 
-from src.sources.common import http_get, DEFAULT_HEADERS_HTML, rate_limiter
+from src.sources.common import http_get, record_response, DEFAULT_HEADERS_HTML, rate_limiter
+from src.sources.html_backend import make_soup
 from src.tools.nested import get_from_path, render_value
 
 
@@ -197,6 +201,45 @@ def _render_value(val: Any, variables: Dict[str, Any]) -> Any:
     return render_value(val, variables)
 
 
+class _ExistingDailyIndex:
+    """本轮运行开始时一次性列出 output_dir 与旧目录下的日报文件名，之后的重复检测只查集合"""
+
+    def __init__(self, output_dir: str, legacy_dir: str) -> None:
+        self.output_names = self._list(output_dir)
+        self.legacy_names = self._list(legacy_dir)
+
+    @staticmethod
+    def _list(dir_path: str) -> set[str]:
+        try:
+            return {n for n in os.listdir(dir_path) if n.endswith(".md")}
+        except OSError:
+            return set()
+
+    def date_exported(self, date_str: str) -> bool:
+        """日期文件（YYYY-MM-DD.md，含旧目录）已存在"""
+        name = f"{date_str}.md"
+        return name in self.output_names or name in self.legacy_names
+
+    def has_output(self, name: str) -> bool:
+        return name in self.output_names
+
+    def add(self, name: str) -> None:
+        self.output_names.add(name)
+
+
+def _resolve_out_name(index: _ExistingDailyIndex, date_str: str, stop_on_duplicate: bool) -> Optional[str]:
+    """以日期为文件名；同名已存在时，stop_on_duplicate 下返回 None（停止），否则追加自增序号"""
+    base_name = f"daily-{date_str}.md"
+    if not index.has_output(base_name):
+        return base_name
+    if stop_on_duplicate:
+        return None
+    k = 2
+    while index.has_output(f"daily-{date_str}_{k}.md"):
+        k += 1
+    return f"daily-{date_str}_{k}.md"
+
+
 def export_aibase_daily(
     daily_url: str,
     output_dir: str = os.path.join("content"),
@@ -206,207 +249,228 @@ def export_aibase_daily(
     storage: Optional[Any] = None,
     respect_robots: bool = True,
     host_rate_limit_s: Optional[float] = None,
+    max_workers: int = 4,
+    parser: Optional[str] = None,
 ) -> List[str]:
-    """抓取 AIbase 日报，优先通过 JSON API 获取列表，再逐条详情页转为 Markdown 文件。
+    """抓取 AIbase 日报，优先通过 JSON API 获取列表，再并发抓取详情页转为 Markdown 文件。
     返回写入的文件路径列表。
+
+    已存在的日报文件名在开始时一次性加载；详情页由有界线程池并发抓取与解析（仍经过主机级速率限制），
+    主线程按列表顺序写入文件，遇到已导出的日期立即停止（stop_on_duplicate 语义不变）。
+    API 模式下重复判定只依赖列表中的日期，下一页列表的请求与上一页详情的抓取重叠进行。
     """
     os.makedirs(output_dir, exist_ok=True)
     written: List[str] = []
     written_dates: set[str] = set()
-
-    def _url_hash(url: str) -> str:
-        import hashlib
-        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    legacy_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "data", "daily"))
+    index = _ExistingDailyIndex(output_dir, legacy_dir)
 
     # 可配置的主机级速率
     if isinstance(host_rate_limit_s, (int, float)) and host_rate_limit_s and host_rate_limit_s > 0:
         rate_limiter.min_interval = float(host_rate_limit_s)
 
-    with requests.Session() as session:
-        # robots 检查（页面抓取前）
-        if respect_robots:
-            parsed = urlparse(daily_url)
-            site_root = f"{parsed.scheme}://{parsed.netloc}"
-            disallows = _fetch_robots_disallows(session, site_root)
-            if _path_disallowed(parsed.path or "/", disallows):
-                log.warning("robots.txt 禁止抓取该路径，已跳过: host=%s path=%s", parsed.netloc, parsed.path or "/")
-                return written
-
-        if api_config:
-            api_url = api_config.get("url")
-            method = (api_config.get("method") or "GET").upper()
-            headers_override = api_config.get("headers") or {}
-            params_tmpl = api_config.get("params") or {}
-            list_path = api_config.get("list_path")
-            title_path = api_config.get("title_path")
-            date_path = api_config.get("date_path")
-            oid_path = api_config.get("oid_path")
-            detail_template = api_config.get("url_template")
-
-            if not api_url or not list_path or not title_path or not (oid_path or detail_template):
-                log.warning("AIbase 日报 API 配置不完整，回退到 HTML：%s", api_config)
-            else:
-                stop_flag = False
-                for page_idx in range(1, max_pages + 1):
-                    variables = {"page": page_idx, "ts": int(time.time() * 1000)}
-                    req_url = _render_value(api_url, variables)
-                    req_params = _render_value(params_tmpl, variables)
-                    if method == "POST":
-                        resp = session.post(req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, json=req_params, timeout=10.0)
-                    else:
-                        if params_tmpl:
-                            resp = session.get(req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, params=req_params, timeout=10.0)
-                        else:
-                            resp = http_get(session, req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, timeout=10.0)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    items = _get_from_path(data, list_path) or []
-                    log.info("AIbase 日报 API: page=%s url=%s items=%s", page_idx, req_url, len(items) if isinstance(items, list) else type(items))
-                    if not isinstance(items, list) or not items:
-                        if page_idx > 1:
-                            log.info("AIbase 日报空页停止: page=%s url=%s", page_idx, req_url)
-                            break
-                        log.info("AIbase 日报当前页为空，尝试下一页: page=%s url=%s", page_idx, req_url)
-                        continue
-                    for it in items:
-                        title = _get_from_path(it, title_path)
-                        date_text = _get_from_path(it, date_path) if date_path else None
-                        date_str = _detect_date(str(date_text) if date_text else "") or datetime.now().strftime("%Y-%m-%d")
-                        oid = _get_from_path(it, oid_path) if oid_path else None
-                        detail_url = None
-                        if detail_template and (oid is not None):
+    # 每个工作线程使用独立的 Session
+    local = threading.local()
+    worker_sessions: List[requests.Session] = []
+    sessions_lock = threading.Lock()
+
+    def _worker_session() -> requests.Session:
+        sess = getattr(local, "session", None)
+        if sess is None:
+            sess = requests.Session()
+            local.session = sess
+            with sessions_lock:
+                worker_sessions.append(sess)
+        return sess
+
+    def _fetch_detail(detail_url: str) -> str:
+        dr = http_get(_worker_session(), detail_url, headers=DEFAULT_HEADERS_HTML)
+        dsoup = make_soup(dr.text, parser)
+        return _extract_article_markdown(dsoup, detail_url)
+
+    def _write(out_name: str, md: str, date_str: str) -> None:
+        out_path = os.path.join(output_dir, out_name)
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(md)
+        index.add(out_name)
+        written.append(out_path)
+        written_dates.add(date_str)
+        log.info("AIbase 日报写入: %s", out_path)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="aibase-daily")
+    try:
+        with requests.Session() as session:
+            # robots 检查（页面抓取前）
+            if respect_robots:
+                parsed = urlparse(daily_url)
+                site_root = f"{parsed.scheme}://{parsed.netloc}"
+                disallows = _fetch_robots_disallows(session, site_root)
+                if _path_disallowed(parsed.path or "/", disallows):
+                    log.warning("robots.txt 禁止抓取该路径，已跳过: host=%s path=%s", parsed.netloc, parsed.path or "/")
+                    return written
+
+            if api_config:
+                api_url = api_config.get("url")
+                method = (api_config.get("method") or "GET").upper()
+                headers_override = api_config.get("headers") or {}
+                params_tmpl = api_config.get("params") or {}
+                list_path = api_config.get("list_path")
+                title_path = api_config.get("title_path")
+                date_path = api_config.get("date_path")
+                oid_path = api_config.get("oid_path")
+                detail_template = api_config.get("url_template")
+                summary_path = api_config.get("summary_path") or "description"
+
+                if not api_url or not list_path or not title_path or not (oid_path or detail_template):
+                    log.warning("AIbase 日报 API 配置不完整，回退到 HTML：%s", api_config)
+                else:
+                    # (future, title, date_str, detail_url, out_name, item)，按列表顺序写入
+                    pending: List[tuple] = []
+
+                    def _drain() -> None:
+                        for fut, title, date_str, detail_url, out_name, it in pending:
                             try:
-                                detail_url = _render_value(detail_template, {"oid": oid})
-                            except Exception:
-                                detail_url = None
-                        if not detail_url and oid:
-                            detail_url = urljoin(daily_url, str(oid))
-                        if not detail_url:
-                            log.warning("AIbase 日报缺少详情链接，跳过: title=%s", title)
-                            continue
-
-                        # 重复检测（文件与本轮日期）
-                        u_hash = _url_hash(detail_url)
-                        # 文件存在性（以日期文件为准）也视为重复
-                        base_name_probe = f"{date_str}.md"
-                        legacy_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "data", "daily"))
-                        if stop_on_duplicate and (os.path.exists(os.path.join(output_dir, base_name_probe)) or os.path.exists(os.path.join(legacy_dir, base_name_probe))):
-                            log.info("AIbase 日报命中已存在日期文件，停止继续分页: date=%s page=%s", date_str, page_idx)
-                            stop_flag = True
-                            break
-                        # 本轮运行内若同日期已写过，也直接停止，不生成 _2 文件
-                        if stop_on_duplicate and date_str in written_dates:
-                            log.info("AIbase 日报本轮已写入同日期，停止继续分页: date=%s page=%s", date_str, page_idx)
-                            stop_flag = True
-                            break
-
-                        try:
-                            dr = http_get(session, detail_url, headers=DEFAULT_HEADERS_HTML)
-                            dsoup = BeautifulSoup(dr.text, "html.parser")
-                            md = _extract_article_markdown(dsoup, detail_url)
-                            # 将 API 日期覆盖写入（替换“日期：……”行）
-                            md = re.sub(r"^日期：.*$", f"日期：{date_str}", md, flags=re.MULTILINE)
-                        except Exception as exc:
-                            log.warning("AIbase 日报详情失败: url=%s err=%s，使用简单摘要", detail_url, exc)
-                            summary = _get_from_path(it, api_config.get("summary_path") or "description") or ""
-                            md = f"# {title}\n\n来源：{detail_url}\n日期：{date_str}\n\n{summary}\n"
-
-                        # 以日期为文件名（若同日多篇，追加自增序号）
-                        base_name = f"daily-{date_str}.md"
-                        out_path = os.path.join(output_dir, base_name)
-                        if os.path.exists(out_path):
-                            if not stop_on_duplicate:
-                                k = 2
-                                while True:
-                                    alt = os.path.join(output_dir, f"daily-{date_str}_{k}.md")
-                                    if not os.path.exists(alt):
-                                        out_path = alt
-                                        break
-                                    k += 1
+                                md = fut.result()
+                                # 将 API 日期覆盖写入（替换“日期：……”行）
+                                md = re.sub(r"^日期：.*$", f"日期：{date_str}", md, flags=re.MULTILINE)
+                            except Exception as exc:
+                                log.warning("AIbase 日报详情失败: url=%s err=%s，使用简单摘要", detail_url, exc)
+                                summary = _get_from_path(it, summary_path) or ""
+                                md = f"# {title}\n\n来源：{detail_url}\n日期：{date_str}\n\n{summary}\n"
+                            _write(out_name, md, date_str)
+                        pending.clear()
+
+                    planned_dates: set[str] = set()
+                    planned_names: set[str] = set()
+                    stop_flag = False
+                    try:
+                        for page_idx in range(1, max_pages + 1):
+                            variables = {"page": page_idx, "ts": int(time.time() * 1000)}
+                            req_url = _render_value(api_url, variables)
+                            req_params = _render_value(params_tmpl, variables)
+                            if method == "POST":
+                                resp = record_response(session.post(req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, json=req_params, timeout=10.0))
                             else:
-                                stop_flag = True
+                                if params_tmpl:
+                                    resp = record_response(session.get(req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, params=req_params, timeout=10.0))
+                                else:
+                                    resp = http_get(session, req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, timeout=10.0)
+                            # 上一页的详情在本页列表请求期间已并发抓取，此处按顺序落盘
+                            _drain()
+                            resp.raise_for_status()
+                            data = resp.json()
+                            items = _get_from_path(data, list_path) or []
+                            log.info("AIbase 日报 API: page=%s url=%s items=%s", page_idx, req_url, len(items) if isinstance(items, list) else type(items))
+                            if not isinstance(items, list) or not items:
+                                if page_idx > 1:
+                                    log.info("AIbase 日报空页停止: page=%s url=%s", page_idx, req_url)
+                                    break
+                                log.info("AIbase 日报当前页为空，尝试下一页: page=%s url=%s", page_idx, req_url)
+                                continue
+                            for it in items:
+                                title = _get_from_path(it, title_path)
+                                date_text = _get_from_path(it, date_path) if date_path else None
+                                date_str = _detect_date(str(date_text) if date_text else "") or datetime.now().strftime("%Y-%m-%d")
+                                oid = _get_from_path(it, oid_path) if oid_path else None
+                                detail_url = None
+                                if detail_template and (oid is not None):
+                                    try:
+                                        detail_url = _render_value(detail_template, {"oid": oid})
+                                    except Exception:
+                                        detail_url = None
+                                if not detail_url and oid:
+                                    detail_url = urljoin(daily_url, str(oid))
+                                if not detail_url:
+                                    log.warning("AIbase 日报缺少详情链接，跳过: title=%s", title)
+                                    continue
+
+                                # 重复检测：已存在的日期文件（含旧目录）
+                                if stop_on_duplicate and index.date_exported(date_str):
+                                    log.info("AIbase 日报命中已存在日期文件，停止继续分页: date=%s page=%s", date_str, page_idx)
+                                    stop_flag = True
+                                    break
+                                # 本轮运行内若同日期已写过，也直接停止，不生成 _2 文件
+                                if stop_on_duplicate and date_str in planned_dates:
+                                    log.info("AIbase 日报本轮已写入同日期，停止继续分页: date=%s page=%s", date_str, page_idx)
+                                    stop_flag = True
+                                    break
+                                out_name = _resolve_out_name(index, date_str, stop_on_duplicate)
+                                while out_name is not None and out_name in planned_names:
+                                    # 非停止模式下同日多篇：为本轮已占用的序号继续顺延
+                                    index.add(out_name)
+                                    out_name = _resolve_out_name(index, date_str, stop_on_duplicate)
+                                if out_name is None:
+                                    stop_flag = True
+                                    break
+                                planned_dates.add(date_str)
+                                planned_names.add(out_name)
+                                pending.append((pool.submit(contextvars.copy_context().run, _fetch_detail, detail_url), title, date_str, detail_url, out_name, it))
+                            if stop_flag:
                                 break
-                        with open(out_path, "w", encoding="utf-8") as f:
-                            f.write(md)
-                        written.append(out_path)
-                        log.info("AIbase 日报写入: %s", out_path)
-                        # 记录本轮已写入的日期
-                        written_dates.add(date_str)
-                    if stop_flag:
-                        break
-                return written
-
-        # HTML 回退：遍历页码：先尝试 ?page=，失败再尝试 /page/
-        stop_flag = False
-        for page_idx in range(1, max_pages + 1):
-            if page_idx == 1:
-                page_url = daily_url
-            else:
-                page_url = _build_url_with_param(daily_url, "page", page_idx)
-            try:
-                resp = http_get(session, page_url, headers=DEFAULT_HEADERS_HTML)
-            except Exception:
-                # 回退到 /page/N
-                parsed = urlparse(daily_url)
-                new_path = f"{parsed.path.rstrip('/')}/page/{page_idx}"
-                page_url = urlunparse((parsed.scheme, parsed.netloc, new_path, parsed.params, parsed.query, parsed.fragment))
-                resp = http_get(session, page_url, headers=DEFAULT_HEADERS_HTML)
-
-            log.info("AIbase 日报页面: page=%s status=%s url=%s", page_idx, resp.status_code, page_url)
-            soup = BeautifulSoup(resp.text, "html.parser")
-            detail_links = _extract_daily_links(soup, daily_url)
-            log.info("AIbase 日报列表: page=%s links=%s", page_idx, len(detail_links))
-
-            if page_idx > 1 and not detail_links:
-                log.info("AIbase 日报空页停止: page=%s url=%s", page_idx, page_url)
-                break
-
-            for detail_url in detail_links:
-                # 重复检测（文件与本轮日期）
-                u_hash = _url_hash(detail_url)
+                    finally:
+                        # 列表请求失败或中途异常时，已提交的详情仍按顺序落盘，不随异常丢失
+                        _drain()
+                    return written
+
+            # HTML 回退：遍历页码：先尝试 ?page=，失败再尝试 /page/
+            stop_flag = False
+            for page_idx in range(1, max_pages + 1):
+                if page_idx == 1:
+                    page_url = daily_url
+                else:
+                    page_url = _build_url_with_param(daily_url, "page", page_idx)
                 try:
-                    dr = http_get(session, detail_url, headers=DEFAULT_HEADERS_HTML)
-                    dsoup = BeautifulSoup(dr.text, "html.parser")
-                    md = _extract_article_markdown(dsoup, detail_url)
+                    resp = http_get(session, page_url, headers=DEFAULT_HEADERS_HTML)
+                except Exception:
+                    # 回退到 /page/N
+                    parsed = urlparse(daily_url)
+                    new_path = f"{parsed.path.rstrip('/')}/page/{page_idx}"
+                    page_url = urlunparse((parsed.scheme, parsed.netloc, new_path, parsed.params, parsed.query, parsed.fragment))
+                    resp = http_get(session, page_url, headers=DEFAULT_HEADERS_HTML)
+
+                log.info("AIbase 日报页面: page=%s status=%s url=%s", page_idx, resp.status_code, page_url)
+                soup = make_soup(resp.text, parser)
+                detail_links = _extract_daily_links(soup, daily_url)
+                log.info("AIbase 日报列表: page=%s links=%s", page_idx, len(detail_links))
+
+                if page_idx > 1 and not detail_links:
+                    log.info("AIbase 日报空页停止: page=%s url=%s", page_idx, page_url)
+                    break
+
+                # HTML 模式的日期只能从详情页解析：整页并发抓取，按顺序判定重复，停止时取消尚未开始的请求
+                futures = [(detail_url, pool.submit(contextvars.copy_context().run, _fetch_detail, detail_url)) for detail_url in detail_links]
+                for idx, (detail_url, fut) in enumerate(futures):
+                    try:
+                        md = fut.result()
+                    except Exception as exc:
+                        log.warning("AIbase 日报详情失败: url=%s err=%s", detail_url, exc)
+                        continue
                     m = re.search(r"日期：([0-9]{4}-[0-9]{2}-[0-9]{2})", md)
                     date_in_md = m.group(1) if m else datetime.now().strftime("%Y-%m-%d")
                     # 若当日文件已存在（含旧目录）也视为重复并停止
-                    legacy_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "data", "daily"))
-                    if stop_on_duplicate and (os.path.exists(os.path.join(output_dir, f"{date_in_md}.md")) or os.path.exists(os.path.join(legacy_dir, f"{date_in_md}.md"))):
+                    if stop_on_duplicate and index.date_exported(date_in_md):
                         log.info("AIbase 日报命中已存在日期文件，停止继续分页: date=%s page=%s", date_in_md, page_idx)
                         stop_flag = True
-                        break
                     # 本轮运行内若同日期已写过，也直接停止，不生成 _2 文件
-                    if stop_on_duplicate and date_in_md in written_dates:
+                    elif stop_on_duplicate and date_in_md in written_dates:
                         log.info("AIbase 日报本轮已写入同日期，停止继续分页: date=%s page=%s", date_in_md, page_idx)
                         stop_flag = True
+                    if not stop_flag:
+                        out_name = _resolve_out_name(index, date_in_md, stop_on_duplicate)
+                        if out_name is None:
+                            # 安全保护：stop_on_duplicate=True 时不应生成 _2，直接停止
+                            stop_flag = True
+                        else:
+                            _write(out_name, md, date_in_md)
+                    if stop_flag:
+                        for _, rest in futures[idx + 1:]:
+                            rest.cancel()
                         break
-                        base_name = f"daily-{date_in_md}.md"
-                    out_path = os.path.join(output_dir, base_name)
-                    if os.path.exists(out_path):
-                            # 若不启用停止策略，才考虑生成 _2；默认 stop_on_duplicate=True 下不会走到这里
-                            if not stop_on_duplicate:
-                                k = 2
-                                while True:
-                                    alt = os.path.join(output_dir, f"daily-{date_in_md}_{k}.md")
-                                    if not os.path.exists(alt):
-                                        out_path = alt
-                                        break
-                                    k += 1
-                            else:
-                                # 安全保护：stop_on_duplicate=True 时不应生成 _2，直接停止
-                                stop_flag = True
-                                break
-                    with open(out_path, "w", encoding="utf-8") as f:
-                        f.write(md)
-                    written.append(out_path)
-                    log.info("AIbase 日报写入: %s", out_path)
-                    written_dates.add(date_in_md)
-                except Exception as exc:
-                    log.warning("AIbase 日报详情失败: url=%s err=%s", detail_url, exc)
-            if stop_flag:
-                break
+                if stop_flag:
+                    break
+    finally:
+        pool.shutdown(wait=True)
+        for sess in worker_sessions:
+            sess.close()
 
     return written
-
-
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import contextvars
+import threading
 import time
 import logging
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -11,16 +14,20 @@ log = logging.getLogger("sources.common")
 
 
 class HostRateLimiter:
+    """请求间隔限制；线程安全：并发调用方按顺序预约发送时间，等待在锁外进行"""
+
     def __init__(self, min_interval_seconds: float = 1.0) -> None:
         self.min_interval = min_interval_seconds
         self._last_ts: float = 0.0
+        self._lock = threading.Lock()
 
     def wait(self) -> None:
-        now = time.monotonic()
-        delta = now - self._last_ts
-        if delta < self.min_interval:
-            time.sleep(self.min_interval - delta)
-        self._last_ts = time.monotonic()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last_ts + self.min_interval)
+            self._last_ts = slot
+        if slot > now:
+            time.sleep(slot - now)
 
 
 rate_limiter = HostRateLimiter(min_interval_seconds=1.0)
@@ -43,11 +50,74 @@ DEFAULT_HEADERS_WECHAT: Dict[str, str] = {
 }
 
 
-@retry(stop=stop_after_attempt(4), wait=wait_exponential(multiplier=0.5, min=0.5, max=5))
+_current_source: contextvars.ContextVar[str] = contextvars.ContextVar("current_source", default="-")
+
+
+class RequestStats:
+    """按来源统计的 HTTP 请求数、响应字节数、重试与失败次数（线程安全）
+
+    来源由 source_scope 设置的上下文变量决定；提交到线程池的任务需用 contextvars.copy_context().run 传递。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, source: str) -> Dict[str, float]:
+        entry = self._stats.get(source)
+        if entry is None:
+            entry = self._stats[source] = {"requests": 0, "bytes": 0, "retries": 0, "errors": 0, "seconds": 0.0}
+        return entry
+
+    def record(self, resp: Optional[requests.Response] = None, error: bool = False, retry: bool = False) -> None:
+        with self._lock:
+            entry = self._entry(_current_source.get())
+            if retry:
+                entry["retries"] += 1
+                return
+            entry["requests"] += 1
+            if error:
+                entry["errors"] += 1
+            if resp is not None:
+                entry["bytes"] += len(resp.content or b"")
+                entry["seconds"] += resp.elapsed.total_seconds() if resp.elapsed else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {k: {**v, "seconds": round(v["seconds"], 3)} for k, v in self._stats.items()}
+
+
+request_stats = RequestStats()
+
+
+@contextmanager
+def source_scope(name: str) -> Iterator[None]:
+    """在该作用域内发出的请求计入来源 name"""
+    token = _current_source.set(name)
+    try:
+        yield
+    finally:
+        _current_source.reset(token)
+
+
+def record_response(resp: requests.Response) -> requests.Response:
+    """统计未经 http_get 发出的请求（如 JSON API 的 POST / 带 params 的 GET）"""
+    request_stats.record(resp, error=resp.status_code >= 400)
+    return resp
+
+
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=0.5, min=0.5, max=5),
+    before_sleep=lambda _state: request_stats.record(retry=True),
+)
 def http_get(session: requests.Session, url: str, headers: Dict[str, str], timeout: float = 10.0) -> requests.Response:
     rate_limiter.wait()
-    resp = session.get(url, headers=headers, timeout=timeout)
+    try:
+        resp = session.get(url, headers=headers, timeout=timeout)
+    except Exception:
+        request_stats.record(error=True)
+        raise
+    request_stats.record(resp, error=resp.status_code >= 400)
     resp.raise_for_status()
     return resp
-
-
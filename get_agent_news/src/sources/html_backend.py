@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import os
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+log = logging.getLogger("html_backend")
+
+# BeautifulSoup 树构建器：选择器（soupsieve）与取文本的语义不随后端改变，只替换 HTML 解析速度
+HTML_PARSERS = ("html.parser", "lxml", "html5lib")
+_PARSER_MODULES = {"html.parser": None, "lxml": "lxml", "html5lib": "html5lib"}
+
+_default_parser = "html.parser"
+_warned: set = set()
+
+
+def parser_available(name: str) -> bool:
+    if name not in _PARSER_MODULES:
+        return False
+    module = _PARSER_MODULES[name]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def available_parsers() -> List[str]:
+    return [p for p in HTML_PARSERS if parser_available(p)]
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """返回实际使用的解析器：未指定时用全局默认；未安装时回退到 html.parser（只告警一次）"""
+    name = name or _default_parser
+    if parser_available(name):
+        return name
+    if name not in _warned:
+        _warned.add(name)
+        log.warning("HTML 解析器不可用，回退到 html.parser: parser=%s", name)
+    return "html.parser"
+
+
+def set_default_parser(name: Optional[str]) -> str:
+    """设置全局默认解析器（来源未单独配置 parser 时使用），返回实际生效的解析器"""
+    global _default_parser
+    if name:
+        if name not in HTML_PARSERS:
+            raise ValueError(f"未知的 HTML 解析器 {name!r}，可选 {', '.join(HTML_PARSERS)}")
+        _default_parser = resolve_parser(name)
+    return _default_parser
+
+
+def make_soup(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, resolve_parser(parser))
+
+
+_env_parser = os.environ.get("GET_AGENT_NEWS_HTML_PARSER")
+if _env_parser in HTML_PARSERS:
+    set_default_parser(_env_parser)
+elif _env_parser:
+    log.warning("忽略未知的 GET_AGENT_NEWS_HTML_PARSER=%s，可选 %s", _env_parser, ", ".join(HTML_PARSERS))
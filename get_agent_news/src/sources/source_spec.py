@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.sources.html_backend import HTML_PARSERS
+from src.tools.keyword_matcher import KeywordMatcher
+from src.tools.nested import compile_path, compile_paths, compile_template
+
+try:  # soupsieve 随 beautifulsoup4 安装；缺失时退回到按字符串选择
+    import soupsieve
+except ImportError:  # pragma: no cover
+    soupsieve = None
+
+log = logging.getLogger("source_spec")
+
+_PAGINATION_TYPES = ("", "param", "next", "page_links", "json_api")
+_DEFAULT_LINKS_SELECTOR = ".pagination a, .pager a, .page-numbers a"
+
+
+class SourceSpecError(ValueError):
+    """来源配置不合法（编译期发现，不发起任何网络请求）"""
+
+    def __init__(self, kind: str, name: Any, message: str) -> None:
+        super().__init__(f"{kind} 来源配置错误 name={name!r}: {message}")
+        self.kind = kind
+        self.name = name
+
+
+class CompiledSelector:
+    """预编译的 CSS 选择器：解析一次，对每页直接执行"""
+
+    def __init__(self, selector: str) -> None:
+        self.selector = selector
+        self._compiled = soupsieve.compile(selector) if soupsieve is not None else None
+
+    def select(self, soup: Any) -> List[Any]:
+        if self._compiled is not None:
+            return self._compiled.select(soup)
+        return soup.select(self.selector)
+
+    def select_one(self, soup: Any) -> Any:
+        if self._compiled is not None:
+            return self._compiled.select_one(soup)
+        return soup.select_one(self.selector)
+
+
+@dataclass
+class JsonApiPlan:
+    api_url: Callable[[Dict[str, Any]], Any]
+    method: str
+    list_items: Callable[[Any], Any]
+    title: Callable[[Any], Any]
+    url: Optional[Callable[[Any], Any]]
+    url_template: Optional[Callable[[Dict[str, Any]], Any]]
+    published: Optional[Callable[[Any], Any]]
+    summary: Optional[Callable[[Any], Any]]
+    headers: Dict[str, str]
+    params: Callable[[Dict[str, Any]], Any]
+    json_body: Callable[[Dict[str, Any]], Any]
+    base_url: str
+    next_vars: Dict[str, Callable[[Any], Any]] = field(default_factory=dict)
+
+
+@dataclass
+class WebPlan:
+    """Web 来源的抓取计划：选择器、路径访问器与模板均已编译"""
+
+    name: str
+    url: str
+    tags: List[str]
+    item_selector: CompiledSelector
+    url_attr: str = "href"
+    title_attr: str = "text"
+    include_keywords: List[str] = field(default_factory=list)
+    keyword_filter: Optional[KeywordMatcher] = None
+    pagination: Dict[str, Any] = field(default_factory=dict)
+    pagination_type: str = ""
+    max_pages: int = 1
+    stop_on_empty: bool = True
+    param_name: str = "page"
+    param_start: int = 1
+    param_step: int = 1
+    next_selector: Optional[CompiledSelector] = None
+    next_url_attr: str = "href"
+    links_selector: Optional[CompiledSelector] = None
+    json_api: Optional[JsonApiPlan] = None
+    parser: Optional[str] = None
+
+    def title_allowed(self, title: str) -> bool:
+        return self.keyword_filter is None or self.keyword_filter.contains_any(title)
+
+
+@dataclass
+class WechatPlan:
+    name: str
+    query: str
+    tags: List[str]
+    max_pages: int = 1
+    parser: Optional[str] = None
+
+
+@dataclass
+class RssPlan:
+    name: str
+    url: str
+    tags: List[str]
+
+
+@dataclass
+class CompiledSources:
+    rss: List[RssPlan] = field(default_factory=list)
+    web: List[WebPlan] = field(default_factory=list)
+    wechat: List[WechatPlan] = field(default_factory=list)
+    errors: List[SourceSpecError] = field(default_factory=list)
+
+
+def _selector(kind: str, name: Any, key: str, value: Any) -> CompiledSelector:
+    if not isinstance(value, str) or not value.strip():
+        raise SourceSpecError(kind, name, f"{key} 必须是非空字符串")
+    try:
+        return CompiledSelector(value)
+    except Exception as exc:
+        raise SourceSpecError(kind, name, f"{key} 不是合法的 CSS 选择器 {value!r}: {exc}") from exc
+
+
+def _int(kind: str, name: Any, key: str, value: Any, default: int, minimum: int = 0) -> int:
+    if value in (None, ""):
+        return default
+    try:
+        num = int(value)
+    except (TypeError, ValueError):
+        raise SourceSpecError(kind, name, f"{key} 必须是整数，实际为 {value!r}")
+    if num < minimum:
+        raise SourceSpecError(kind, name, f"{key} 不能小于 {minimum}，实际为 {num}")
+    return num
+
+
+def _str_list(kind: str, name: Any, key: str, value: Any) -> List[str]:
+    if value in (None, ""):
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise SourceSpecError(kind, name, f"{key} 必须是字符串列表")
+    return list(value)
+
+
+def _paths(kind: str, name: Any, key: str, value: Any) -> Optional[Callable[[Any], Any]]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, str) or (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+        return compile_paths(value)
+    raise SourceSpecError(kind, name, f"{key} 必须是点路径字符串或字符串列表")
+
+
+def _parser(kind: str, name: Any, value: Any) -> Optional[str]:
+    """来源级 HTML 解析器（可选）；未安装的解析器在运行时回退到 html.parser"""
+    if value in (None, ""):
+        return None
+    if value not in HTML_PARSERS:
+        raise SourceSpecError(kind, name, f"parser 仅支持 {', '.join(HTML_PARSERS)}，实际为 {value!r}")
+    return value
+
+
+def _compile_json_api(name: Any, url: str, pagination: Dict[str, Any]) -> JsonApiPlan:
+    kind = "web"
+    api_url = pagination.get("api_url")
+    list_path = pagination.get("list_path") or pagination.get("list_paths")
+    title_path = pagination.get("title_path") or pagination.get("title_paths")
+    url_path = pagination.get("url_path") or pagination.get("url_paths")
+    url_template = pagination.get("url_template")
+    missing = [
+        key for key, val in (("api_url", api_url), ("list_path", list_path), ("title_path", title_path)) if not val
+    ]
+    if not url_path and not url_template:
+        missing.append("url_path/url_template")
+    if missing:
+        raise SourceSpecError(kind, name, f"json_api 缺少 {', '.join(missing)}")
+    method = str(pagination.get("method") or "GET").upper()
+    if method not in ("GET", "POST"):
+        raise SourceSpecError(kind, name, f"json_api.method 仅支持 GET/POST，实际为 {method!r}")
+    headers = pagination.get("headers") or {}
+    if not isinstance(headers, dict):
+        raise SourceSpecError(kind, name, "json_api.headers 必须是映射")
+    next_vars = pagination.get("next_vars") or {}
+    if not isinstance(next_vars, dict):
+        raise SourceSpecError(kind, name, "json_api.next_vars 必须是 变量名 -> 路径 的映射")
+    # 空路径会编译为 None，翻页时调用才报错；在编译期拒绝
+    empty_vars = [str(k) for k, v in next_vars.items() if not v or (isinstance(v, list) and not all(v))]
+    if empty_vars:
+        raise SourceSpecError(kind, name, f"json_api.next_vars 的路径不能为空: {', '.join(empty_vars)}")
+    published_path = pagination.get("published_path")
+    summary_path = pagination.get("summary_path")
+    return JsonApiPlan(
+        api_url=compile_template(api_url),
+        method=method,
+        list_items=_paths(kind, name, "list_path", list_path),
+        title=_paths(kind, name, "title_path", title_path),
+        url=_paths(kind, name, "url_path", url_path),
+        url_template=compile_template(url_template) if url_template else None,
+        published=compile_path(published_path) if published_path else None,
+        summary=compile_path(summary_path) if summary_path else None,
+        headers={str(k): str(v) for k, v in headers.items()},
+        params=compile_template(pagination.get("params") or {}),
+        json_body=compile_template(pagination.get("json") or {}),
+        base_url=pagination.get("base_url") or url,
+        next_vars={str(k): _paths(kind, name, f"next_vars.{k}", v) for k, v in next_vars.items()},
+    )
+
+
+def compile_web_source(entry: Dict[str, Any]) -> WebPlan:
+    """编译单个 Web 来源配置，配置不合法时抛出 SourceSpecError"""
+    kind = "web"
+    name = entry.get("name")
+    url = entry.get("url")
+    if not name or not isinstance(url, str) or not url:
+        raise SourceSpecError(kind, name, "缺少 name 或 url")
+    selector = entry.get("selector") or {}
+    if not isinstance(selector, dict) or not selector.get("item"):
+        raise SourceSpecError(kind, name, "缺少 selector.item")
+    filters = entry.get("filters") or {}
+    pagination = entry.get("pagination") or {}
+    if not isinstance(pagination, dict):
+        raise SourceSpecError(kind, name, "pagination 必须是映射")
+    p_type = str(pagination.get("type") or "").lower()
+    if p_type not in _PAGINATION_TYPES:
+        raise SourceSpecError(kind, name, f"未知的 pagination.type {p_type!r}，可选 {', '.join(t for t in _PAGINATION_TYPES if t)}")
+    include_keywords = _str_list(kind, name, "filters.include_keywords", filters.get("include_keywords"))
+
+    plan = WebPlan(
+        name=name,
+        url=url,
+        tags=_str_list(kind, name, "tags", entry.get("tags")),
+        item_selector=_selector(kind, name, "selector.item", selector.get("item")),
+        url_attr=selector.get("url_attr", "href") or "href",
+        title_attr=selector.get("title_attr", "text") or "text",
+        include_keywords=include_keywords,
+        keyword_filter=KeywordMatcher(include_keywords) if include_keywords else None,
+        pagination=pagination,
+        pagination_type=p_type,
+        max_pages=_int(kind, name, "pagination.max_pages", pagination.get("max_pages"), 1, minimum=1),
+        stop_on_empty=bool(pagination.get("stop_on_empty", True)),
+        parser=_parser(kind, name, entry.get("parser")),
+    )
+    if p_type == "param":
+        plan.param_name = pagination.get("param_name", "page") or "page"
+        plan.param_start = _int(kind, name, "pagination.start", pagination.get("start"), 1)
+        plan.param_step = _int(kind, name, "pagination.step", pagination.get("step"), 1, minimum=1)
+    elif p_type == "next":
+        if not pagination.get("next_selector"):
+            raise SourceSpecError(kind, name, "pagination.type=next 需要 next_selector")
+        plan.next_selector = _selector(kind, name, "pagination.next_selector", pagination.get("next_selector"))
+        plan.next_url_attr = pagination.get("next_url_attr", "href") or "href"
+    elif p_type == "page_links":
+        plan.links_selector = _selector(
+            kind, name, "pagination.links_selector", pagination.get("links_selector", _DEFAULT_LINKS_SELECTOR)
+        )
+    elif p_type == "json_api":
+        plan.json_api = _compile_json_api(name, url, pagination)
+    return plan
+
+
+def compile_sources(cfg: Dict[str, Any]) -> CompiledSources:
+    """校验并编译 sources.yaml 中启用的 rss/web/wechat 来源
+
+    每个来源独立编译：不合法的来源记录到 errors 并被跳过，其余来源不受影响。
+    """
+    compiled = CompiledSources()
+    for entry in cfg.get("rss", []) or []:
+        if not entry.get("enabled", True):
+            continue
+        name, url = entry.get("name"), entry.get("url")
+        try:
+            if not name or not url:
+                raise SourceSpecError("rss", name, "缺少 name 或 url")
+            compiled.rss.append(RssPlan(name=name, url=url, tags=_str_list("rss", name, "tags", entry.get("tags"))))
+        except SourceSpecError as exc:
+            compiled.errors.append(exc)
+    for entry in cfg.get("web", []) or []:
+        if not entry.get("enabled", True):
+            continue
+        try:
+            compiled.web.append(compile_web_source(entry))
+        except SourceSpecError as exc:
+            compiled.errors.append(exc)
+    for entry in cfg.get("wechat", []) or []:
+        if not entry.get("enabled", True):
+            continue
+        name, query = entry.get("name"), entry.get("query")
+        try:
+            if not name or not query:
+                raise SourceSpecError("wechat", name, "缺少 name 或 query")
+            compiled.wechat.append(
+                WechatPlan(
+                    name=name,
+                    query=query,
+                    tags=_str_list("wechat", name, "tags", entry.get("tags")),
+                    max_pages=_int("wechat", name, "max_pages", entry.get("max_pages"), 1, minimum=1),
+                    parser=_parser("wechat", name, entry.get("parser")),
+                )
+            )
+        except SourceSpecError as exc:
+            compiled.errors.append(exc)
+    for exc in compiled.errors:
+        log.error("%s", exc)
+    return compiled
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Optional, Dict, Any, Set
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
 
 import requests
-from bs4 import BeautifulSoup
 
 from src.models import NewsItem
-from src.sources.common import http_get, DEFAULT_HEADERS_HTML
-from src.tools.nested import get_from_path, render_value
+from src.sources.common import http_get, record_response, DEFAULT_HEADERS_HTML
+from src.sources.html_backend import make_soup
+from src.sources.source_spec import WebPlan, compile_web_source
+from src.storage.watermarks import SourceWatermark
 
 
 log = logging.getLogger("web")
@@ -36,27 +37,15 @@ def _extract_title(el, title_attr: str) -> str:
     return ""
 
 
-def _get_from_path(obj: Any, path: str) -> Any:
-    """从嵌套字典/列表中按点路径提取字段，例如 data.items.0.title"""
-    return get_from_path(obj, path)
-
-
-def _render_value(val: Any, variables: Dict[str, Any]) -> Any:
-    return render_value(val, variables)
-
-
-def _get_first_by_paths(obj: Any, paths: Any) -> Any:
-    """在给定的多个路径中依次查找第一个非空值。paths 可以是字符串或字符串列表。"""
-    if obj is None or paths is None:
-        return None
-    if isinstance(paths, str):
-        return _get_from_path(obj, paths)
-    if isinstance(paths, list):
-        for p in paths:
-            v = _get_from_path(obj, p)
-            if v not in (None, ""):
-                return v
-    return None
+def extract_list_entries(soup, plan: WebPlan, page_url: str) -> List[Tuple[str, str]]:
+    """按计划从已解析页面提取 (标题, 绝对链接)，缺少标题或链接的元素跳过（与抓取循环的取值一致）"""
+    entries: List[Tuple[str, str]] = []
+    for el in plan.item_selector.select(soup):
+        title = _extract_title(el, plan.title_attr)
+        link = urljoin(page_url, el.get(plan.url_attr) or "")
+        if title and link:
+            entries.append((title, link))
+    return entries
 
 
 def fetch_web(
@@ -68,6 +57,8 @@ def fetch_web(
     include_keywords: Optional[List[str]] = None,
     tags: Optional[List[str]] = None,
     pagination: Optional[Dict[str, Any]] = None,
+    watermark: Optional[SourceWatermark] = None,
+    plan: Optional[WebPlan] = None,
 ) -> Iterable[NewsItem]:
     """按配置抓取 Web 列表页面，支持翻页。
 
@@ -83,15 +74,35 @@ def fetch_web(
           - next_selector: 下一页链接的 CSS 选择器
           - next_url_attr: 链接属性名，默认 "href"
           - stop_on_empty: 若某页无任何命中则提前停止（默认 true）
-    """
 
-    tags = tags or []
-    include_keywords = include_keywords or []
-    pagination = pagination or {}
+    watermark（可选）：来源增量水位。某页的全部条目均已在历史运行中见过时停止翻页，
+    并记录节省的页数。
+
+    plan（可选）：由 source_spec.compile_sources 预编译的抓取计划（选择器、路径访问器、模板与关键词
+    匹配器均已编译）；传入时忽略其余配置参数，未传入时按参数即时编译（配置不合法抛出 SourceSpecError）。
+    """
 
-    max_pages = int(pagination.get("max_pages", 1) or 1)
-    p_type = (pagination.get("type") or "").lower()
-    stop_on_empty = bool(pagination.get("stop_on_empty", True))
+    if plan is None:
+        plan = compile_web_source(
+            {
+                "name": name,
+                "url": url,
+                "tags": tags or [],
+                "selector": {"item": selector_item, "url_attr": url_attr, "title_attr": title_attr},
+                "filters": {"include_keywords": include_keywords or []},
+                "pagination": pagination or {},
+            }
+        )
+    name = plan.name
+    url = plan.url
+    tags = plan.tags
+    pagination = plan.pagination
+    selector_item = plan.item_selector.selector
+    url_attr = plan.url_attr
+    title_attr = plan.title_attr
+    max_pages = plan.max_pages
+    p_type = plan.pagination_type
+    stop_on_empty = plan.stop_on_empty
 
     log.info(
         "Web 抓取开始: name=%s url=%s selector=%s pagination=%s",
@@ -108,34 +119,33 @@ def fetch_web(
     produced = 0
     seen_links: Set[str] = set()
 
+    def page_fetched() -> None:
+        if watermark is not None:
+            watermark.record_pages(1, 0)
+
+    def covered(page_idx: int, entries: List[tuple], total_pages: int) -> bool:
+        """记录本页条目到水位；整页条目均已知时记录节省的页数并返回 True"""
+        if watermark is None:
+            return False
+        for entry_url, entry_published in entries:
+            watermark.observe(entry_url, entry_published)
+        if not watermark.page_covered(entries):
+            return False
+        pages_saved = max(0, total_pages - page_idx)
+        watermark.record_pages(0, pages_saved)
+        log.info("Web 水位命中，停止翻页: name=%s page=%s pages_saved=%s", name, page_idx, pages_saved)
+        return True
+
     with requests.Session() as session:
         current_url = url
 
         # JSON API 模式：适配滚动/接口分页，忽略 HTML 选择器
         if p_type == "json_api":
-            api_url = pagination.get("api_url")
-            method = (pagination.get("method") or "GET").upper()
-            list_path = pagination.get("list_path") or pagination.get("list_paths")
-            url_path = pagination.get("url_path") or pagination.get("url_paths")
-            title_path = pagination.get("title_path") or pagination.get("title_paths")
-            published_path = pagination.get("published_path")
-            summary_path = pagination.get("summary_path")
-            url_template = pagination.get("url_template")
-            headers_override = pagination.get("headers") or {}
-            params_tmpl = pagination.get("params") or {}
-            json_tmpl = pagination.get("json") or {}
-            base_for_join = pagination.get("base_url") or url
-            next_vars = pagination.get("next_vars") or {}
-
-            # 允许使用 url_path 或 url_template 其一，用于构造详情链接
-            if (not api_url) or (not list_path) or (not title_path) or ((not url_path) and (not url_template)):
-                log.info(
-                    "Web JSON API 配置不完整，跳过: name=%s api_url=%s list_path=%s title_path=%s url_path/url_template=%s/%s",
-                    name, bool(api_url), bool(list_path), bool(title_path), bool(url_path), bool(url_template)
-                )
-                return
+            api = plan.json_api
+            headers = {**DEFAULT_HEADERS_HTML, **api.headers}
 
             produced_api = 0
+            watermark_stopped = False
             try:
                 prev_vars: Dict[str, Any] = {"page_callback": ""}
                 for page_idx in range(1, max_pages + 1):
@@ -145,25 +155,26 @@ def fetch_web(
                         "page_event": 1 if page_idx == 1 else 2,
                         "page_callback": prev_vars.get("page_callback", ""),
                     }
-                    req_url = _render_value(api_url, variables)
-                    req_params = _render_value(params_tmpl, variables)
-                    req_json = _render_value(json_tmpl, variables)
+                    req_url = api.api_url(variables)
+                    req_params = api.params(variables)
+                    req_json = api.json_body(variables)
 
-                    if method == "POST":
-                        resp = session.post(
+                    if api.method == "POST":
+                        resp = record_response(session.post(
                             req_url,
-                            headers={**DEFAULT_HEADERS_HTML, **headers_override},
+                            headers=headers,
                             params=req_params or None,
                             json=req_json or None,
                             timeout=10.0,
-                        )
+                        ))
                     else:
                         # 对 GET 使用共有 http_get（不含 params），若存在 params 则回退到 session.get
                         if req_params:
-                            resp = session.get(req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override}, params=req_params or None, timeout=10.0)
+                            resp = record_response(session.get(req_url, headers=headers, params=req_params or None, timeout=10.0))
                         else:
-                            resp = http_get(session, req_url, headers={**DEFAULT_HEADERS_HTML, **headers_override})
+                            resp = http_get(session, req_url, headers=headers)
                     resp.raise_for_status()
+                    page_fetched()
                     try:
                         data = resp.json()
                     except Exception as exc:
@@ -172,33 +183,34 @@ def fetch_web(
                             break
                         else:
                             continue
-                    items = _get_first_by_paths(data, list_path) or []
+                    items = api.list_items(data) or []
                     log.info(
                         "Web JSON API: name=%s page=%s url=%s items=%s",
                         name, page_idx, req_url, len(items) if isinstance(items, list) else type(items)
                     )
 
                     page_produced = 0
+                    page_entries: List[tuple] = []
                     if isinstance(items, list):
                         for it in items:
-                            title = _get_first_by_paths(it, title_path)
+                            title = api.title(it)
                             # 先优先使用 url_path 抽取，若无则用 url_template 渲染
-                            link = _get_first_by_paths(it, url_path) if url_path else None
-                            if (not link) and url_template:
+                            link = api.url(it) if api.url else None
+                            if (not link) and api.url_template:
                                 try:
                                     # 允许使用顶层字段进行模板渲染
-                                    link = _render_value(url_template, {**variables, **(it if isinstance(it, dict) else {})})
+                                    link = api.url_template({**variables, **(it if isinstance(it, dict) else {})})
                                 except Exception:
                                     link = None
                             if not isinstance(title, str) or not isinstance(link, str):
                                 continue
-                            link_full = urljoin(base_for_join, link)
-                            summary_val = _get_from_path(it, summary_path) if summary_path else None
+                            link_full = urljoin(api.base_url, link)
+                            summary_val = api.summary(it) if api.summary else None
                             # 解析发布时间（可选）
                             published_at_val = None
-                            if published_path:
+                            if api.published:
                                 try:
-                                    raw_dt = _get_from_path(it, published_path)
+                                    raw_dt = api.published(it)
                                     if isinstance(raw_dt, str) and raw_dt.strip():
                                         s = raw_dt.strip().replace("/", "-")
                                         # 常见格式：YYYY-MM-DD HH:MM:SS
@@ -215,11 +227,10 @@ def fetch_web(
                                 except Exception:
                                     published_at_val = None
                             summary_text = str(summary_val) if isinstance(summary_val, (str, int, float)) else None
+                            page_entries.append((link_full, published_at_val))
 
-                            if include_keywords:
-                                lowered = title.lower()
-                                if not any(k.lower() in lowered for k in include_keywords):
-                                    continue
+                            if not plan.title_allowed(title):
+                                continue
 
                             if link_full in seen_links:
                                 continue
@@ -239,17 +250,18 @@ def fetch_web(
                                 fetched_at=datetime.now(timezone.utc),
                             )
 
+                    if covered(page_idx, page_entries, max_pages):
+                        watermark_stopped = True
+                        break
+
                     if page_produced == 0 and stop_on_empty:
                         log.info("Web JSON API 提前停止: name=%s page=%s 无命中", name, page_idx)
                         break
 
                     # 更新翻页变量供下一页使用
-                    if isinstance(next_vars, dict) and next_vars:
-                        for var_name, path in next_vars.items():
-                            if isinstance(path, list):
-                                val = _get_first_by_paths(data, path)
-                            else:
-                                val = _get_from_path(data, path)
+                    if api.next_vars:
+                        for var_name, accessor in api.next_vars.items():
+                            val = accessor(data)
                             if val is not None:
                                 prev_vars[var_name] = val
                                 try:
@@ -263,23 +275,25 @@ def fetch_web(
                 log.exception("Web JSON API 失败: name=%s err=%s", name, exc)
 
             log.info("Web JSON API 产生条目: name=%s total=%s", name, produced_api)
-            # 若 JSON API 成功产出条目，则返回；否则继续走 HTML 保底
-            if produced_api > 0:
+            # 若 JSON API 成功产出条目（或因水位命中而停止），则返回；否则继续走 HTML 保底
+            if produced_api > 0 or watermark_stopped:
                 return
 
         # PAGE_LINKS 模式：从第一页提取页码链接，抓取后续页面
         if p_type == "page_links":
-            links_selector = pagination.get("links_selector", ".pagination a, .pager a, .page-numbers a")
+            links_selector = plan.links_selector.selector
 
             # 先抓取第一页
             resp = http_get(session, current_url, headers=DEFAULT_HEADERS_HTML)
+            page_fetched()
             log.info("Web 页面获取: name=%s page=%s status=%s url=%s", name, 1, resp.status_code, current_url)
-            soup = BeautifulSoup(resp.text, "html.parser")
+            soup = make_soup(resp.text, plan.parser)
 
-            elements = soup.select(selector_item)
+            elements = plan.item_selector.select(soup)
             log.info("Web 选择器命中: name=%s page=%s count=%s", name, 1, len(elements))
 
             page_produced = 0
+            page_entries: List[tuple] = []
             for el in elements:
                 title = _extract_title(el, title_attr)
                 if url_attr == "href":
@@ -288,10 +302,9 @@ def fetch_web(
                     link = urljoin(current_url, el.get(url_attr) or "")
                 if not title or not link:
                     continue
-                if include_keywords:
-                    lowered = title.lower()
-                    if not any(k.lower() in lowered for k in include_keywords):
-                        continue
+                page_entries.append((link, None))
+                if not plan.title_allowed(title):
+                    continue
                 if link in seen_links:
                     continue
                 seen_links.add(link)
@@ -308,9 +321,13 @@ def fetch_web(
                     fetched_at=datetime.now(timezone.utc),
                 )
 
+            if covered(1, page_entries, max_pages):
+                log.info("Web 产生条目: name=%s total=%s", name, produced)
+                return
+
             # 提取分页链接
             page_links = []
-            for a in soup.select(links_selector):
+            for a in plan.links_selector.select(soup):
                 href = a.get("href")
                 if not href:
                     continue
@@ -348,11 +365,13 @@ def fetch_web(
             page_num = 2
             for link_url in follow_links:
                 resp2 = http_get(session, link_url, headers=DEFAULT_HEADERS_HTML)
+                page_fetched()
                 log.info("Web 页面获取: name=%s page=%s status=%s url=%s", name, page_num, resp2.status_code, link_url)
-                soup2 = BeautifulSoup(resp2.text, "html.parser")
-                elements2 = soup2.select(selector_item)
+                soup2 = make_soup(resp2.text, plan.parser)
+                elements2 = plan.item_selector.select(soup2)
                 log.info("Web 选择器命中: name=%s page=%s count=%s", name, page_num, len(elements2))
                 page_produced2 = 0
+                page_entries2: List[tuple] = []
                 for el in elements2:
                     title = _extract_title(el, title_attr)
                     if url_attr == "href":
@@ -361,10 +380,9 @@ def fetch_web(
                         link = urljoin(link_url, el.get(url_attr) or "")
                     if not title or not link:
                         continue
-                    if include_keywords:
-                        lowered = title.lower()
-                        if not any(k.lower() in lowered for k in include_keywords):
-                            continue
+                    page_entries2.append((link, None))
+                    if not plan.title_allowed(title):
+                        continue
                     if link in seen_links:
                         continue
                     seen_links.add(link)
@@ -380,6 +398,8 @@ def fetch_web(
                         source_type="web",
                         fetched_at=datetime.now(timezone.utc),
                     )
+                if covered(page_num, page_entries2, len(follow_links) + 1):
+                    break
                 if page_produced2 == 0 and stop_on_empty:
                     log.info("Web 提前停止: name=%s page=%s 无命中", name, page_num)
                     break
@@ -391,22 +411,21 @@ def fetch_web(
         for page_idx in range(1, max_pages + 1):
             # 计算本页 URL
             if p_type == "param":
-                param_name = pagination.get("param_name", "page")
-                start = int(pagination.get("start", 1) or 1)
-                step = int(pagination.get("step", 1) or 1)
-                page_value = start + (page_idx - 1) * step
-                page_url = build_url_with_param(url, param_name, page_value)
+                page_value = plan.param_start + (page_idx - 1) * plan.param_step
+                page_url = build_url_with_param(url, plan.param_name, page_value)
             else:
                 page_url = current_url
 
             resp = http_get(session, page_url, headers=DEFAULT_HEADERS_HTML)
+            page_fetched()
             log.info("Web 页面获取: name=%s page=%s status=%s url=%s", name, page_idx, resp.status_code, page_url)
-            soup = BeautifulSoup(resp.text, "html.parser")
+            soup = make_soup(resp.text, plan.parser)
 
-            elements = soup.select(selector_item)
+            elements = plan.item_selector.select(soup)
             log.info("Web 选择器命中: name=%s page=%s count=%s", name, page_idx, len(elements))
 
             page_produced = 0
+            page_entries = []
             for el in elements:
                 title = _extract_title(el, title_attr)
                 if url_attr == "href":
@@ -417,11 +436,10 @@ def fetch_web(
                 if not title or not link:
                     log.debug("Web 丢弃: 缺少标题或链接 title=%r link=%r", title, link)
                     continue
+                page_entries.append((link, None))
 
-                if include_keywords:
-                    lowered = title.lower()
-                    if not any(k.lower() in lowered for k in include_keywords):
-                        continue
+                if not plan.title_allowed(title):
+                    continue
 
                 if link in seen_links:
                     continue
@@ -440,18 +458,17 @@ def fetch_web(
                     fetched_at=datetime.now(timezone.utc),
                 )
 
+            if covered(page_idx, page_entries, max_pages):
+                break
+
             if page_produced == 0 and stop_on_empty:
                 log.info("Web 提前停止: name=%s page=%s 无命中", name, page_idx)
                 break
 
             # 计算下一页 URL（当 type=next）
             if p_type == "next":
-                next_selector = pagination.get("next_selector")
-                next_attr = pagination.get("next_url_attr", "href")
-                if not next_selector:
-                    log.info("Web 翻页配置缺少 next_selector，停止 name=%s page=%s", name, page_idx)
-                    break
-                next_el = soup.select_one(next_selector)
+                next_attr = plan.next_url_attr
+                next_el = plan.next_selector.select_one(soup)
                 if not next_el:
                     log.info("Web 未找到下一页链接，停止 name=%s page=%s", name, page_idx)
                     break
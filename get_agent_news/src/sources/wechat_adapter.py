@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import contextvars
 import logging
-from typing import Iterable, List, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 from urllib.parse import quote, urljoin
 
 import requests
-from bs4 import BeautifulSoup
 
 from src.models import NewsItem
-from src.sources.common import http_get, DEFAULT_HEADERS_WECHAT
+from src.sources.common import http_get, source_scope, DEFAULT_HEADERS_WECHAT
+from src.sources.html_backend import make_soup
+from src.storage.watermarks import SourceWatermark
 
 
 log = logging.getLogger("wechat")
@@ -29,8 +33,8 @@ def _extract_title(a_tag) -> str:
     return ""
 
 
-def _parse_list(html: str, query: str, name: str, tags: List[str]) -> List[NewsItem]:
-    soup = BeautifulSoup(html, "html.parser")
+def _parse_list(html: str, query: str, name: str, tags: List[str], parser: Optional[str] = None) -> List[NewsItem]:
+    soup = make_soup(html, parser)
     items: List[NewsItem] = []
     # Typical selector: div.news-box > ul.news-list > li > div.txt-box > h3 > a
     candidates = soup.select("div.news-box ul.news-list li div.txt-box h3 a")
@@ -61,20 +65,60 @@ def _parse_list(html: str, query: str, name: str, tags: List[str]) -> List[NewsI
     return items
 
 
-def fetch_wechat_search(name: str, query: str, tags: List[str], max_pages: int = 1) -> Iterable[NewsItem]:
+def _search_url(query: str, page: int) -> str:
     # type=2 for article search; page starts at 1
+    return f"{BASE_URL}?type=2&query={quote(query)}&page={page}"
+
+
+def fetch_wechat_search(
+    name: str,
+    query: str,
+    tags: List[str],
+    max_pages: int = 1,
+    watermark: Optional[SourceWatermark] = None,
+    parser: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    prefetch: bool = True,
+) -> Iterable[NewsItem]:
+    """按页抓取搜狗微信搜索结果
+
+    prefetch=True 时第 N 页解析与产出期间已在后台请求第 N+1 页（仍经过主机级速率限制）；
+    因空页或水位命中停止时，预取的那一页被丢弃。传入 session 时复用调用方的会话。
+    """
+    own_session = session is None
+    session = session or requests.Session()
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wechat-prefetch") if prefetch and max_pages > 1 else None
+
+    def _fetch(page_no: int) -> str:
+        url = _search_url(query, page_no)
+        log.debug("WeChat 搜索: page=%s url=%s", page_no, url)
+        return http_get(session, url, headers=DEFAULT_HEADERS_WECHAT).text
+
+    def _submit(page_no: int) -> Future:
+        if pool is not None:
+            return pool.submit(contextvars.copy_context().run, _fetch, page_no)
+        fut: Future = Future()
+        try:
+            fut.set_result(_fetch(page_no))
+        except Exception as exc:
+            fut.set_exception(exc)
+        return fut
+
     page = 1
     total = 0
-    with requests.Session() as session:
-        while page <= max_pages:
-            url = f"{BASE_URL}?type=2&query={quote(query)}&page={page}"
-            log.debug("WeChat 搜索: page=%s url=%s", page, url)
+    pending: Optional[Future] = _submit(1)
+    try:
+        while pending is not None and page <= max_pages:
             try:
-                resp = http_get(session, url, headers=DEFAULT_HEADERS_WECHAT)
+                html = pending.result()
             except Exception as e:
                 log.warning("WeChat 搜索失败: page=%s err=%s", page, e)
                 break
-            items = _parse_list(resp.text, query, name, tags)
+            # 解析本页前先发出下一页请求
+            pending = _submit(page + 1) if page < max_pages else None
+            if watermark is not None:
+                watermark.record_pages(1, 0)
+            items = _parse_list(html, query, name, tags, parser)
             log.info("WeChat 完成: name=%s query=%s page=%s count=%s", name, query, page, len(items))
             for it in items:
                 yield it
@@ -82,4 +126,73 @@ def fetch_wechat_search(name: str, query: str, tags: List[str], max_pages: int =
             # simple stop if page yields nothing
             if not items:
                 break
+            if watermark is not None:
+                entries = [(it.url, it.published_at) for it in items]
+                for entry_url, entry_published in entries:
+                    watermark.observe(entry_url, entry_published)
+                if watermark.page_covered(entries):
+                    saved = max(0, max_pages - page)
+                    watermark.record_pages(0, saved)
+                    log.info("WeChat 水位命中，停止翻页: name=%s query=%s page=%s pages_saved=%s", name, query, page, saved)
+                    break
             page += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if pool is not None:
+            pool.shutdown(wait=True)
+        if own_session:
+            session.close()
+
+
+def _fetch_plan(plan: Any, watermark: Optional[SourceWatermark], session: requests.Session) -> Tuple[List[NewsItem], float]:
+    t0 = time.perf_counter()
+    with source_scope(plan.name):
+        items = list(
+            fetch_wechat_search(
+                name=plan.name,
+                query=plan.query,
+                tags=plan.tags,
+                max_pages=plan.max_pages,
+                watermark=watermark,
+                parser=plan.parser,
+                session=session,
+            )
+        )
+    return items, time.perf_counter() - t0
+
+
+def fetch_wechat_sources(
+    plans: Sequence[Any],
+    watermarks: Optional[Any] = None,
+    max_workers: int = 4,
+) -> List[Tuple[Any, List[NewsItem], Optional[BaseException], float]]:
+    """多个微信搜索来源共享一个会话并发抓取，请求在主机级速率限制下交错进行
+
+    Args:
+        plans: WechatPlan 列表
+        watermarks: WatermarkStore（可选）
+        max_workers: 同时进行的来源数
+
+    Returns:
+        按 plans 顺序的 (plan, 条目列表, 异常或 None, 耗时秒数)；请求按来源计入 request_stats
+    """
+    if not plans:
+        return []
+    # 水位对象在主线程取出，每个来源只由一个工作线程使用
+    source_marks = [watermarks.get(p.name) if watermarks else None for p in plans]
+    with requests.Session() as session, ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(plans))), thread_name_prefix="wechat"
+    ) as pool:
+        futures = [
+            pool.submit(_fetch_plan, plan, mark, session)
+            for plan, mark in zip(plans, source_marks)
+        ]
+        results: List[Tuple[Any, List[NewsItem], Optional[BaseException], float]] = []
+        for plan, fut in zip(plans, futures):
+            try:
+                items, seconds = fut.result()
+                results.append((plan, items, None, seconds))
+            except Exception as exc:
+                results.append((plan, [], exc, 0.0))
+    return results
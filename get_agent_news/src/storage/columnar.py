@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.models import NewsItem
+from src.storage.export_sinks import ExportSink
+
+try:  # 可选依赖：未安装 pyarrow 时跳过列式导出，JSONL/CSV 不受影响
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    ds = None
+    pq = None
+
+
+def _import_time_range_filter():
+    try:
+        from common.parquet_filters import time_range_filter  # type: ignore
+    except ImportError:
+        # 尝试将项目根目录加入 sys.path（.../get_agent_news/src/storage -> 三层上去是项目根）
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        if root not in sys.path:
+            sys.path.append(root)
+        from common.parquet_filters import time_range_filter  # type: ignore
+    return time_range_filter
+
+
+time_range_filter = _import_time_range_filter()
+PARQUET_DIR_NAME = "parquet"
+PARTITION_KEY = "date"
+
+NEWS_COLUMNS = [
+    "source",
+    "title",
+    "url",
+    "published_at",
+    "summary",
+    "tags",
+    "source_type",
+    "fetched_at",
+    "url_hash",
+    "cluster_id",
+    "score",
+]
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def news_schema() -> "pa.Schema":
+    """资讯列式 schema：时间戳为 UTC 微秒，tags 为字符串列表，分区列 date 不落入文件"""
+    ts = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("source", pa.string()),
+            ("title", pa.string()),
+            ("url", pa.string()),
+            ("published_at", ts),
+            ("summary", pa.string()),
+            ("tags", pa.list_(pa.string())),
+            ("source_type", pa.string()),
+            ("fetched_at", ts),
+            ("url_hash", pa.string()),
+            ("cluster_id", pa.string()),
+            ("score", pa.float64()),
+        ]
+    )
+
+
+def _to_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class ParquetSink(ExportSink):
+    """按日期分区的 Parquet 导出：parquet/date=YYYY-MM-DD/part-0.parquet
+
+    逐条追加到按日期分组的列缓冲，close 时每个分区写一个文件（zstd 压缩，带列统计），
+    读取端可按 date 分区裁剪目录，并按列统计跳过行组。
+    """
+
+    name = "parquet"
+
+    def __init__(
+        self,
+        run_dir: str,
+        row_group_size: int = 64 * 1024,
+        compression: str = "zstd",
+        required: bool = False,
+    ) -> None:
+        super().__init__(required=required)
+        if pa is None:
+            raise RuntimeError("pyarrow 未安装，无法写入 Parquet")
+        self.root = os.path.join(run_dir, PARQUET_DIR_NAME)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = news_schema()
+        self._columns: Dict[date, Dict[str, List[Any]]] = defaultdict(lambda: {c: [] for c in NEWS_COLUMNS})
+        self.paths: List[str] = []
+
+    def _write(self, item: NewsItem, row: Dict[str, Any]) -> int:
+        # 字节数在 close 写文件时统计
+        date_obj = (item.published_at or item.fetched_at).date()
+        cols = self._columns[date_obj]
+        for name in NEWS_COLUMNS:
+            cols[name].append(row.get(name))
+        cols["published_at"][-1] = _to_utc(item.published_at)
+        cols["fetched_at"][-1] = _to_utc(item.fetched_at)
+        return 0
+
+    def close(self) -> None:
+        if self.failed:
+            # 写入阶段已停用：缓冲中的行不完整，不落盘
+            self._columns.clear()
+            return
+        try:
+            self._write_partitions()
+        except Exception:
+            # 读取端见到 parquet/ 目录就优先读取，不完整的分区必须删除，回退到 news.jsonl
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.paths.clear()
+            raise
+        finally:
+            self._columns.clear()
+
+    def _write_partitions(self) -> None:
+        for date_obj in sorted(self._columns):
+            cols = self._columns[date_obj]
+            table = pa.table(
+                {name: pa.array(cols[name], type=self.schema.field(name).type) for name in NEWS_COLUMNS},
+                schema=self.schema,
+            )
+            part_dir = os.path.join(self.root, f"{PARTITION_KEY}={date_obj.isoformat()}")
+            os.makedirs(part_dir, exist_ok=True)
+            path = os.path.join(part_dir, "part-0.parquet")
+            pq.write_table(table, path, compression=self.compression, row_group_size=self.row_group_size)
+            self.bytes_written += os.path.getsize(path)
+            self.paths.append(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["partitions"] = len(self.paths)
+        return stats
+
+
+def has_parquet(run_dir: str) -> bool:
+    return pa is not None and os.path.isdir(os.path.join(run_dir, PARQUET_DIR_NAME))
+
+
+def read_run_table(
+    run_dir: str,
+    columns: Optional[Sequence[str]] = None,
+    start_dt: Optional[datetime] = None,
+    end_dt: Optional[datetime] = None,
+) -> "pa.Table":
+    """读取单个运行目录的 Parquet 导出，支持列裁剪与时间谓词下推
+
+    时间过滤与 JSONL 读取一致：以 published_at 为准，缺失时使用 fetched_at（谓词见 common.parquet_filters）。
+    """
+    dataset = ds.dataset(
+        os.path.join(run_dir, PARQUET_DIR_NAME),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]), flavor="hive"),
+    )
+    expr = None
+    if start_dt is not None and end_dt is not None:
+        expr = time_range_filter(start_dt, end_dt, PARTITION_KEY)
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expr)
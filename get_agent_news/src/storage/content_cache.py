@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+DEFAULT_CONTENT_CACHE_PATH = os.path.join("data", "state", "article_content.sqlite3")
+
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class CachedContent:
+    url_hash: str
+    status: str
+    text: str
+    attempts: int
+
+
+class ContentCache:
+    """以 url_hash 为键的正文抽取缓存（SQLite）
+
+    每个 URL 的正文只抓取与抽取一次；抓取失败的记录保留尝试次数，达到上限后不再重试。
+    report 等下游阶段可直接按 url_hash 读取正文文本。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CONTENT_CACHE_PATH) -> None:
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_content ("
+            " url_hash TEXT PRIMARY KEY,"
+            " url TEXT,"
+            " status TEXT NOT NULL,"
+            " text TEXT,"
+            " chars INTEGER NOT NULL DEFAULT 0,"
+            " attempts INTEGER NOT NULL DEFAULT 1,"
+            " error TEXT,"
+            " extracted_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def get_many(self, url_hashes: Iterable[str]) -> Dict[str, CachedContent]:
+        """批量查询缓存记录（含失败记录）
+
+        Args:
+            url_hashes: URL哈希列表
+
+        Returns:
+            url_hash -> CachedContent
+        """
+        hashes = list(dict.fromkeys(h for h in url_hashes if h))
+        found: Dict[str, CachedContent] = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT url_hash, status, text, attempts FROM article_content WHERE url_hash IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update((h, CachedContent(h, s, t or "", int(a))) for h, s, t, a in rows)
+        hit = sum(1 for c in found.values() if c.status != STATUS_ERROR)
+        self.hits += hit
+        self.misses += len(hashes) - hit
+        return found
+
+    def put(self, url_hash: str, url: str, status: str, text: str = "", error: Optional[str] = None) -> None:
+        """写入抽取结果；失败记录在已有尝试次数上累加"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO article_content(url_hash, url, status, text, chars, attempts, error, extracted_at)"
+                " VALUES (?, ?, ?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT(url_hash) DO UPDATE SET"
+                "  url = excluded.url, status = excluded.status, text = excluded.text, chars = excluded.chars,"
+                "  attempts = article_content.attempts + 1, error = excluded.error, extracted_at = excluded.extracted_at",
+                (url_hash, url, status, text, len(text), error, time.time()),
+            )
+            self.conn.commit()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        with self._lock:
+            rows = dict(self.conn.execute("SELECT status, COUNT(*) FROM article_content GROUP BY status").fetchall())
+        return {
+            "db_path": self.db_path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": rows,
+        }
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from src.models import NewsItem, compute_url_hash
+
+log = logging.getLogger("date_file_index")
+
+ITEM_SEPARATOR = "\n---\n\n"
+_LINK_RE = re.compile(r"^\*\*原文链接\*\*: \[[^\n]*?\]\((?P<url>[^\n]*)\)\s*$", re.MULTILINE)
+
+
+def index_path_for(md_path: str) -> str:
+    """索引文件与 Markdown 同目录：.YYYY-MM-DD.md.idx（隐藏文件，不参与目录页扫描）"""
+    dir_name, base = os.path.split(md_path)
+    return os.path.join(dir_name, f".{base}.idx")
+
+
+def date_file_header(date_obj: date) -> str:
+    return f"# {date_obj.isoformat()} 资讯\n\n"
+
+
+class DateFileIndex:
+    """单个日期 Markdown 文件的条目索引：url_hash -> (起始字节, 结束字节, 原始 URL)
+
+    索引为追加写的文本文件（每行 `url_hash\\tstart\\tend\\turl`），新条目追加到 Markdown 末尾后
+    只追加对应的索引行，写入成本与新增条目数成正比。
+    加载时以最后一个条目的结束偏移校验文件大小；不一致（旧文件无索引、手工编辑、写入中断）时
+    从 Markdown 的“原文链接”行重建索引。
+    """
+
+    def __init__(self, md_path: str) -> None:
+        self.md_path = md_path
+        self.path = index_path_for(md_path)
+        self.entries: Dict[str, Tuple[int, int, str]] = {}
+        self.urls: Set[str] = set()
+        self.file_size = 0
+        self.rebuilt = False
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.md_path):
+            return
+        self.file_size = os.path.getsize(self.md_path)
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.rstrip("\n").split("\t", 3)
+                        if len(parts) != 4:
+                            continue
+                        self._add(parts[0], int(parts[1]), int(parts[2]), parts[3])
+            except Exception as exc:
+                log.warning("读取日期索引失败，将重建: path=%s err=%s", self.path, exc)
+                self.entries.clear()
+                self.urls.clear()
+        last_end = max((e[1] for e in self.entries.values()), default=0)
+        if not self.entries or last_end != self.file_size:
+            self._rebuild()
+
+    def _add(self, url_hash: str, start: int, end: int, url: str) -> None:
+        self.entries[url_hash] = (start, end, url)
+        if url:
+            self.urls.add(url)
+
+    def _rebuild(self) -> None:
+        """从 Markdown 内容重建索引（旧文件中的条目以原始 URL 计算哈希）"""
+        self.entries.clear()
+        self.urls.clear()
+        with open(self.md_path, "rb") as f:
+            data = f.read()
+        sep = ITEM_SEPARATOR.encode("utf-8")
+        header_end = data.find(b"\n\n")
+        pos = header_end + 2 if header_end >= 0 else 0
+        while pos < len(data):
+            nxt = data.find(sep, pos)
+            end = len(data) if nxt < 0 else nxt
+            block = data[pos:end].decode("utf-8", errors="replace")
+            m = _LINK_RE.search(block)
+            if m:
+                url = m.group("url")
+                self._add(compute_url_hash(url), pos, end, url)
+            pos = len(data) if nxt < 0 else nxt + len(sep)
+        self.rebuilt = True
+        self._rewrite()
+
+    def _rewrite(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for url_hash, (start, end, url) in sorted(self.entries.items(), key=lambda kv: kv[1][0]):
+                f.write(f"{url_hash}\t{start}\t{end}\t{url}\n")
+        os.replace(tmp_path, self.path)
+
+    def contains(self, item: NewsItem) -> bool:
+        return bool(item.url_hash and item.url_hash in self.entries) or item.url in self.urls
+
+    def append_entries(self, rows: List[Tuple[str, int, int, str]]) -> None:
+        for url_hash, start, end, url in rows:
+            self._add(url_hash, start, end, url)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for url_hash, start, end, url in rows:
+                f.write(f"{url_hash}\t{start}\t{end}\t{url}\n")
+
+
+def merge_items_into_date_file(
+    md_path: str,
+    date_obj: date,
+    items: Iterable[NewsItem],
+    render: Callable[[NewsItem], str],
+) -> Tuple[int, int]:
+    """把同一天的新条目增量合并进日期 Markdown 文件
+
+    已存在的条目（url_hash 或原始 URL 命中索引）跳过，新条目以分隔线追加到文件末尾；
+    文件不存在时写入标题。合并结果与一次性写入全部条目的格式一致。
+
+    Returns:
+        (新增条目数, 写入字节数)
+    """
+    index = DateFileIndex(md_path)
+    seen: Set[str] = set()
+    chunks: List[bytes] = []
+    rows: List[Tuple[str, int, int, str]] = []
+    offset = index.file_size
+    for item in items:
+        key = item.url_hash or compute_url_hash(item.url)
+        if key in seen or index.contains(item):
+            continue
+        seen.add(key)
+        if offset == 0:
+            prefix = date_file_header(date_obj).encode("utf-8")
+        elif not index.entries and not rows:
+            # 已有文件只有标题
+            prefix = b""
+        else:
+            prefix = ITEM_SEPARATOR.encode("utf-8")
+        body = render(item).encode("utf-8")
+        start = offset + len(prefix)
+        rows.append((key, start, start + len(body), item.url or ""))
+        chunks.append(prefix + body)
+        offset = start + len(body)
+    if not chunks:
+        return (0, 0)
+    payload = b"".join(chunks)
+    with open(md_path, "ab") as f:
+        f.write(payload)
+    index.append_entries(rows)
+    return (len(rows), len(payload))
+
+
+def group_items_by_date(items: Iterable[NewsItem]) -> Dict[date, List[NewsItem]]:
+    grouped: Dict[date, List[NewsItem]] = {}
+    for item in items:
+        grouped.setdefault((item.published_at or item.fetched_at).date(), []).append(item)
+    return grouped
+
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Iterable, Optional
+
+log = logging.getLogger("dedup_store")
+
+DEFAULT_DEDUP_DB_PATH = os.path.join("data", "state", "dedup.sqlite3")
+
+
+class PersistentDedupStore:
+    """基于 SQLite 的跨运行去重索引（以 url_hash 为主键）
+
+    - 成员判断走主键索引，不受内存容量限制，也不会因淘汰而漏判历史条目
+    - 记录首次/最近出现时间，支持按时间过期清理
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DEDUP_DB_PATH, ttl_days: Optional[float] = None):
+        self.db_path = db_path
+        self.ttl_days = ttl_days
+        self.hits = 0
+        self.misses = 0
+        self.inserted = 0
+        self.expired = 0
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_urls ("
+            " url_hash TEXT PRIMARY KEY,"
+            " first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_urls_last_seen ON seen_urls(last_seen)")
+        self.conn.commit()
+        if ttl_days:
+            self.expire(ttl_days)
+
+    def contains(self, url_hash: str) -> bool:
+        """检查 url_hash 是否在历史运行中出现过
+
+        Args:
+            url_hash: URL哈希值
+
+        Returns:
+            是否已存在
+        """
+        row = self.conn.execute("SELECT 1 FROM seen_urls WHERE url_hash = ?", (url_hash,)).fetchone()
+        if row:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add_many(self, url_hashes: Iterable[str]) -> int:
+        """批量写入 url_hash；已存在的仅刷新 last_seen
+
+        Returns:
+            新增条目数
+        """
+        now = time.time()
+        rows = [(h, now, now) for h in url_hashes if h]
+        if not rows:
+            return 0
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR IGNORE INTO seen_urls(url_hash, first_seen, last_seen) VALUES (?, ?, ?)", rows)
+        added = self.conn.total_changes - before
+        self.conn.executemany("UPDATE seen_urls SET last_seen = ? WHERE url_hash = ?", [(now, h) for h, _, _ in rows])
+        self.conn.commit()
+        self.inserted += added
+        return added
+
+    def expire(self, ttl_days: float) -> int:
+        """删除最近出现时间早于 ttl_days 的条目
+
+        Returns:
+            删除条目数
+        """
+        cutoff = time.time() - float(ttl_days) * 86400
+        cur = self.conn.execute("DELETE FROM seen_urls WHERE last_seen < ?", (cutoff,))
+        self.conn.commit()
+        removed = cur.rowcount or 0
+        self.expired += removed
+        if removed:
+            log.info("去重索引过期清理: ttl_days=%s removed=%s", ttl_days, removed)
+        return removed
+
+    def size(self) -> int:
+        row = self.conn.execute("SELECT COUNT(*) FROM seen_urls").fetchone()
+        return int(row[0]) if row else 0
+
+    def get_stats(self) -> dict:
+        """获取持久化索引统计信息"""
+        total_requests = self.hits + self.misses
+        return {
+            "db_path": self.db_path,
+            "size": self.size(),
+            "ttl_days": self.ttl_days,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inserted": self.inserted,
+            "expired": self.expired,
+            "hit_rate": self.hits / total_requests if total_requests > 0 else 0.0,
+            "total_requests": total_requests,
+        }
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+log = logging.getLogger("export_compaction")
+
+COMPACTED_DIR_NAME = "_compacted"
+MANIFEST_NAME = "manifest.json"
+RUN_DIR_FORMAT = "%Y%m%d_%H%M%S"
+_MANIFEST_VERSION = 1
+
+
+def parse_run_time(name: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(name, RUN_DIR_FORMAT)
+    except ValueError:
+        return None
+
+
+def list_run_dirs(export_root: str) -> List[str]:
+    """返回导出根目录下按时间排序的运行目录名（YYYYmmdd_HHMMSS），忽略压缩分区目录"""
+    if not os.path.isdir(export_root):
+        return []
+    names = [
+        n for n in os.listdir(export_root)
+        if parse_run_time(n) is not None and os.path.isdir(os.path.join(export_root, n))
+    ]
+    return sorted(names)
+
+
+def partition_file_name(month: str) -> str:
+    return f"news-{month}.jsonl.gz"
+
+
+def _row_month(row: Dict[str, Any]) -> Optional[str]:
+    basis = row.get("published_at") or row.get("fetched_at") or ""
+    # ISO 字符串前 7 位即 YYYY-MM
+    return basis[:7] if len(basis) >= 7 and basis[4] == "-" else None
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
+
+class CompactionManifest:
+    """压缩分区清单：记录已并入的运行目录与每个月度分区的条目数、大小"""
+
+    def __init__(self, export_root: str) -> None:
+        self.dir = os.path.join(export_root, COMPACTED_DIR_NAME)
+        self.path = os.path.join(self.dir, MANIFEST_NAME)
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.partitions: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+            if data.get("version") == _MANIFEST_VERSION:
+                self.runs = data.get("runs") or {}
+                self.partitions = data.get("partitions") or {}
+
+    def save(self) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": _MANIFEST_VERSION,
+                    "updated_at": datetime.now().isoformat(),
+                    "runs": self.runs,
+                    "partitions": self.partitions,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
+
+
+def _write_partition(path: str, rows: Iterable[Dict[str, Any]]) -> int:
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def compact_exports(
+    export_root: str,
+    min_age_days: float = 7,
+    retain_days: Optional[float] = 30,
+    keep_runs: int = 3,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """把历史运行目录合并为按月的 gzip JSONL 分区（按 url_hash 去重），并按保留策略清理原始运行目录
+
+    Args:
+        export_root: 导出根目录（data/exports）
+        min_age_days: 仅压缩早于该天数的运行目录
+        retain_days: 已压缩的原始运行目录保留天数，None 表示不删除
+        keep_runs: 无论年龄如何，始终保留最近的若干个原始运行目录
+        dry_run: 只统计不写入/删除
+
+    Returns:
+        统计信息
+    """
+    now = now or datetime.now()
+    manifest = CompactionManifest(export_root)
+    runs = list_run_dirs(export_root)
+    protected = set(runs[-keep_runs:]) if keep_runs > 0 else set()
+    pending = [
+        r for r in runs
+        if r not in manifest.runs and r not in protected and now - parse_run_time(r) >= timedelta(days=min_age_days)
+    ]
+
+    # 同一 url_hash 以较新的运行为准（分数、cluster_id 等可能更新）
+    new_rows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    run_counts: Dict[str, int] = {}
+    for run in pending:
+        jsonl = os.path.join(export_root, run, "news.jsonl")
+        count = 0
+        if os.path.exists(jsonl):
+            for row in iter_jsonl(jsonl):
+                month = _row_month(row)
+                key = row.get("url_hash") or row.get("url")
+                if not month or not key:
+                    continue
+                new_rows.setdefault(month, {})[key] = row
+                count += 1
+        run_counts[run] = count
+
+    stats: Dict[str, Any] = {
+        "runs_compacted": len(pending),
+        "rows_read": sum(run_counts.values()),
+        "months_touched": sorted(new_rows),
+        "runs_deleted": [],
+    }
+    if not dry_run:
+        os.makedirs(manifest.dir, exist_ok=True)
+        for month, rows in sorted(new_rows.items()):
+            file_name = partition_file_name(month)
+            path = os.path.join(manifest.dir, file_name)
+            merged: Dict[str, Dict[str, Any]] = {}
+            if os.path.exists(path):
+                for row in iter_jsonl(path):
+                    merged[row.get("url_hash") or row.get("url")] = row
+            merged.update(rows)
+            ordered = sorted(merged.values(), key=lambda r: r.get("published_at") or r.get("fetched_at") or "")
+            size = _write_partition(path, ordered)
+            manifest.partitions[month] = {"file": file_name, "items": len(ordered), "bytes": size}
+        compacted_at = now.isoformat()
+        for run in pending:
+            manifest.runs[run] = {"compacted_at": compacted_at, "items": run_counts[run], "deleted": False}
+        manifest.save()
+
+    # 保留策略：只删除已并入分区的运行目录
+    if retain_days is not None:
+        for run in runs:
+            info = manifest.runs.get(run)
+            if info is None or run in protected or info.get("deleted"):
+                continue
+            if now - parse_run_time(run) < timedelta(days=retain_days):
+                continue
+            stats["runs_deleted"].append(run)
+            if not dry_run:
+                shutil.rmtree(os.path.join(export_root, run), ignore_errors=True)
+                info["deleted"] = True
+        if stats["runs_deleted"] and not dry_run:
+            manifest.save()
+
+    stats["partitions"] = len(manifest.partitions)
+    stats["partition_items"] = sum(p.get("items", 0) for p in manifest.partitions.values())
+    log.info("导出压缩完成: %s", {k: v for k, v in stats.items() if k != "runs_deleted"})
+    return stats
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, IO, Iterable, List, Optional
+
+from src.models import NewsItem
+from src.storage.file_stats import FileStatsCollector
+from src.tools.date_structure import ensure_date_structure
+
+log = logging.getLogger("export_sinks")
+
+_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+CSV_FIELDNAMES = [
+    "source",
+    "title",
+    "url",
+    "published_at",
+    "summary",
+    "tags",
+    "source_type",
+    "fetched_at",
+    "url_hash",
+    "cluster_id",
+    "score",
+]
+
+
+class ExportSink:
+    """导出目标基类：逐条写入，统计条目数、字节数与耗时
+
+    required=False 的 sink 写入失败时只记录日志并停用，不影响其他 sink。
+    """
+
+    name = "sink"
+
+    def __init__(self, required: bool = True) -> None:
+        self.required = required
+        self.failed = False
+        self.items = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+        self.stats: Optional[FileStatsCollector] = None
+
+    def write(self, item: NewsItem, row: Dict[str, Any]) -> None:
+        t0 = time.perf_counter()
+        self.bytes_written += self._write(item, row)
+        self.items += 1
+        elapsed = time.perf_counter() - t0
+        self.seconds += elapsed
+        if self.stats is not None:
+            self.stats.record_operation(f"export_{self.name}", elapsed)
+
+    def _write(self, item: NewsItem, row: Dict[str, Any]) -> int:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"items": self.items, "bytes": self.bytes_written, "seconds": round(self.seconds, 6), "failed": self.failed}
+
+
+class JsonlSink(ExportSink):
+    name = "jsonl"
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8", buffering=_BUFFER_SIZE)
+
+    def _write(self, item: NewsItem, row: Dict[str, Any]) -> int:
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        self._f.write(line)
+        return len(line.encode("utf-8"))
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class CsvSink(ExportSink):
+    name = "csv"
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None) -> None:
+        super().__init__()
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8", newline="", buffering=_BUFFER_SIZE)
+        # 先写入内存缓冲再落盘，以便统计字节数
+        self._buf = io.StringIO()
+        self._writer = csv.DictWriter(self._buf, fieldnames=fieldnames or CSV_FIELDNAMES, extrasaction="ignore")
+        self._writer.writeheader()
+        self.bytes_written += self._drain()
+
+    def _drain(self) -> int:
+        text = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._f.write(text)
+        return len(text.encode("utf-8"))
+
+    def _write(self, item: NewsItem, row: Dict[str, Any]) -> int:
+        row_out = dict(row)
+        row_out["tags"] = ",".join(row_out.get("tags") or [])
+        self._writer.writerow(row_out)
+        return self._drain()
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class MarkdownDateSink(ExportSink):
+    """按日期流式写入 Markdown：news/YYYY/MM/DD/YYYY-MM-DD.md
+
+    每个日期文件在首条时写入标题，后续条目以分隔线追加，输出与 FileStorage.save_news_items_by_date 一致。
+    """
+
+    name = "markdown"
+
+    def __init__(
+        self,
+        base_dir: str,
+        render: Callable[[NewsItem], str],
+        sub_dir: str = "news",
+        date_format: str = "%Y/%m/%d",
+        required: bool = False,
+    ) -> None:
+        super().__init__(required=required)
+        self.base_dir = base_dir
+        self.sub_dir = sub_dir
+        self.date_format = date_format
+        self.render = render
+        self._files: Dict[date, IO[str]] = {}
+        self.paths: List[str] = []
+
+    def _open(self, date_obj: date) -> IO[str]:
+        t0 = time.perf_counter()
+        date_dir = ensure_date_structure(
+            os.path.join(self.base_dir, self.sub_dir),
+            datetime.combine(date_obj, datetime.min.time()),
+            self.date_format,
+        )
+        if self.stats is not None:
+            self.stats.record_directory_creation(date_dir, True, time.perf_counter() - t0)
+        path = os.path.join(date_dir, f"{date_obj.isoformat()}.md")
+        f = open(path, "w", encoding="utf-8", buffering=_BUFFER_SIZE)
+        self._files[date_obj] = f
+        self.paths.append(path)
+        return f
+
+    def _write(self, item: NewsItem, row: Dict[str, Any]) -> int:
+        date_obj = (item.published_at or item.fetched_at).date()
+        f = self._files.get(date_obj)
+        if f is None:
+            f = self._open(date_obj)
+            text = f"# {date_obj.isoformat()} 资讯\n\n" + self.render(item)
+        else:
+            text = "\n---\n\n" + self.render(item)
+        f.write(text)
+        return len(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        for f in self._files.values():
+            f.flush()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["files"] = len(self.paths)
+        return stats
+
+
+_STOP = object()
+
+
+class MultiSinkWriter:
+    """单遍扇出写入器：每条数据只序列化一次，依次写入所有 sink
+
+    background=True 时由后台线程消费有界队列完成写入与定期 flush，调用方只负责投递。
+    """
+
+    def __init__(
+        self,
+        sinks: List[ExportSink],
+        serialize: Callable[[NewsItem], Dict[str, Any]],
+        background: bool = False,
+        flush_interval_s: float = 2.0,
+        queue_size: int = 1024,
+        stats: Optional[FileStatsCollector] = None,
+    ) -> None:
+        self.sinks = sinks
+        self.stats = stats
+        for sink in sinks:
+            sink.stats = stats
+        self.serialize = serialize
+        self.background = background
+        self.flush_interval_s = flush_interval_s
+        self.count = 0
+        self._error: Optional[BaseException] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._run, name="export-sinks", daemon=True)
+            self._thread.start()
+
+    def _fan_out(self, item: NewsItem) -> None:
+        row = self.serialize(item)
+        for sink in self.sinks:
+            if sink.failed:
+                continue
+            try:
+                sink.write(item, row)
+            except Exception as exc:
+                if sink.required:
+                    raise
+                sink.failed = True
+                log.warning("导出目标写入失败，已停用: sink=%s err=%s", sink.name, exc)
+
+    def _run(self) -> None:
+        assert self._queue is not None
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None and self._error is None:
+                try:
+                    self._fan_out(item)
+                except BaseException as exc:  # 记录后由调用线程在 close 时抛出
+                    self._error = exc
+            if time.monotonic() - last_flush >= self.flush_interval_s and self._error is None:
+                for sink in self.sinks:
+                    if not sink.failed:
+                        sink.flush()
+                last_flush = time.monotonic()
+
+    def write(self, item: NewsItem) -> None:
+        self.count += 1
+        if self._queue is not None:
+            if self._error is not None:
+                raise self._error
+            self._queue.put(item)
+        else:
+            self._fan_out(item)
+
+    def write_all(self, items: Iterable[NewsItem]) -> int:
+        for item in items:
+            self.write(item)
+        return self.count
+
+    def close(self) -> None:
+        if self._queue is not None and self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+        for sink in self.sinks:
+            t0 = time.perf_counter()
+            try:
+                sink.close()
+            except Exception as exc:
+                # 关闭失败的产物不完整：标记失败，README 与文件统计不再列出；必需的 sink 在全部关闭后抛出
+                sink.failed = True
+                log.warning("关闭导出目标失败: sink=%s err=%s", sink.name, exc)
+                if sink.required and self._error is None:
+                    self._error = exc
+            if self.stats is not None:
+                elapsed = time.perf_counter() - t0
+                self.stats.record_operation(f"export_{sink.name}_close", elapsed)
+                path = getattr(sink, "path", None)
+                if path and not sink.failed:
+                    self.stats.record_file_write(path, sink.bytes_written, sink.seconds + elapsed)
+        if self._error is not None:
+            raise self._error
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {sink.name: sink.get_stats() for sink in self.sinks}
@@ -1,38 +1,126 @@
 from __future__ import annotations
 
+import json
 import os
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """固定内存的 HDR 风格延迟直方图（单位：秒，内部以微秒计）
+    
+    按 2 的幂划分量级，每个量级再线性细分为 2^sub_bucket_bits 个子桶，
+    相对误差约为 1/2^sub_bucket_bits；内存只与量级数和子桶数有关，与记录次数无关。
+    """
+    
+    def __init__(self, sub_bucket_bits: int = 5, max_magnitude: int = 36):
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_magnitude = max_magnitude  # 2^36 微秒 ≈ 19 小时
+        self.counts = [0] * ((max_magnitude + 2) * self.sub_bucket_count)
+        self.count = 0
+        self.total = 0.0
+        self.min_value = float("inf")
+        self.max_value = 0.0
+    
+    def _index(self, micros: int) -> int:
+        # 小于 2*子桶数的值精确记录；更大的值按量级 m 右移后落入 [子桶数, 2*子桶数) 的子桶
+        magnitude = max(0, micros.bit_length() - self.sub_bucket_bits - 1)
+        if magnitude == 0:
+            return micros
+        if magnitude > self.max_magnitude:
+            return len(self.counts) - 1
+        return magnitude * self.sub_bucket_count + (micros >> magnitude)
+    
+    def _bucket_upper(self, index: int) -> int:
+        """桶内最大的微秒值"""
+        if index < 2 * self.sub_bucket_count:
+            return index
+        magnitude = index // self.sub_bucket_count - 1
+        sub = index - magnitude * self.sub_bucket_count
+        return ((sub + 1) << magnitude) - 1
+    
+    def record(self, seconds: float):
+        """记录一次耗时"""
+        seconds = max(0.0, seconds)
+        self.counts[self._index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        self.min_value = min(self.min_value, seconds)
+        self.max_value = max(self.max_value, seconds)
+    
+    def percentile(self, q: float) -> float:
+        """返回分位数（秒），q 取 0..100"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            if seen >= rank:
+                if idx == len(self.counts) - 1:
+                    return self.max_value
+                return min(self._bucket_upper(idx) / 1_000_000, self.max_value)
+        return self.max_value
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def merge(self, other: "LatencyHistogram"):
+        for idx, c in enumerate(other.counts):
+            self.counts[idx] += c
+        self.count += other.count
+        self.total += other.total
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+    
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.min_value if self.count else 0.0,
+            "max": self.max_value,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
 
 
 @dataclass
 class FileOperationStats:
-    """文件操作统计信息"""
+    """文件操作统计信息（耗时记录在固定内存的直方图中）"""
     write_count: int = 0
     read_count: int = 0
     delete_count: int = 0
     total_bytes_written: int = 0
     total_bytes_read: int = 0
-    operation_times: List[float] = None
+    latencies: Dict[str, LatencyHistogram] = field(default_factory=dict)
     
-    def __post_init__(self):
-        if self.operation_times is None:
-            self.operation_times = []
+    def record_latency(self, operation: str, operation_time: float):
+        """按操作类型记录耗时"""
+        hist = self.latencies.get(operation)
+        if hist is None:
+            hist = self.latencies[operation] = LatencyHistogram()
+        hist.record(operation_time)
     
     def record_write(self, bytes_written: int, operation_time: float):
         """记录写入操作"""
         self.write_count += 1
         self.total_bytes_written += bytes_written
-        self.operation_times.append(operation_time)
+        self.record_latency("write", operation_time)
     
     def record_read(self, bytes_read: int, operation_time: float):
         """记录读取操作"""
         self.read_count += 1
         self.total_bytes_read += bytes_read
-        self.operation_times.append(operation_time)
+        self.record_latency("read", operation_time)
     
     def record_delete(self):
         """记录删除操作"""
@@ -43,22 +131,28 @@ class FileOperationStats:
         """总操作次数"""
         return self.write_count + self.read_count + self.delete_count
     
+    def _io_histogram(self) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        for name in ("write", "read"):
+            if name in self.latencies:
+                merged.merge(self.latencies[name])
+        return merged
+    
     @property
     def avg_operation_time(self) -> float:
         """平均操作时间"""
-        if not self.operation_times:
-            return 0.0
-        return sum(self.operation_times) / len(self.operation_times)
+        return self._io_histogram().mean
     
     @property
     def max_operation_time(self) -> float:
         """最大操作时间"""
-        return max(self.operation_times) if self.operation_times else 0.0
+        return self._io_histogram().max_value
     
     @property
     def min_operation_time(self) -> float:
         """最小操作时间"""
-        return min(self.operation_times) if self.operation_times else 0.0
+        hist = self._io_histogram()
+        return hist.min_value if hist.count else 0.0
 
 
 @dataclass
@@ -101,8 +195,14 @@ class FileStatsCollector:
         """记录文件删除操作"""
         self.file_stats.record_delete()
     
-    def record_directory_creation(self, dir_path: str, success: bool):
+    def record_operation(self, operation: str, operation_time: float):
+        """记录其他类型操作（如 mkdir、flush、sink 写入）的耗时"""
+        self.file_stats.record_latency(operation, operation_time)
+    
+    def record_directory_creation(self, dir_path: str, success: bool, operation_time: Optional[float] = None):
         """记录目录创建操作"""
+        if operation_time is not None:
+            self.file_stats.record_latency("mkdir", operation_time)
         if dir_path not in self.directory_stats:
             self.directory_stats[dir_path] = DirectoryStats(dir_path)
         
@@ -133,6 +233,9 @@ class FileStatsCollector:
             "total_directories_failed": sum(
                 stats.failed_count for stats in self.directory_stats.values()
             ),
+            "latency": {
+                op: hist.to_dict() for op, hist in sorted(self.file_stats.latencies.items())
+            },
         }
     
     def get_detailed_stats(self) -> Dict[str, any]:
@@ -152,6 +255,51 @@ class FileStatsCollector:
         summary["directory_details"] = directory_details
         return summary
     
+    def to_prometheus(self, prefix: str = "agent_news_file") -> str:
+        """导出为 Prometheus 文本格式（延迟以 summary 形式输出 p50/p95/p99）"""
+        summary = self.get_summary()
+        lines = []
+        counters = [
+            ("operations_total", "write", summary["write_operations"]),
+            ("operations_total", "read", summary["read_operations"]),
+            ("operations_total", "delete", summary["delete_operations"]),
+        ]
+        lines.append(f"# HELP {prefix}_operations_total File operations in the last run")
+        lines.append(f"# TYPE {prefix}_operations_total gauge")
+        for name, op, value in counters:
+            lines.append(f'{prefix}_{name}{{operation="{op}"}} {value}')
+        lines.append(f"# HELP {prefix}_bytes_total Bytes transferred in the last run")
+        lines.append(f"# TYPE {prefix}_bytes_total gauge")
+        lines.append(f'{prefix}_bytes_total{{direction="written"}} {summary["total_bytes_written"]}')
+        lines.append(f'{prefix}_bytes_total{{direction="read"}} {summary["total_bytes_read"]}')
+        lines.append(f"# HELP {prefix}_latency_seconds File operation latency in the last run")
+        lines.append(f"# TYPE {prefix}_latency_seconds summary")
+        for op, stats in summary["latency"].items():
+            for q, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f'{prefix}_latency_seconds{{operation="{op}",quantile="{q}"}} {stats[key]:.6f}')
+            lines.append(f'{prefix}_latency_seconds_sum{{operation="{op}"}} {stats["sum"]:.6f}')
+            lines.append(f'{prefix}_latency_seconds_count{{operation="{op}"}} {stats["count"]}')
+        lines.append(f"# HELP {prefix}_run_seconds Wall time of the last run")
+        lines.append(f"# TYPE {prefix}_run_seconds gauge")
+        lines.append(f"{prefix}_run_seconds {summary['runtime_seconds']:.3f}")
+        return "\n".join(lines) + "\n"
+    
+    def export(self, json_path: Optional[str] = None, prom_path: Optional[str] = None):
+        """将统计写入 JSON 与 Prometheus 文本文件（原子替换，便于 node_exporter textfile 采集）"""
+        outputs = []
+        if json_path:
+            outputs.append((json_path, json.dumps(self.get_detailed_stats(), ensure_ascii=False, indent=2)))
+        if prom_path:
+            outputs.append((prom_path, self.to_prometheus()))
+        for path, content in outputs:
+            dir_path = os.path.dirname(path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+    
     def reset(self):
         """重置统计信息"""
         self.file_stats = FileOperationStats()
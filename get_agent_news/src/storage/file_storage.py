@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-import csv
-import json
+import logging
 import os
-from collections import defaultdict
+import time
 from datetime import datetime
 from typing import Iterable, List, Dict, Any, Optional
 
 from src.models import NewsItem
 from src.tools.date_structure import ensure_date_structure
+from src.storage.columnar import ParquetSink, pyarrow_available
+from src.storage.date_file_index import group_items_by_date, merge_items_into_date_file
+from src.storage.export_sinks import CsvSink, JsonlSink, MarkdownDateSink, MultiSinkWriter
 from src.storage.file_stats import FileStatsCollector
 
+log = logging.getLogger("file_storage")
+
 
 class FileStorage:
     """文件系统存储管理器"""
@@ -23,6 +27,8 @@ class FileStorage:
     def save_news_items_by_date(self, items: List[NewsItem], sub_dir: str = "news") -> List[str]:
         """按日期批量保存新闻项到文件系统，同一天的新闻合并到一个文件中
         
+        已有日期文件按 url_hash 索引增量合并：只追加本次新增的条目，历史运行写入的条目保留。
+        
         Args:
             items: 新闻项列表
             sub_dir: 子目录名称
@@ -33,44 +39,31 @@ class FileStorage:
         if not items:
             return []
         
-        # 按日期分组
-        items_by_date = defaultdict(list)
-        for item in items:
-            date_obj = (item.published_at or item.fetched_at).date()
-            items_by_date[date_obj].append(item)
-        
         exported_paths = []
-        for date_obj, date_items in items_by_date.items():
+        for date_obj, date_items in group_items_by_date(items).items():
             # 创建日期分层目录
+            start = time.perf_counter()
             date_dir = ensure_date_structure(
                 os.path.join(self.base_dir, sub_dir),
                 datetime.combine(date_obj, datetime.min.time()),
                 self.date_format
             )
+            self.stats_collector.record_directory_creation(date_dir, True, time.perf_counter() - start)
             
             # 文件名：YYYY-MM-DD.md
             filename = f"{date_obj.isoformat()}.md"
             file_path = os.path.join(date_dir, filename)
             
-            # 生成Markdown内容
-            lines = [f"# {date_obj.isoformat()} 资讯", ""]
-            
-            for idx, item in enumerate(date_items, 1):
-                lines.append(self._generate_markdown(item))
-                if idx < len(date_items):
-                    lines.append("---")
-                    lines.append("")
-            
-            content = "\n".join(lines)
-            
-            # 写入文件（覆盖模式）
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            start = time.perf_counter()
+            added, bytes_written = merge_items_into_date_file(
+                file_path, date_obj, date_items, self._generate_markdown
+            )
             
             # 记录统计
-            self.stats_collector.record_file_write(
-                file_path, len(content.encode('utf-8')), 0
-            )
+            if added:
+                self.stats_collector.record_file_write(
+                    file_path, bytes_written, time.perf_counter() - start
+                )
             
             exported_paths.append(file_path)
         
@@ -137,6 +130,8 @@ def _serialize_item(item: NewsItem) -> Dict[str, Any]:
         "source_type": item.source_type,
         "fetched_at": item.fetched_at.isoformat(),
         "url_hash": item.url_hash,
+        "cluster_id": item.cluster_id,
+        "score": item.score,
     }
 
 
@@ -144,59 +139,62 @@ def save_items_to_directory(
     items: Iterable[NewsItem],
     base_dir: str = os.path.join("data", "exports"),
     run_time: Optional[datetime] = None,
+    background_flush: bool = False,
+    columnar: bool = True,
+    stats: Optional[FileStatsCollector] = None,
 ) -> str:
+    """单遍导出：每条只序列化一次，同时写入 JSONL、CSV、按日期分组的 Markdown 与按日期分区的 Parquet
+
+    items 可以是生成器（仅遍历一次）。background_flush=True 时由后台线程完成写入与定期 flush。
+    columnar=True 且已安装 pyarrow 时额外写入 parquet/date=YYYY-MM-DD/ 列式导出。
+    传入 stats 时记录各 sink 的逐条写入、关闭与建目录耗时。
+    """
     run_time = run_time or datetime.now()
     run_dir_name = run_time.strftime("%Y%m%d_%H%M%S")
     run_dir = os.path.join(base_dir, run_dir_name)
     _ensure_dir(run_dir)
 
-    items_list: List[Dict[str, Any]] = [_serialize_item(i) for i in items]
-
-    # JSONL格式导出
-    jsonl_path = os.path.join(run_dir, "news.jsonl")
-    with open(jsonl_path, "w", encoding="utf-8") as f:
-        for row in items_list:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
-
-    # CSV格式导出
-    csv_path = os.path.join(run_dir, "news.csv")
-    fieldnames = [
-        "source",
-        "title",
-        "url",
-        "published_at",
-        "summary",
-        "tags",
-        "source_type",
-        "fetched_at",
-        "url_hash",
-    ]
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in items_list:
-            row_out = row.copy()
-            row_out["tags"] = ",".join(row_out.get("tags") or [])
-            writer.writerow(row_out)
-
-    # Markdown格式导出（按日期分组）
     markdown_dir = os.path.join(run_dir, "markdown")
     _ensure_dir(markdown_dir)
-    storage = FileStorage(base_dir=markdown_dir)
-    items_list_for_md = list(items)
-    if items_list_for_md:
-        try:
-            storage.save_news_items_by_date(items_list_for_md, "news")
-        except Exception:
-            pass  # 忽略批量文件写入失败
+    md_storage = FileStorage(base_dir=markdown_dir)
+
+    sinks = [
+        JsonlSink(os.path.join(run_dir, "news.jsonl")),
+        CsvSink(os.path.join(run_dir, "news.csv")),
+        MarkdownDateSink(markdown_dir, render=md_storage._generate_markdown, date_format=md_storage.date_format),
+    ]
+    if columnar:
+        if pyarrow_available():
+            sinks.append(ParquetSink(run_dir))
+        else:
+            log.info("未安装 pyarrow，跳过 Parquet 导出")
+    writer = MultiSinkWriter(
+        sinks,
+        serialize=_serialize_item,
+        background=background_flush,
+        stats=stats,
+    )
+    try:
+        total = writer.write_all(items)
+    finally:
+        writer.close()
+    log.info("导出完成: dir=%s total=%s sinks=%s", run_dir, total, writer.get_stats())
+
+    files = ["news.jsonl", "news.csv", "markdown/"]
+    if any(s.name == "parquet" and not s.failed for s in sinks):
+        files.append("parquet/")
 
     # 简单README
     readme_path = os.path.join(run_dir, "README.txt")
+    readme = (
+        f"run_time: {run_time.isoformat()}\n"
+        f"total_items: {total}\n"
+        f"files: {', '.join(files)}\n"
+    )
+    start = time.perf_counter()
     with open(readme_path, "w", encoding="utf-8") as f:
-        f.write(
-            f"run_time: {run_time.isoformat()}\n"
-            f"total_items: {len(items_list)}\n"
-            f"files: news.jsonl, news.csv, markdown/\n"
-        )
+        f.write(readme)
+    if stats is not None:
+        stats.record_file_write(readme_path, len(readme.encode("utf-8")), time.perf_counter() - start)
 
     return run_dir
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.storage.export_compaction import (
+    COMPACTED_DIR_NAME,
+    iter_jsonl,
+    list_run_dirs,
+)
+
+log = logging.getLogger("news_index")
+
+DEFAULT_NEWS_INDEX_PATH = os.path.join("data", "state", "news_index.sqlite3")
+
+# trigram 分词对中文（无空格）可直接做子串检索；词长不足 3 时退化为 LIKE
+_TRIGRAM_MIN_CHARS = 3
+
+
+def _normalize_ts(value: Any) -> Optional[str]:
+    """ISO 时间统一为 UTC 的 YYYY-MM-DDTHH:MM:SS，便于按字符串比较做范围查询"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _tags_text(tags: Any) -> str:
+    if isinstance(tags, list):
+        return ",".join(str(t) for t in tags)
+    return str(tags or "")
+
+
+class NewsSearchIndex:
+    """全部资讯导出的持久化全文索引（SQLite FTS5）
+
+    news 表以 url_hash 为主键保存元数据，news_fts 为外部内容 FTS5 表（title/summary/source/tags），
+    由触发器与 news 表保持同步。indexed_sources 记录已并入的运行目录与压缩分区，
+    每次更新只读取新增的运行目录（以及发生变化的压缩分区）。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_NEWS_INDEX_PATH) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS news ("
+            " url_hash TEXT PRIMARY KEY,"
+            " title TEXT,"
+            " summary TEXT,"
+            " source TEXT,"
+            " source_type TEXT,"
+            " tags TEXT,"
+            " url TEXT,"
+            " published_at TEXT,"
+            " fetched_at TEXT,"
+            " ts TEXT,"
+            " score REAL"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_news_ts ON news(ts)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_news_source ON news(source, ts)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS indexed_sources ("
+            " name TEXT PRIMARY KEY,"
+            " signature TEXT NOT NULL,"
+            " rows INTEGER NOT NULL,"
+            " indexed_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.tokenizer = self._ensure_fts()
+        self.conn.commit()
+
+    def _ensure_fts(self) -> str:
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'news_fts'").fetchone()
+        if row is None:
+            for tokenizer in ("trigram", "unicode61"):
+                try:
+                    self.conn.execute(
+                        "CREATE VIRTUAL TABLE news_fts USING fts5("
+                        " title, summary, source, tags,"
+                        f" content='news', content_rowid='rowid', tokenize='{tokenizer}')"
+                    )
+                    break
+                except sqlite3.OperationalError:
+                    # 旧版 SQLite 不支持 trigram
+                    continue
+            self.conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS news_ai AFTER INSERT ON news BEGIN
+                    INSERT INTO news_fts(rowid, title, summary, source, tags)
+                    VALUES (new.rowid, new.title, new.summary, new.source, new.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS news_ad AFTER DELETE ON news BEGIN
+                    INSERT INTO news_fts(news_fts, rowid, title, summary, source, tags)
+                    VALUES ('delete', old.rowid, old.title, old.summary, old.source, old.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS news_au AFTER UPDATE ON news BEGIN
+                    INSERT INTO news_fts(news_fts, rowid, title, summary, source, tags)
+                    VALUES ('delete', old.rowid, old.title, old.summary, old.source, old.tags);
+                    INSERT INTO news_fts(rowid, title, summary, source, tags)
+                    VALUES (new.rowid, new.title, new.summary, new.source, new.tags);
+                END;
+                """
+            )
+            row = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'news_fts'").fetchone()
+        return "trigram" if "trigram" in (row[0] or "") else "unicode61"
+
+    def upsert_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """写入导出行（同一 url_hash 以后写入者为准），返回写入行数"""
+        params: List[Tuple[Any, ...]] = []
+        for row in rows:
+            key = row.get("url_hash")
+            if not key:
+                continue
+            ts = _normalize_ts(row.get("published_at")) or _normalize_ts(row.get("fetched_at"))
+            params.append(
+                (
+                    key,
+                    row.get("title") or "",
+                    row.get("summary") or "",
+                    row.get("source") or "",
+                    row.get("source_type") or "",
+                    _tags_text(row.get("tags")),
+                    row.get("url") or "",
+                    row.get("published_at"),
+                    row.get("fetched_at"),
+                    ts,
+                    row.get("score"),
+                )
+            )
+        if not params:
+            return 0
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO news(url_hash, title, summary, source, source_type, tags, url, published_at, fetched_at, ts, score)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(url_hash) DO UPDATE SET"
+                "  title = excluded.title, summary = excluded.summary, source = excluded.source,"
+                "  source_type = excluded.source_type, tags = excluded.tags, url = excluded.url,"
+                "  published_at = excluded.published_at, fetched_at = excluded.fetched_at, ts = excluded.ts,"
+                "  score = COALESCE(excluded.score, news.score)",
+                params,
+            )
+            self.conn.commit()
+        return len(params)
+
+    def _indexed_signatures(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT name, signature FROM indexed_sources").fetchall())
+
+    def _mark_indexed(self, name: str, signature: str, rows: int) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO indexed_sources(name, signature, rows, indexed_at) VALUES (?, ?, ?, ?)",
+                (name, signature, rows, time.time()),
+            )
+            self.conn.commit()
+
+    def update_from_exports(self, export_root: str) -> Dict[str, int]:
+        """增量并入导出根目录：新的运行目录（news.jsonl）与新增/变化的月度压缩分区"""
+        done = self._indexed_signatures()
+        stats = {"runs": 0, "partitions": 0, "rows": 0}
+        compacted_dir = os.path.join(export_root, COMPACTED_DIR_NAME)
+        if os.path.isdir(compacted_dir):
+            for name in sorted(os.listdir(compacted_dir)):
+                if not name.endswith(".jsonl.gz"):
+                    continue
+                path = os.path.join(compacted_dir, name)
+                st = os.stat(path)
+                signature = f"{st.st_size}:{st.st_mtime_ns}"
+                key = f"{COMPACTED_DIR_NAME}/{name}"
+                if done.get(key) == signature:
+                    continue
+                count = self.upsert_rows(iter_jsonl(path))
+                self._mark_indexed(key, signature, count)
+                stats["partitions"] += 1
+                stats["rows"] += count
+        # 运行目录按时间顺序并入，使较新的导出覆盖同一 url_hash 的旧值
+        for run in list_run_dirs(export_root):
+            if run in done:
+                continue
+            path = os.path.join(export_root, run, "news.jsonl")
+            if not os.path.exists(path):
+                continue
+            count = self.upsert_rows(iter_jsonl(path))
+            self._mark_indexed(run, "run", count)
+            stats["runs"] += 1
+            stats["rows"] += count
+        if stats["rows"]:
+            log.info("资讯索引更新: %s", stats)
+        return stats
+
+    def rebuild(self, export_root: str) -> Dict[str, int]:
+        """清空后从导出目录完整重建"""
+        with self._lock:
+            self.conn.execute("DELETE FROM news")
+            self.conn.execute("DELETE FROM indexed_sources")
+            self.conn.execute("INSERT INTO news_fts(news_fts) VALUES ('rebuild')")
+            self.conn.commit()
+        return self.update_from_exports(export_root)
+
+    def _match_clause(self, query: str) -> Tuple[Optional[str], List[str]]:
+        """把查询词拆为 FTS5 MATCH 表达式（各词 AND）与需要 LIKE 兜底的短词"""
+        fts_terms: List[str] = []
+        like_terms: List[str] = []
+        for term in query.split():
+            if self.tokenizer == "trigram" and len(term) < _TRIGRAM_MIN_CHARS:
+                like_terms.append(term)
+            else:
+                fts_terms.append('"' + term.replace('"', '""') + '"')
+        return (" ".join(fts_terms) or None), like_terms
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """全文 + 来源 + 时间范围查询
+
+        有全文条件时按 bm25 相关度排序，否则按时间倒序。时间以 published_at 为准，缺失时使用 fetched_at。
+        """
+        where: List[str] = []
+        args: List[Any] = []
+        match, like_terms = self._match_clause(query or "")
+        join = ""
+        order = "n.ts DESC"
+        if match:
+            join = "JOIN news_fts ON news_fts.rowid = n.rowid"
+            where.append("news_fts MATCH ?")
+            args.append(match)
+            order = "bm25(news_fts)"
+        for term in like_terms:
+            where.append("(n.title LIKE ? OR n.summary LIKE ? OR n.tags LIKE ?)")
+            pattern = f"%{term}%"
+            args.extend([pattern, pattern, pattern])
+        if source:
+            where.append("n.source = ?")
+            args.append(source)
+        if start is not None:
+            where.append("n.ts >= ?")
+            args.append(_normalize_ts(start.isoformat()))
+        if end is not None:
+            where.append("n.ts <= ?")
+            args.append(_normalize_ts(end.isoformat()))
+        sql = (
+            "SELECT n.url_hash, n.title, n.summary, n.source, n.source_type, n.tags, n.url,"
+            " n.published_at, n.fetched_at, n.score FROM news n "
+            + join
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        args.append(int(limit))
+        with self._lock:
+            cur = self.conn.execute(sql, args)
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+            sources = self.conn.execute("SELECT COUNT(*) FROM indexed_sources").fetchone()[0]
+        return {"db_path": self.db_path, "rows": rows, "indexed_sources": sources, "tokenizer": self.tokenizer}
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.models import NewsItem
+from src.storage.export_compaction import list_run_dirs, parse_run_time
+
+try:  # Windows 无 resource 模块，峰值内存记为 None
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+log = logging.getLogger("run_manifest")
+
+RUN_MANIFEST_NAME = "run_manifest.json"
+RUNS_INDEX_NAME = "runs.json"
+_RUNS_INDEX_VERSION = 1
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KiB 为单位，macOS 以字节为单位
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def _atomic_write_json(path: str, data: Any) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class RunManifest:
+    """单次运行的清单：阶段耗时、来源级统计、缓存命中与产物，写入运行目录的 run_manifest.json
+
+    同时维护导出根目录下的 runs.json（每次运行一条摘要：时间、状态、条目数与条目日期范围），
+    下游读取方据此挑选与时间范围重叠的运行目录，无需遍历目录。
+    """
+
+    def __init__(self, run_time: datetime, run_name: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.run_time = run_time
+        self.run_name = run_name
+        self.params = params or {}
+        self.stages: Dict[str, float] = {}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.caches: Dict[str, Any] = {}
+        self.counts: Dict[str, int] = {}
+        self.files: Dict[str, Any] = {}
+        self.date_range: Optional[List[str]] = None
+        self.status = "running"
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """累计阶段耗时（同名阶段多次进入时相加）"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(self.stages.get(name, 0.0) + time.perf_counter() - t0, 6)
+
+    def record_source(self, name: str, **fields: Any) -> None:
+        self.sources.setdefault(name, {}).update(fields)
+
+    def merge_request_stats(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        for name, entry in stats.items():
+            self.sources.setdefault(name, {}).update(entry)
+
+    def observe_items(self, items: Iterable[NewsItem]) -> None:
+        """记录导出条目的日期范围（published_at 优先，缺失时 fetched_at），供 runs.json 做范围裁剪"""
+        lo: Optional[str] = None
+        hi: Optional[str] = None
+        for it in items:
+            ts = (it.published_at or it.fetched_at).isoformat()
+            lo = ts if lo is None or ts < lo else lo
+            hi = ts if hi is None or ts > hi else hi
+        if lo is not None:
+            self.date_range = [lo, hi]
+
+    def observe_outputs(self, run_dir: str) -> None:
+        """记录运行目录下各导出产物的文件数与字节数（不含清单本身）"""
+        files: Dict[str, Any] = {}
+        for name in sorted(os.listdir(run_dir)):
+            if name == RUN_MANIFEST_NAME:
+                continue
+            path = os.path.join(run_dir, name)
+            if os.path.isdir(path):
+                count, size = 0, 0
+                for root, _dirs, names in os.walk(path):
+                    for fname in names:
+                        count += 1
+                        size += os.path.getsize(os.path.join(root, fname))
+                files[name] = {"files": count, "bytes": size}
+            else:
+                files[name] = {"files": 1, "bytes": os.path.getsize(path)}
+        self.files = files
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run": self.run_name,
+            "started_at": self.run_time.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "status": self.status,
+            "seconds": round(time.perf_counter() - self._t0, 3),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "params": self.params,
+            "stages": self.stages,
+            "sources": self.sources,
+            "caches": self.caches,
+            "counts": self.counts,
+            "files": self.files,
+            "date_range": self.date_range,
+        }
+
+    def write(self, export_root: str) -> str:
+        """写入 <export_root>/<run>/run_manifest.json 并更新 <export_root>/runs.json"""
+        run_dir = os.path.join(export_root, self.run_name)
+        os.makedirs(run_dir, exist_ok=True)
+        data = self.to_dict()
+        path = os.path.join(run_dir, RUN_MANIFEST_NAME)
+        _atomic_write_json(path, data)
+        self.write_index(export_root, finished_at=data["finished_at"])
+        log.info("运行清单写入: %s", path)
+        return path
+
+    def write_index(self, export_root: str, finished_at: Optional[str] = None) -> None:
+        """只更新 <export_root>/runs.json 中本次运行的摘要（读取方按索引列出运行目录）"""
+        update_runs_index(
+            export_root,
+            {
+                "run": self.run_name,
+                "started_at": self.run_time.isoformat(),
+                "finished_at": finished_at or datetime.now().isoformat(),
+                "status": self.status,
+                "items": self.counts.get("exported", 0),
+                "date_range": self.date_range,
+                "formats": sorted(self.files),
+            },
+        )
+
+
+def load_runs_index(export_root: str) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(export_root, RUNS_INDEX_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f) or {}
+    except Exception as exc:
+        log.warning("读取运行索引失败，将重建: %s", exc)
+        return {}
+    if data.get("version") != _RUNS_INDEX_VERSION:
+        return {}
+    return {r["run"]: r for r in data.get("runs") or [] if r.get("run")}
+
+
+def update_runs_index(export_root: str, entry: Dict[str, Any]) -> None:
+    """写入/覆盖一条运行摘要；索引不存在时先登记已有的运行目录（日期范围未知，读取方需全部读取）"""
+    runs = load_runs_index(export_root)
+    if not runs:
+        for name in list_run_dirs(export_root):
+            runs[name] = {
+                "run": name,
+                "started_at": parse_run_time(name).isoformat(),
+                "status": "unknown",
+                "date_range": None,
+            }
+    runs[entry["run"]] = entry
+    _atomic_write_json(
+        os.path.join(export_root, RUNS_INDEX_NAME),
+        {"version": _RUNS_INDEX_VERSION, "runs": [runs[k] for k in sorted(runs)]},
+    )
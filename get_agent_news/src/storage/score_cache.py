@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_SCORE_CACHE_PATH = os.path.join("data", "state", "llm_scores.sqlite3")
+
+
+class ScoreCache:
+    """以 url_hash 为键的 LLM 打分缓存（SQLite）
+
+    同一条资讯只需打分一次；后续运行与 report 读取直接复用。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_SCORE_CACHE_PATH) -> None:
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_scores ("
+            " url_hash TEXT PRIMARY KEY,"
+            " score REAL NOT NULL,"
+            " model TEXT,"
+            " scored_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def get_many(self, url_hashes: Iterable[str]) -> Dict[str, float]:
+        """批量查询已缓存的分数
+
+        Args:
+            url_hashes: URL哈希列表
+
+        Returns:
+            url_hash -> score
+        """
+        hashes = list(dict.fromkeys(h for h in url_hashes if h))
+        found: Dict[str, float] = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT url_hash, score FROM llm_scores WHERE url_hash IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((h, float(s)) for h, s in rows)
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, scores: Iterable[Tuple[str, float]], model: Optional[str] = None) -> None:
+        """批量写入分数（覆盖旧值）"""
+        now = time.time()
+        rows = [(h, float(s), model, now) for h, s in scores if h]
+        if not rows:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO llm_scores(url_hash, score, model, scored_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.commit()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "db_path": self.db_path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.models import compute_url_hash
+from src.tools.url_canon import UrlCanonicalizer
+
+log = logging.getLogger("watermarks")
+
+DEFAULT_WATERMARK_PATH = os.path.join("data", "state", "watermarks.json")
+
+
+class SourceWatermark:
+    """单个来源的增量水位：最新发布时间 + 最近见过的 URL 哈希
+
+    判断是否已见过只使用运行开始时加载的快照，本轮新观察到的条目在 commit 后才生效，
+    避免同一轮中前一页的条目让后一页被误判为“已覆盖”。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        data: Optional[Dict[str, Any]] = None,
+        max_hashes: int = 500,
+        canonicalizer: Optional[UrlCanonicalizer] = None,
+    ) -> None:
+        data = data or {}
+        self.name = name
+        self.max_hashes = max_hashes
+        self.canonicalizer = canonicalizer
+        self.newest_published_at: Optional[datetime] = _parse_dt(data.get("newest_published_at"))
+        self.recent_hashes: List[str] = list(data.get("recent_hashes") or [])
+        self._known = set(self.recent_hashes)
+        self._observed: List[str] = []
+        self._observed_newest: Optional[datetime] = None
+        self.pages_fetched = 0
+        self.pages_saved = 0
+
+    def _hash(self, url: str) -> str:
+        # 按规范化 URL 计算，避免跟踪参数、www/移动站等差异导致水位失效；
+        # 搜狗微信跳转链接没有稳定标识，微信来源不使用水位
+        if self.canonicalizer is not None:
+            url = self.canonicalizer.canonicalize(url)
+        return compute_url_hash(url)
+
+    def is_known(self, url: str, published_at: Optional[datetime] = None) -> bool:
+        if self._hash(url) in self._known:
+            return True
+        if published_at is not None and self.newest_published_at is not None:
+            return published_at < self.newest_published_at
+        return False
+
+    def observe(self, url: str, published_at: Optional[datetime] = None) -> None:
+        self._observed.append(self._hash(url))
+        if published_at is not None and (self._observed_newest is None or published_at > self._observed_newest):
+            self._observed_newest = published_at
+
+    def page_covered(self, entries: Sequence[tuple]) -> bool:
+        """整页条目均为已知时返回 True；entries 为 (url, published_at) 序列，空页不视为覆盖"""
+        if not entries or (not self._known and self.newest_published_at is None):
+            return False
+        return all(self.is_known(u, p) for u, p in entries)
+
+    def record_pages(self, fetched: int, saved: int) -> None:
+        self.pages_fetched += fetched
+        self.pages_saved += saved
+
+    def commit(self) -> None:
+        """合并本轮观察结果，保留最近 max_hashes 个哈希"""
+        merged = list(dict.fromkeys(self._observed + self.recent_hashes))
+        self.recent_hashes = merged[: self.max_hashes]
+        self._known = set(self.recent_hashes)
+        if self._observed_newest is not None and (
+            self.newest_published_at is None or self._observed_newest > self.newest_published_at
+        ):
+            self.newest_published_at = self._observed_newest
+        self._observed = []
+        self._observed_newest = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "newest_published_at": self.newest_published_at.isoformat() if self.newest_published_at else None,
+            "recent_hashes": self.recent_hashes,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+class WatermarkStore:
+    """按来源名称持久化增量水位（JSON 文件）"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_WATERMARK_PATH,
+        max_hashes: int = 500,
+        canonicalizer: Optional[UrlCanonicalizer] = None,
+    ) -> None:
+        self.path = path
+        self.max_hashes = max_hashes
+        self.canonicalizer = canonicalizer
+        self._raw: Dict[str, Any] = {}
+        self._marks: Dict[str, SourceWatermark] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._raw = json.load(f) or {}
+            except Exception as exc:
+                log.warning("读取水位文件失败，忽略: path=%s err=%s", path, exc)
+                self._raw = {}
+
+    def get(self, name: str) -> SourceWatermark:
+        if name not in self._marks:
+            self._marks[name] = SourceWatermark(
+                name, self._raw.get(name), max_hashes=self.max_hashes, canonicalizer=self.canonicalizer
+            )
+        return self._marks[name]
+
+    def save(self) -> None:
+        for name, mark in self._marks.items():
+            mark.commit()
+            self._raw[name] = mark.to_dict()
+        dir_path = os.path.dirname(self.path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._raw, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"pages_fetched": m.pages_fetched, "pages_saved": m.pages_saved}
+            for name, m in self._marks.items()
+        }
+
+
+def _parse_dt(val: Any) -> Optional[datetime]:
+    if not val:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(val))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin
+
+import requests
+import yaml
+
+from src.sources.aibase_daily import _extract_article_markdown, _extract_daily_links
+from src.sources.common import DEFAULT_HEADERS_HTML, DEFAULT_HEADERS_WECHAT, http_get, record_response
+from src.sources.html_backend import available_parsers, make_soup
+from src.sources.source_spec import compile_sources
+from src.sources.web_adapter import extract_list_entries
+from src.sources.wechat_adapter import BASE_URL as WECHAT_BASE_URL, _parse_list
+from src.tools.nested import get_from_path, render_value
+
+DEFAULT_CORPUS_DIR = os.path.join("data", "bench", "html")
+DEFAULT_SOURCES_PATH = os.path.join("configs", "sources.yaml")
+# get_blog_posts 的博客源配置（与本项目同仓库）
+DEFAULT_BLOGS_PATH = os.path.join(os.pardir, "get_blog_posts", "configs", "blogs.yaml")
+
+Target = Tuple[str, str, str, Dict[str, str]]
+
+
+def _page_dir(corpus_dir: str, kind: str, name: str) -> str:
+    # 来源名称多为中文，用短哈希作目录名，meta.json 中保留原名
+    digest = hashlib.sha1(f"{kind}:{name}".encode("utf-8")).hexdigest()[:10]
+    return os.path.join(corpus_dir, f"{kind}-{digest}")
+
+
+def _extract_blog_list(soup: Any, selectors: Dict[str, str], page_url: str) -> List[Tuple[str, str]]:
+    """get_blog_posts 列表页的选择步骤（list_item -> 标题/链接），与 fetch_html_list 一致"""
+    entries: List[Tuple[str, str]] = []
+    for item in soup.select(selectors.get("list_item", "article")):
+        if item.name == "a" and item.get("href"):
+            title_el = link_el = item
+        else:
+            title_el = item.select_one(selectors.get("title", "a"))
+            link_el = item.select_one(selectors.get("link", "a"))
+        if not title_el or not link_el:
+            continue
+        title = title_el.get_text(strip=True)
+        link = link_el.get("href") or ""
+        if title and link:
+            entries.append((title, urljoin(page_url, link)))
+    return entries
+
+
+def _extract_blog_content(soup: Any, selectors: Dict[str, str]) -> Tuple[str, str]:
+    """get_blog_posts 详情页的标题与正文文本（content_selectors）"""
+    title_el = soup.select_one(selectors.get("title", "h1"))
+    content_el = soup.select_one(selectors.get("content", "article, main"))
+    return (
+        title_el.get_text(strip=True) if title_el else "",
+        content_el.get_text(" ", strip=True) if content_el else "",
+    )
+
+
+def _daily_detail_urls(session: requests.Session, entry: Dict[str, Any], list_html: str, limit: int) -> List[str]:
+    # 列表页由脚本渲染时 HTML 中没有详情链接，改用日报 API 的第一页列表拼出详情页地址
+    urls = _extract_daily_links(make_soup(list_html, "html.parser"), entry["url"])
+    api = entry.get("api") or {}
+    if urls or not api.get("url") or not api.get("url_template"):
+        return urls[:limit]
+    variables = {"page": 1, "ts": int(time.time() * 1000)}
+    resp = record_response(
+        session.get(
+            render_value(api["url"], variables),
+            headers={**DEFAULT_HEADERS_HTML, **(api.get("headers") or {})},
+            params=render_value(api.get("params") or {}, variables),
+            timeout=10.0,
+        )
+    )
+    resp.raise_for_status()
+    items = get_from_path(resp.json(), api.get("list_path") or "") or []
+    for it in items if isinstance(items, list) else []:
+        oid = get_from_path(it, api.get("oid_path") or "oid")
+        if oid is not None:
+            urls.append(render_value(api["url_template"], {"oid": oid}))
+    return urls[:limit]
+
+
+def _save(corpus_dir: str, kind: str, name: str, pages: List[Tuple[str, str]]) -> None:
+    page_dir = _page_dir(corpus_dir, kind, name)
+    os.makedirs(page_dir, exist_ok=True)
+    for idx, (_, html) in enumerate(pages, start=1):
+        with open(os.path.join(page_dir, f"page-{idx:02d}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+    with open(os.path.join(page_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"kind": kind, "name": name, "urls": [u for u, _ in pages]}, f, ensure_ascii=False, indent=2)
+    print(f"已记录 {kind}:{name} pages={len(pages)} -> {page_dir}")
+
+
+def record_corpus(corpus_dir: str, cfg: Dict[str, Any], blogs: List[Dict[str, Any]], detail_pages: int = 5) -> int:
+    """抓取基准语料（覆盖旧语料），返回记录的来源数
+
+    - web（非 json_api）/wechat 来源：首页列表
+    - daily 来源：日报列表页与前 detail_pages 个详情页
+    - get_blog_posts 博客源：列表页与前 detail_pages 个详情页
+    """
+    compiled = compile_sources(cfg)
+    targets: List[Target] = [
+        ("web", plan.name, plan.url, DEFAULT_HEADERS_HTML) for plan in compiled.web if plan.pagination_type != "json_api"
+    ]
+    targets += [
+        ("wechat", plan.name, f"{WECHAT_BASE_URL}?type=2&query={quote(plan.query)}&page=1", DEFAULT_HEADERS_WECHAT)
+        for plan in compiled.wechat
+    ]
+    saved = 0
+    with requests.Session() as session:
+
+        def _get(url: str, headers: Dict[str, str]) -> Optional[str]:
+            try:
+                return http_get(session, url, headers=headers).text
+            except Exception as exc:
+                print(f"跳过 {url}: {exc}")
+                return None
+
+        for kind, name, url, headers in targets:
+            html = _get(url, headers)
+            if html is not None:
+                _save(corpus_dir, kind, name, [(url, html)])
+                saved += 1
+
+        for entry in cfg.get("daily", []) or []:
+            if not entry.get("enabled", True) or not entry.get("url"):
+                continue
+            list_html = _get(entry["url"], DEFAULT_HEADERS_HTML)
+            if list_html is None:
+                continue
+            _save(corpus_dir, "daily_list", entry["name"], [(entry["url"], list_html)])
+            try:
+                detail_urls = _daily_detail_urls(session, entry, list_html, detail_pages)
+            except Exception as exc:
+                print(f"跳过 daily_detail:{entry['name']}: {exc}")
+                detail_urls = []
+            details = [(u, h) for u in detail_urls for h in [_get(u, DEFAULT_HEADERS_HTML)] if h is not None]
+            if details:
+                _save(corpus_dir, "daily_detail", entry["name"], details)
+            saved += 1
+
+        for blog in blogs:
+            if not blog.get("url") or not blog.get("selectors"):
+                continue
+            list_html = _get(blog["url"], DEFAULT_HEADERS_HTML)
+            if list_html is None:
+                continue
+            _save(corpus_dir, "blog_list", blog["name"], [(blog["url"], list_html)])
+            links = _extract_blog_list(make_soup(list_html, "html.parser"), blog["selectors"], blog["url"])
+            detail_urls = list(dict.fromkeys(u for _, u in links))[:detail_pages]
+            details = [(u, h) for u in detail_urls for h in [_get(u, DEFAULT_HEADERS_HTML)] if h is not None]
+            if details and blog.get("content_selectors"):
+                _save(corpus_dir, "blog_detail", blog["name"], details)
+            saved += 1
+    return saved
+
+
+def _load_corpus(corpus_dir: str) -> List[Tuple[Dict[str, Any], List[Tuple[str, str]]]]:
+    """读取语料：每个来源一个 (meta, [(页面 URL, HTML)])"""
+    pages: List[Tuple[Dict[str, Any], List[Tuple[str, str]]]] = []
+    if not os.path.isdir(corpus_dir):
+        return pages
+    for entry in sorted(os.listdir(corpus_dir)):
+        page_dir = os.path.join(corpus_dir, entry)
+        meta_path = os.path.join(page_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            continue
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        # 旧语料只有单个 url 字段
+        urls = meta.get("urls") or [meta.get("url") or ""]
+        names = sorted(n for n in os.listdir(page_dir) if n.endswith(".html"))
+        htmls = []
+        for idx, name in enumerate(names):
+            with open(os.path.join(page_dir, name), "r", encoding="utf-8") as f:
+                htmls.append((urls[idx] if idx < len(urls) else urls[-1], f.read()))
+        if htmls:
+            pages.append((meta, htmls))
+    return pages
+
+
+def _extract(meta: Dict[str, Any], url: str, html: str, parser: str, plans: Dict[Tuple[str, str], Any]) -> Optional[Any]:
+    kind, name = meta.get("kind"), meta.get("name")
+    # daily_list/daily_detail 共用 daily 配置，blog_list/blog_detail 共用博客源配置
+    plan = plans.get((kind.split("_")[0] if kind else kind, name))
+    if plan is None:
+        return None
+    soup = make_soup(html, parser)
+    if kind == "web":
+        return extract_list_entries(soup, plan, url or plan.url)
+    if kind == "wechat":
+        return [(it.title, it.url) for it in _parse_list(html, plan.query, plan.name, plan.tags, parser)]
+    if kind == "daily_list":
+        return _extract_daily_links(soup, url)
+    if kind == "daily_detail":
+        return _extract_article_markdown(soup, url)
+    if kind == "blog_list":
+        return _extract_blog_list(soup, plan.get("selectors") or {}, url)
+    if kind == "blog_detail":
+        return _extract_blog_content(soup, plan.get("content_selectors") or {})
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on recorded source pages")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR, help="语料目录（每个来源一个子目录：*.html + meta.json）")
+    parser.add_argument("--sources", default=DEFAULT_SOURCES_PATH, help="sources.yaml 路径")
+    parser.add_argument("--blogs", default=DEFAULT_BLOGS_PATH, help="get_blog_posts 的 blogs.yaml 路径（不存在时跳过博客页面）")
+    parser.add_argument("--record", action="store_true", help="先抓取各来源列表页与详情页写入语料目录")
+    parser.add_argument("--detail-pages", type=int, default=5, help="记录时每个日报/博客来源抓取的详情页数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个页面的解析次数（取最小耗时）")
+    args = parser.parse_args()
+
+    with open(args.sources, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    blogs: List[Dict[str, Any]] = []
+    if args.blogs and os.path.exists(args.blogs):
+        with open(args.blogs, "r", encoding="utf-8") as f:
+            blogs = [b for b in (yaml.safe_load(f) or {}).get("blogs", []) or [] if b.get("name")]
+    if args.record:
+        record_corpus(args.corpus, cfg, blogs, detail_pages=args.detail_pages)
+    compiled = compile_sources(cfg)
+    plans: Dict[Tuple[str, str], Any] = {("web", p.name): p for p in compiled.web}
+    plans.update({("wechat", p.name): p for p in compiled.wechat})
+    plans.update({("daily", d["name"]): d for d in cfg.get("daily", []) or [] if d.get("name")})
+    plans.update({("blog", b["name"]): b for b in blogs})
+
+    corpus = _load_corpus(args.corpus)
+    if not corpus:
+        print(f"语料为空: {args.corpus}（使用 --record 记录各来源列表页与日报/博客详情页）")
+        return 1
+    parsers = available_parsers()
+    print(f"parsers={', '.join(parsers)} sources={len(corpus)} repeat={args.repeat}")
+    print("kind | source | pages | " + " | ".join(f"{p} ms" for p in parsers) + " | identical | suggest")
+    for meta, htmls in corpus:
+        baseline = [_extract(meta, url, html, "html.parser", plans) for url, html in htmls]
+        if baseline[0] is None:
+            print(f"{meta.get('kind')} | {meta.get('name')} | 未在 sources.yaml / blogs.yaml 中找到对应来源，跳过")
+            continue
+        timings: Dict[str, float] = {}
+        identical: Dict[str, bool] = {}
+        for p in parsers:
+            best_total = 0.0
+            same = True
+            for (url, html), expected in zip(htmls, baseline):
+                best = float("inf")
+                for _ in range(max(1, args.repeat)):
+                    t0 = time.perf_counter()
+                    out = _extract(meta, url, html, p, plans)
+                    best = min(best, time.perf_counter() - t0)
+                best_total += best
+                same = same and out == expected
+            timings[p] = best_total * 1000 / len(htmls)
+            identical[p] = same
+        ok = [p for p in parsers if identical[p]]
+        suggest = min(ok, key=lambda p: timings[p]) if ok else "html.parser"
+        print(
+            f"{meta.get('kind')} | {meta.get('name')} | {len(htmls)} | "
+            + " | ".join(f"{timings[p]:.2f}" for p in parsers)
+            + f" | {','.join(p for p in parsers if identical[p])} | {suggest}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from src.models import NewsItem
+from src.pipelines.rank import DEFAULT_RANKING_CONFIG, HeuristicScorer
+
+_WORDS = ["Agent", "大模型", "LLM", "生成式", "AI", "开源", "发布", "芯片", "融资", "机器人", "RAG", "多模态", "框架", "benchmark"]
+_SOURCES = list(DEFAULT_RANKING_CONFIG["source_priors"].keys()) + ["其他来源"]
+
+
+def _legacy_score(item: NewsItem, keyword_weights: Dict[str, float]) -> float:
+    """改造前的逐条实现（每条调用 datetime.now()、重建字面量、逐关键词子串扫描），仅用于对比"""
+    title = (item.title or "").lower()
+    score = 0.0
+    keywords = [(k, w) for k, w in keyword_weights.items()]
+    for k, w in keywords:
+        if k in title:
+            score += w
+    ts = item.published_at or item.fetched_at
+    age_days = (datetime.now(timezone.utc) - ts).days
+    if age_days <= 1:
+        score += 0.2
+    elif age_days <= 3:
+        score += 0.1
+    priors = dict(DEFAULT_RANKING_CONFIG["source_priors"])
+    score += priors.get(item.source, 0.0)
+    return max(0.0, min(1.0, score))
+
+
+def build_items(n: int, seed: int) -> List[NewsItem]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        NewsItem(
+            source=rng.choice(_SOURCES),
+            title=" ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8))),
+            url=f"https://example.com/{i}",
+            published_at=now - timedelta(hours=rng.randint(0, 24 * 7)),
+            summary=None,
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark heuristic keyword scoring")
+    parser.add_argument("--items", type=int, default=1_000_000, help="合成标题数量")
+    parser.add_argument("--extra-keywords", type=int, default=0, help="额外追加的随机关键词数量（模拟更大的关键词表）")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    items = build_items(args.items, args.seed)
+    keywords = dict(DEFAULT_RANKING_CONFIG["keywords"])
+    rng = random.Random(args.seed)
+    for i in range(args.extra_keywords):
+        keywords[f"kw{i}{rng.randint(0, 9999)}"] = 0.01
+    scorer = HeuristicScorer(keywords, DEFAULT_RANKING_CONFIG["source_priors"], DEFAULT_RANKING_CONFIG["recency"])
+
+    t0 = time.perf_counter()
+    legacy = [_legacy_score(it, keywords) for it in items]
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scorer.score_batch(items)
+    t_engine = time.perf_counter() - t0
+
+    mismatches = sum(1 for a, it in zip(legacy, items) if abs(a - (it.score or 0.0)) > 1e-9)
+    print(f"items={len(items)} keywords={len(keywords)}")
+    print(f"legacy={t_legacy:.2f}s engine={t_engine:.2f}s speedup={t_legacy / t_engine:.2f}x mismatches={mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
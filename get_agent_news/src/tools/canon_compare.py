@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+from typing import Any, Dict, List
+
+import yaml
+
+from src.config import get_sources_path
+from src.models import compute_url_hash
+from src.tools.url_canon import UrlCanonicalizer
+
+DEFAULT_EXPORT_DIR = os.path.join("data", "exports")
+
+
+def _load_canonicalizer(sources_path: str) -> UrlCanonicalizer:
+    with open(sources_path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    return UrlCanonicalizer.from_config(cfg.get("url_canonicalization"))
+
+
+def check_corpus(canon: UrlCanonicalizer, corpus_path: str) -> int:
+    """校验语料中每组 URL 是否规范化为期望值，返回失败数"""
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        corpus = yaml.safe_load(f) or {}
+    failures = 0
+    total = 0
+    for case in corpus.get("cases", []) or []:
+        expected = case.get("canonical")
+        for url in case.get("urls", []) or []:
+            total += 1
+            got = canon.canonicalize(url)
+            if got != expected:
+                failures += 1
+                print(f"FAIL {url}\n  expected: {expected}\n  got:      {got}")
+    print(f"语料校验: total={total} failed={failures}")
+    return failures
+
+
+def compare_exports(canon: UrlCanonicalizer, export_dir: str) -> Dict[str, Any]:
+    """统计导出数据在原始哈希与规范化哈希下的唯一 URL 数量"""
+    urls: List[str] = []
+    for path in sorted(glob.glob(os.path.join(export_dir, "*", "news.jsonl"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    url = json.loads(line).get("url") or ""
+                except Exception:
+                    continue
+                if url:
+                    urls.append(url)
+    raw_unique = len({compute_url_hash(u) for u in urls})
+    canon_unique = len({compute_url_hash(canon.canonicalize(u)) for u in urls})
+    total = len(urls)
+    return {
+        "total": total,
+        "raw_unique": raw_unique,
+        "canonical_unique": canon_unique,
+        "raw_dedup_rate": (1 - raw_unique / total) if total else 0.0,
+        "canonical_dedup_rate": (1 - canon_unique / total) if total else 0.0,
+        "extra_duplicates": raw_unique - canon_unique,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare dedup rate with and without URL canonicalization")
+    parser.add_argument("--sources", default=None, help="sources.yaml 路径（默认按配置查找）")
+    parser.add_argument("--corpus", default=None, help="规范化语料 YAML（如 configs/url_canon_corpus.yaml）")
+    parser.add_argument("--export-dir", default=DEFAULT_EXPORT_DIR, help="导出根目录，统计其中所有 news.jsonl")
+    args = parser.parse_args()
+
+    canon = _load_canonicalizer(args.sources or get_sources_path())
+    failures = 0
+    if args.corpus:
+        failures = check_corpus(canon, args.corpus)
+    if os.path.isdir(args.export_dir):
+        stats = compare_exports(canon, args.export_dir)
+        print(
+            f"导出统计: total={stats['total']} raw_unique={stats['raw_unique']} canonical_unique={stats['canonical_unique']} "
+            f"dedup_rate {stats['raw_dedup_rate']:.2%} -> {stats['canonical_dedup_rate']:.2%}"
+        )
+    elif not args.corpus:
+        print(f"未找到导出目录: {args.export_dir}")
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from src.storage.export_compaction import compact_exports
+
+DEFAULT_EXPORT_DIR = os.path.join("data", "exports")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compact historical export runs into monthly partitions")
+    parser.add_argument("--export-dir", default=DEFAULT_EXPORT_DIR, help="导出根目录")
+    parser.add_argument("--min-age-days", type=float, default=7, help="仅压缩早于 N 天的运行目录")
+    parser.add_argument("--retain-days", type=float, default=30, help="已压缩的原始运行目录保留天数（<0 表示不删除）")
+    parser.add_argument("--keep-runs", type=int, default=3, help="始终保留最近的 N 个原始运行目录")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写入或删除")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if not os.path.isdir(args.export_dir):
+        print(f"未找到导出目录: {args.export_dir}")
+        return 1
+    stats = compact_exports(
+        args.export_dir,
+        min_age_days=args.min_age_days,
+        retain_days=args.retain_days if args.retain_days >= 0 else None,
+        keep_runs=args.keep_runs,
+        dry_run=args.dry_run,
+    )
+    prefix = "[dry-run] " if args.dry_run else ""
+    print(
+        f"{prefix}压缩运行目录 {stats['runs_compacted']} 个，读取 {stats['rows_read']} 条，"
+        f"涉及月份 {', '.join(stats['months_touched']) or '-'}；"
+        f"分区 {stats['partitions']} 个共 {stats['partition_items']} 条（去重后）"
+    )
+    if stats["runs_deleted"]:
+        print(f"{prefix}按保留策略删除运行目录: {', '.join(stats['runs_deleted'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
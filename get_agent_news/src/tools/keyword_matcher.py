@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 拉丁词边界：前后不能紧邻字母或数字（汉字、空格、标点均可作边界）
+_LATIN_CHAR_RE = re.compile(r"[a-z0-9]")
+# 复数形式视为同一关键词（agents -> agent）
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """将关键词构建为字典树形式的正则（公共前缀只匹配一次，分支处按字符分派）"""
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # 贪婪可选：优先尝试更长的关键词，失败时在此处结束
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def _ends_word(keyword: str, prefix: str) -> bool:
+    """prefix 在 keyword 中是否以完整单词（或其复数）结束"""
+    rest = keyword[len(prefix):]
+    return not _LATIN_CHAR_RE.match(rest[0]) or rest in _PLURAL_SUFFIXES
+
+
+class KeywordMatcher:
+    """多关键词单遍匹配器
+
+    关键词编译为一个字典树正则（等价于 Aho-Corasick 的 goto 结构，由 re 引擎在 C 层执行），
+    一次扫描即可找出文本中出现的全部关键词，语义与逐个 `kw in text` 子串判断一致：
+    - 前瞻 `(?=(...))` 让每个起始位置都参与匹配，不同位置的重叠关键词不会丢失；
+    - 同一起始位置只返回最长的关键词，其余命中的关键词必然是它的前缀，
+      因此预先为每个关键词记录“作为其前缀的其他关键词”，命中时一并展开；
+    - 首字符字符类前瞻用于快速跳过不可能命中的位置。
+    关键词很少时逐个 `in` 判断（C 层子串搜索）反而更快，低于 small_threshold 时直接使用该路径。
+    匹配前文本统一转小写（关键词同样小写化）。
+
+    latin_word_boundary=True 时纯 ASCII 关键词改为按整词匹配（允许复数），避免 "ai" 命中
+    "average"、"rag" 命中 "storage"；中文等非 ASCII 关键词没有词边界，仍按子串匹配。
+    """
+
+    def __init__(self, keywords: Iterable[str], small_threshold: int = 12, latin_word_boundary: bool = False) -> None:
+        words = sorted({k.lower() for k in keywords if k})
+        self.keywords: List[str] = words
+        bounded = [w for w in words if w.isascii()] if latin_word_boundary else []
+        # 子串语义的关键词
+        self._loose: List[str] = [w for w in words if not (latin_word_boundary and w.isascii())]
+        self._small = len(self._loose) <= small_threshold
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            w: tuple(p for p in self._loose if w.startswith(p)) for w in self._loose
+        }
+        self._pattern: Optional[re.Pattern] = None
+        if self._loose:
+            first_chars = "".join(sorted({re.escape(w[0]) for w in self._loose}))
+            self._pattern = re.compile("(?=[" + first_chars + "])(?=(" + _trie_pattern(self._loose) + "))")
+        # 整词语义的关键词：同一位置的较短关键词只有以完整单词结束时才随最长命中一并展开
+        self._word_implied: Dict[str, Tuple[str, ...]] = {
+            w: tuple(p for p in bounded if w.startswith(p) and (p == w or _ends_word(w, p))) for w in bounded
+        }
+        self._word_pattern: Optional[re.Pattern] = None
+        if bounded:
+            self._word_pattern = re.compile(
+                r"(?<![a-z0-9])(?=(" + _trie_pattern(bounded) + r")(?:e?s)?(?![a-z0-9]))"
+            )
+
+    def find(self, text: str) -> Set[str]:
+        """返回文本中出现的关键词集合（小写）"""
+        if not text or not self.keywords:
+            return set()
+        lowered = text.lower()
+        found: Set[str] = set()
+        if self._pattern is not None:
+            if self._small:
+                found.update(w for w in self._loose if w in lowered)
+            else:
+                for longest in set(self._pattern.findall(lowered)):
+                    found.update(self._implied[longest])
+        if self._word_pattern is not None:
+            for longest in set(self._word_pattern.findall(lowered)):
+                found.update(self._word_implied[longest])
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        if not text or not self.keywords:
+            return False
+        lowered = text.lower()
+        if self._pattern is not None:
+            if self._small:
+                if any(w in lowered for w in self._loose):
+                    return True
+            elif self._pattern.search(lowered) is not None:
+                return True
+        return self._word_pattern is not None and self._word_pattern.search(lowered) is not None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 def get_from_path(obj: Any, path: str) -> Any:
@@ -36,3 +36,77 @@ def render_value(val: Any, variables: Dict[str, Any]) -> Any:
     return val
 
 
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """预编译点路径，返回与 get_from_path(obj, path) 等价的访问函数（只拆分一次路径）"""
+    if not path:
+        return lambda obj: obj
+    parts: List[Tuple[str, Optional[int]]] = []
+    for part in [p for p in str(path).split(".") if p]:
+        try:
+            idx: Optional[int] = int(part)
+        except ValueError:
+            idx = None
+        parts.append((part, idx))
+
+    def accessor(obj: Any) -> Any:
+        cur = obj
+        for key, idx in parts:
+            if isinstance(cur, dict):
+                cur = cur.get(key)
+            elif isinstance(cur, list):
+                if idx is None or idx < 0 or idx >= len(cur):
+                    return None
+                cur = cur[idx]
+            else:
+                return None
+        return cur
+
+    return accessor
+
+
+def compile_paths(paths: Any) -> Optional[Callable[[Any], Any]]:
+    """预编译单个路径或候选路径列表（取第一个非空值），paths 为空时返回 None"""
+    if not paths:
+        return None
+    if isinstance(paths, str):
+        single = compile_path(paths)
+        return lambda obj: None if obj is None else single(obj)
+    accessors = [compile_path(p) for p in paths]
+
+    def first(obj: Any) -> Any:
+        if obj is None:
+            return None
+        for acc in accessors:
+            v = acc(obj)
+            if v not in (None, ""):
+                return v
+        return None
+
+    return first
+
+
+def compile_template(val: Any) -> Callable[[Dict[str, Any]], Any]:
+    """预编译嵌套模板，返回与 render_value(val, variables) 等价的渲染函数
+
+    不含占位符的字符串与非字符串常量在编译期确定，渲染时直接返回。
+    """
+    if isinstance(val, str):
+        if "{" not in val:
+            return lambda variables: val
+
+        def render_str(variables: Dict[str, Any]) -> Any:
+            try:
+                return val.format(**variables)
+            except Exception:
+                return val
+
+        return render_str
+    if isinstance(val, dict):
+        items = [(k, compile_template(v)) for k, v in val.items()]
+        return lambda variables: {k: fn(variables) for k, fn in items}
+    if isinstance(val, list):
+        fns = [compile_template(v) for v in val]
+        return lambda variables: [fn(variables) for fn in fns]
+    return lambda variables: val
@@ -6,13 +6,19 @@ import json
 import os
 from typing import List, Dict, Any, Optional
 
+from src.storage.columnar import has_parquet, read_run_table
+from src.storage.export_compaction import parse_run_time
+
 DEFAULT_EXPORT_DIR = os.path.join("data", "exports")
 
 
 def _latest_run_dir(base_dir: str) -> Optional[str]:
     if not os.path.isdir(base_dir):
         return None
-    candidates = [d for d in glob.glob(os.path.join(base_dir, "*")) if os.path.isdir(d)]
+    candidates = [
+        d for d in glob.glob(os.path.join(base_dir, "*"))
+        if os.path.isdir(d) and parse_run_time(os.path.basename(d)) is not None
+    ]
     if not candidates:
         return None
     candidates.sort(reverse=True)  # names are timestamped, lexical works
@@ -32,10 +38,14 @@ def _load_jsonl(path: str) -> List[Dict[str, Any]]:
 
 def list_items(run_dir: str, limit: int, contains: Optional[str]) -> None:
     jsonl_path = os.path.join(run_dir, "news.jsonl")
-    if not os.path.exists(jsonl_path):
+    if has_parquet(run_dir):
+        # 只读取展示所需的三列
+        rows = read_run_table(run_dir, columns=["source", "title", "url"]).to_pylist()
+    elif os.path.exists(jsonl_path):
+        rows = _load_jsonl(jsonl_path)
+    else:
         print(f"未找到文件: {jsonl_path}")
         return
-    rows = _load_jsonl(jsonl_path)
     if contains:
         key = contains.lower()
         rows = [r for r in rows if key in (r.get("title") or "").lower()]
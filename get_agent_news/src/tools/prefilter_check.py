@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+from typing import Any, Dict
+
+import yaml
+
+from src.config import get_sources_path
+from src.pipelines.prefilter import PrefilterRule, compile_rule
+
+
+def _load_rule(sources_path: str) -> PrefilterRule:
+    """按 sources.yaml 的默认 prefilter 段编译主题打分规则（忽略 enabled 与语言/关键词规则）"""
+    with open(sources_path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    base: Dict[str, Any] = cfg.get("prefilter") or {}
+    return compile_rule("<default>", {"topic": base.get("topic") or {"min_score": 0.3}})
+
+
+def check_corpus(rule: PrefilterRule, corpus_path: str) -> int:
+    """校验语料中 keep 的标题通过主题打分、drop 的标题被丢弃，返回失败数"""
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        corpus = yaml.safe_load(f) or {}
+    failures = 0
+    total = 0
+    for expect_keep, key in ((True, "keep"), (False, "drop")):
+        for title in corpus.get(key, []) or []:
+            total += 1
+            score = rule.topic_score(title, "")
+            if (score >= rule.min_score) != expect_keep:
+                failures += 1
+                print(f"FAIL [{key}] {title}\n  score={score:.2f} min_score={rule.min_score} hits={sorted(rule.topic.find(title))}")
+    print(f"语料校验: total={total} failed={failures}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check prefilter topic scoring against on/off-topic titles")
+    parser.add_argument("--sources", default=None, help="sources.yaml 路径（默认按配置查找）")
+    parser.add_argument("--corpus", default="configs/prefilter_corpus.yaml", help="主题打分语料 YAML")
+    args = parser.parse_args()
+
+    rule = _load_rule(args.sources or get_sources_path())
+    return 1 if check_corpus(rule, args.corpus) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
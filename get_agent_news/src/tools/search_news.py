@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.storage.news_index import DEFAULT_NEWS_INDEX_PATH, NewsSearchIndex
+
+DEFAULT_EXPORT_DIR = os.path.join("data", "exports")
+
+
+def _parse_date(text: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    if not text:
+        return None
+    dt = datetime.fromisoformat(text)
+    if end_of_day and len(text) <= 10:
+        dt = dt + timedelta(days=1) - timedelta(seconds=1)
+    return dt
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search all exported news through the persistent FTS5 index")
+    parser.add_argument("query", nargs="?", default=None, help="全文检索词（空格分隔为 AND；匹配标题、摘要、来源与标签）")
+    parser.add_argument("--export-dir", default=DEFAULT_EXPORT_DIR, help="导出根目录")
+    parser.add_argument("--index", default=DEFAULT_NEWS_INDEX_PATH, help="全文索引（SQLite）路径")
+    parser.add_argument("--source", default=None, help="按来源名称精确过滤")
+    parser.add_argument("--since", default=None, help="起始日期/时间（ISO，如 2025-01-01，按 UTC）")
+    parser.add_argument("--until", default=None, help="结束日期/时间（ISO，仅日期时包含当天）")
+    parser.add_argument("--days", type=float, default=None, help="最近 N 天（与 --since 二选一）")
+    parser.add_argument("--limit", type=int, default=20, help="展示记录上限")
+    parser.add_argument("--no-update", action="store_true", help="查询前不增量并入新的导出")
+    parser.add_argument("--rebuild", action="store_true", help="清空并从导出目录完整重建索引")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    index = NewsSearchIndex(args.index)
+    try:
+        if args.rebuild:
+            stats = index.rebuild(args.export_dir)
+            print(f"索引重建完成: 运行目录 {stats['runs']} 个，压缩分区 {stats['partitions']} 个，{stats['rows']} 行")
+        elif not args.no_update:
+            index.update_from_exports(args.export_dir)
+
+        start = _parse_date(args.since)
+        if start is None and args.days is not None:
+            start = datetime.now(timezone.utc) - timedelta(days=args.days)
+        end = _parse_date(args.until, end_of_day=True)
+
+        t0 = time.perf_counter()
+        rows = index.search(args.query, source=args.source, start=start, end=end, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        print(f"索引: {index.db_path}  共 {index.get_stats()['rows']} 条，命中显示 {len(rows)} 条（{elapsed_ms:.1f} ms）")
+        print("date | source | title | url")
+        print("-" * 80)
+        for r in rows:
+            day = (r.get("published_at") or r.get("fetched_at") or "")[:10]
+            source = (r.get("source") or "")[:24]
+            title = (r.get("title") or "")[:40]
+            url = (r.get("url") or "")[:80]
+            print(f"{day} | {source} | {title} | {url}")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import fnmatch
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_STRIP_PARAMS: List[str] = [
+    "utm_*",
+    "spm",
+    "spm_id_from",
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+]
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+@dataclass
+class DomainRule:
+    """单个域名的规范化规则
+
+    - match: 主机名，支持精确匹配或以 "." 开头的后缀匹配（如 ".36kr.com"）
+    - host: 将主机名改写为该值（如移动站 m.36kr.com -> 36kr.com）
+    - keep_params: 查询参数白名单；设置后仅保留这些参数
+    - strip_params: 额外剔除的参数（支持通配符）
+    - keep_fragment: 是否保留 #fragment（默认剔除）
+    """
+    match: str
+    host: Optional[str] = None
+    keep_params: Optional[List[str]] = None
+    strip_params: List[str] = field(default_factory=list)
+    keep_fragment: bool = False
+
+    def matches(self, host: str) -> bool:
+        if self.match.startswith("."):
+            return host.endswith(self.match) or host == self.match[1:]
+        return host == self.match
+
+
+class UrlCanonicalizer:
+    """规则驱动的 URL 规范化器，用于在计算 url_hash 前统一 URL 形态"""
+
+    def __init__(
+        self,
+        force_https: bool = True,
+        strip_www: bool = True,
+        strip_trailing_slash: bool = True,
+        strip_params: Optional[List[str]] = None,
+        domains: Optional[List[DomainRule]] = None,
+    ) -> None:
+        self.force_https = force_https
+        self.strip_www = strip_www
+        self.strip_trailing_slash = strip_trailing_slash
+        self.strip_params = list(DEFAULT_STRIP_PARAMS if strip_params is None else strip_params)
+        self.domains = domains or []
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "UrlCanonicalizer":
+        """从 sources.yaml 的 url_canonicalization 段构建规范化器"""
+        cfg = cfg or {}
+        domains = []
+        for d in cfg.get("domains", []) or []:
+            if not isinstance(d, dict) or not d.get("match"):
+                raise ValueError(f"url_canonicalization.domains 配置缺少 match: {d!r}")
+            domains.append(
+                DomainRule(
+                    match=str(d["match"]).lower(),
+                    host=(str(d["host"]).lower() if d.get("host") else None),
+                    keep_params=d.get("keep_params"),
+                    strip_params=list(d.get("strip_params") or []),
+                    keep_fragment=bool(d.get("keep_fragment", False)),
+                )
+            )
+        strip_params = cfg.get("strip_params")
+        if strip_params is not None:
+            strip_params = list(strip_params)
+        if cfg.get("extra_strip_params"):
+            strip_params = (strip_params if strip_params is not None else list(DEFAULT_STRIP_PARAMS)) + list(cfg["extra_strip_params"])
+        return cls(
+            force_https=bool(cfg.get("force_https", True)),
+            strip_www=bool(cfg.get("strip_www", True)),
+            strip_trailing_slash=bool(cfg.get("strip_trailing_slash", True)),
+            strip_params=strip_params,
+            domains=domains,
+        )
+
+    def _rule_for(self, host: str) -> Optional[DomainRule]:
+        for rule in self.domains:
+            if rule.matches(host):
+                return rule
+        return None
+
+    def canonicalize(self, url: str) -> str:
+        """返回规范化后的 URL；无法解析时原样返回（去除首尾空白）"""
+        url = (url or "").strip()
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        if not parts.scheme or not parts.netloc:
+            return url
+
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port if parts.port is not None else None
+        rule = self._rule_for(host)
+
+        if rule and rule.host:
+            host = rule.host
+        if self.strip_www and host.startswith("www."):
+            host = host[4:]
+        if self.force_https and scheme == "http":
+            scheme = "https"
+        netloc = host
+        if port is not None and str(port) != _DEFAULT_PORTS.get(scheme) and str(port) != _DEFAULT_PORTS.get(parts.scheme.lower()):
+            netloc = f"{host}:{port}"
+
+        path = parts.path or "/"
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        strip_patterns = self.strip_params + (rule.strip_params if rule else [])
+        params = []
+        for key, value in parse_qsl(parts.query, keep_blank_values=True):
+            if rule and rule.keep_params is not None:
+                if key not in rule.keep_params:
+                    continue
+            elif any(fnmatch.fnmatchcase(key.lower(), p) for p in strip_patterns):
+                continue
+            params.append((key, value))
+        params.sort()
+        query = urlencode(params)
+
+        fragment = parts.fragment if (rule and rule.keep_fragment) else ""
+        return urlunsplit((scheme, netloc, path, query, fragment))
@@ -138,6 +138,7 @@ class BlogCrawler:
                     tags=self.config.get("tags", []),
                     delay=self.config.get("delay", 1.0),
                     timeout=self.config.get("timeout", 30.0),
+                    parser=self.config.get("parser"),
                 )
                 
                 # 抓取每篇文章的详情
@@ -183,6 +184,7 @@ class BlogCrawler:
                 title=post.title,
                 tags=post.tags,
                 timeout=self.config.get("timeout", 30.0),
+                parser=self.config.get("parser"),
             )
             return content_post
         except Exception as exc:
@@ -1,7 +1,9 @@
 """HTML 页面解析器"""
 from __future__ import annotations
 
+import importlib.util
 import logging
+import os
 import time
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
@@ -33,6 +35,20 @@ DEFAULT_HEADERS_HTML = {
 }
 
 
+# BeautifulSoup 树构建器：选择器与取文本语义不变，lxml 解析更快；未安装时回退到 html.parser
+HTML_PARSERS = ("html.parser", "lxml", "html5lib")
+DEFAULT_HTML_PARSER = os.environ.get("GET_BLOG_POSTS_HTML_PARSER") or "html.parser"
+
+
+def _make_soup(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """按配置的解析器构建 BeautifulSoup（来源配置 parser 优先，其次环境变量）"""
+    name = parser or DEFAULT_HTML_PARSER
+    if name not in HTML_PARSERS or (name != "html.parser" and importlib.util.find_spec(name) is None):
+        logger.debug("HTML 解析器不可用，使用 html.parser: %s", name)
+        name = "html.parser"
+    return BeautifulSoup(markup, name)
+
+
 def fetch_html_list(
     url: str,
     source: str,
@@ -41,6 +57,7 @@ def fetch_html_list(
     tags: List[str] = None,
     delay: float = 1.0,
     timeout: float = 30.0,
+    parser: Optional[str] = None,
 ) -> List[BlogPost]:
     """从 HTML 列表页抓取文章链接
     
@@ -52,6 +69,7 @@ def fetch_html_list(
         tags: 标签列表
         delay: 请求延迟
         timeout: 请求超时
+        parser: HTML 解析器（html.parser / lxml / html5lib），默认取 GET_BLOG_POSTS_HTML_PARSER
         
     Returns:
         BlogPost 列表（仅包含链接信息，需要后续抓取详情）
@@ -106,7 +124,7 @@ def fetch_html_list(
             try:
                 resp = session.get(page_url, headers=DEFAULT_HEADERS_HTML, timeout=timeout)
                 resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "html.parser")
+                soup = _make_soup(resp.text, parser)
                 
                 # 提取文章项
                 list_item_selector = selectors.get("list_item", "article")
@@ -252,6 +270,7 @@ def fetch_html_content(
     title: Optional[str] = None,
     tags: List[str] = None,
     timeout: float = 30.0,
+    parser: Optional[str] = None,
 ) -> Optional[BlogPost]:
     """抓取文章详情页内容（带重试机制）
     
@@ -262,6 +281,7 @@ def fetch_html_content(
         title: 文章标题（如果已知）
         tags: 标签列表
         timeout: 请求超时
+        parser: HTML 解析器（html.parser / lxml / html5lib），默认取 GET_BLOG_POSTS_HTML_PARSER
         
     Returns:
         BlogPost 对象，如果抓取失败返回 None
@@ -288,7 +308,7 @@ def fetch_html_content(
                         return None
                 
                 resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "html.parser")
+                soup = _make_soup(resp.text, parser)
                 
                 # 提取标题
                 if not title and "title" in content_selectors:
@@ -371,6 +391,7 @@ def fetch_single_url(
     source: Optional[str] = None,
     tags: Optional[List[str]] = None,
     timeout: float = 30.0,
+    parser: Optional[str] = None,
 ) -> Optional[BlogPost]:
     """智能抓取单个 URL 的页面内容（无需配置选择器）
     
@@ -379,6 +400,7 @@ def fetch_single_url(
         source: 博客源名称（如果为 None，则从 URL 提取域名）
         tags: 标签列表（如果为 None，则从 URL 提取域名作为标签）
         timeout: 请求超时
+        parser: HTML 解析器（html.parser / lxml / html5lib），默认取 GET_BLOG_POSTS_HTML_PARSER
         
     Returns:
         BlogPost 对象，如果抓取失败返回 None
@@ -416,7 +438,7 @@ def fetch_single_url(
                         return None
                 
                 resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "html.parser")
+                soup = _make_soup(resp.text, parser)
             
             # 智能提取标题：尝试多种选择器
             title = None
@@ -5,6 +5,24 @@ from typing import Dict, List, Tuple
 
 from agents_papers.analysis.statistics import AdvancedStatsReport, StatsReport
 from agents_papers.models.paper import Paper
+from agents_papers.pipeline.features import get_features, register_keyword_set
+
+
+HOT_TOPIC_KEYWORDS = [
+    "agent", "multi-agent", "llm", "reasoning", "planning", "tool", "autonomous",
+    "benchmark", "evaluation", "memory", "retrieval", "reflection", "workflow",
+    "reinforcement", "learning", "transformer", "gpt", "claude", "gemini"
+]
+
+SCENARIO_KEYWORDS = [
+    "code", "programming", "software", "math", "mathematics", "reasoning",
+    "web", "browser", "search", "qa", "question answering", "chat",
+    "robot", "robotics", "control", "game", "gaming", "simulation",
+    "medical", "healthcare", "education", "finance", "business"
+]
+
+register_keyword_set("hot_topics", HOT_TOPIC_KEYWORDS)
+register_keyword_set("scenarios", SCENARIO_KEYWORDS)
 
 
 def generate_comprehensive_report(
@@ -258,19 +276,10 @@ def _generate_hot_topics(
     lines.append("## 热点话题")
     lines.append("")
 
-    # 高频关键词（从标题和摘要提取）
+    # 高频关键词（从标题和摘要提取，复用论文的文本特征）
     keyword_counter: Counter[str] = Counter()
-    keywords = [
-        "agent", "multi-agent", "llm", "reasoning", "planning", "tool", "autonomous",
-        "benchmark", "evaluation", "memory", "retrieval", "reflection", "workflow",
-        "reinforcement", "learning", "transformer", "gpt", "claude", "gemini"
-    ]
-
     for p in papers:
-        text = f"{p.title} {p.abstract}".lower()
-        for kw in keywords:
-            if kw in text:
-                keyword_counter[kw] += 1
+        keyword_counter.update(get_features(p).hits("hot_topics"))
 
     if keyword_counter:
         lines.append("### 高频关键词")
@@ -351,20 +360,10 @@ def _generate_application_scenarios(papers: List[Paper]) -> List[str]:
     lines.append("## 应用场景分析")
     lines.append("")
 
-    # 从标题和摘要中提取应用场景关键词
-    scenario_keywords = [
-        "code", "programming", "software", "math", "mathematics", "reasoning",
-        "web", "browser", "search", "qa", "question answering", "chat",
-        "robot", "robotics", "control", "game", "gaming", "simulation",
-        "medical", "healthcare", "education", "finance", "business"
-    ]
-
+    # 从标题和摘要中提取应用场景关键词（复用论文的文本特征）
     scenario_counter: Counter[str] = Counter()
     for p in papers:
-        text = f"{p.title} {p.abstract}".lower()
-        for scenario in scenario_keywords:
-            if scenario in text:
-                scenario_counter[scenario] += 1
+        scenario_counter.update(get_features(p).hits("scenarios"))
 
     if scenario_counter:
         lines.append("### 应用领域分布")
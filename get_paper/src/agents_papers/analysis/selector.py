@@ -3,17 +3,18 @@ from __future__ import annotations
 from typing import Dict, List, Tuple
 
 from agents_papers.models.paper import Paper
+from agents_papers.pipeline.features import get_features
 
 
 def _compute_composite_score(p: Paper, analysis: Dict[str, object] | None) -> float:
     score = 0.0
-    text = f"{p.title} {p.abstract}".lower()
+    f = get_features(p)
     # Heuristics: venue weight, tag variety, length, llm novelty
     if p.venue and p.venue.lower() in {"arxiv", "neurips", "iclr", "icml", "acl"}:
         score += 1.0
     score += min(len(p.tags), 6) * 0.2
-    score += (len(p.title.split()) >= 6) * 0.3
-    score += (len(p.abstract.split()) >= 120) * 0.4
+    score += (f.title_words >= 6) * 0.3
+    score += (f.abstract_words >= 120) * 0.4
     novelty = 0.0
     if analysis and isinstance(analysis.get("novelty_score", 0), (int, float)):
         novelty = float(analysis.get("novelty_score", 0))
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from hashlib import sha1
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 def _normalize_string(value: str) -> str:
@@ -41,6 +41,8 @@ class Paper(BaseModel):
     topics: List[str] = Field(default_factory=list)
     tags: List[str] = Field(default_factory=list)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
+    # Cached text features (pipeline.features); not part of the exported model
+    _features: Any = PrivateAttr(default=None)
 
     @staticmethod
     def from_minimal(
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List
 
 from agents_papers.models.paper import Paper
+from agents_papers.pipeline.features import get_features, register_keyword_set
 
 
 KEYWORDS_TO_TAG = {
@@ -25,14 +26,13 @@ KEYWORDS_TO_TAG = {
     "tool": "tool-use",
 }
 
+register_keyword_set("tags", KEYWORDS_TO_TAG)
+
 
 def classify_papers(papers: List[Paper]) -> List[Paper]:
     for p in papers:
-        text = f"{p.title} {p.abstract}".lower()
         tags = set(p.tags)
-        for kw, tag in KEYWORDS_TO_TAG.items():
-            if kw in text:
-                tags.add(tag)
+        tags.update(KEYWORDS_TO_TAG[kw] for kw in get_features(p).hits("tags"))
         p.tags = sorted(tags)
     return papers
 
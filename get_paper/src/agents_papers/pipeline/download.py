@@ -101,19 +101,23 @@ def download_pdfs(
     pdf_root_dir: Path,
     concurrency: int = 3,
     timeout: int = 60,
+    known: Optional[Dict[str, str]] = None,
 ) -> Dict[str, str]:
     """
     Download PDFs for provided papers into pdf_root_dir/<source>/ and return a mapping of paperId -> local path.
 
     - Skips when pdfUrl is missing
     - Skips existing files
+    - Reuses paths in known (e.g. downloaded for an overlapping window) when the file still exists
     - Writes a manifest.json under pdf_root_dir
     """
     pdf_root_dir.mkdir(parents=True, exist_ok=True)
 
     async def _run() -> Dict[str, str]:
         sem = asyncio.Semaphore(max(1, concurrency))
-        results: Dict[str, str] = {}
+        results: Dict[str, str] = {
+            pid: path for pid, path in (known or {}).items() if Path(path).is_file() and Path(path).stat().st_size > 0
+        }
 
         async with httpx.AsyncClient(
             headers={
@@ -124,7 +128,7 @@ def download_pdfs(
         ) as client:
             tasks = []
             for p in papers:
-                if not p.pdfUrl:
+                if not p.pdfUrl or p.paperId in results:
                     continue
                 first_source = (p.sources[0] if p.sources else "unknown").lower()
                 target_dir = pdf_root_dir / first_source
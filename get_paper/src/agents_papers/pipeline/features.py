@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from hashlib import sha1
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from agents_papers.models.paper import Paper
+from agents_papers.utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Keyword sets registered by the consumers (quality filter, classifier, report); all are matched in one pass
+_KEYWORD_SETS: Dict[str, FrozenSet[str]] = {}
+_matcher: Optional[KeywordMatcher] = None
+_generation = 0
+
+
+def register_keyword_set(name: str, keywords: Iterable[str]) -> FrozenSet[str]:
+    """Register (or replace) a named keyword set; cached features are recomputed on next access."""
+    global _matcher, _generation
+    words = frozenset(k.strip().lower() for k in keywords if k and k.strip())
+    if _KEYWORD_SETS.get(name) != words:
+        _KEYWORD_SETS[name] = words
+        _matcher = None
+        _generation += 1
+    return words
+
+
+def keyword_set(name: str) -> FrozenSet[str]:
+    return _KEYWORD_SETS[name]
+
+
+def keyword_sets_hash() -> str:
+    """Hash of every registered keyword set; stored stage outputs computed under other sets are stale."""
+    raw = json.dumps({name: sorted(words) for name, words in _KEYWORD_SETS.items()}, sort_keys=True)
+    return sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _get_matcher() -> KeywordMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher(set().union(*_KEYWORD_SETS.values()) if _KEYWORD_SETS else ())
+    return _matcher
+
+
+@dataclass(frozen=True)
+class PaperFeatures:
+    """Text features of one paper: every registered keyword found in title+abstract, and word counts."""
+
+    matched: FrozenSet[str]
+    title_words: int
+    abstract_words: int
+
+    def hits(self, set_name: str) -> FrozenSet[str]:
+        return self.matched & _KEYWORD_SETS[set_name]
+
+    def any_of(self, set_name: str) -> bool:
+        return not self.matched.isdisjoint(_KEYWORD_SETS[set_name])
+
+
+def get_features(p: Paper) -> PaperFeatures:
+    """Features for a paper, computed once and cached on it until its title/abstract or the keyword sets change."""
+    key: Tuple[str, str, int] = (p.title, p.abstract, _generation)
+    cached = p._features
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    features = PaperFeatures(
+        matched=_get_matcher().find(f"{p.title} {p.abstract}"),
+        title_words=len(p.title.split()),
+        abstract_words=len(p.abstract.split()),
+    )
+    p._features = (key, features)
+    return features
+
+
+def extract_features(papers: List[Paper]) -> List[Paper]:
+    """Feature-extraction stage: scan each paper once for all keyword sets before filtering and ranking."""
+    for p in papers:
+        get_features(p)
+    logger.info("Extracted text features for %d papers (%d keyword sets)", len(papers), len(_KEYWORD_SETS))
+    return papers
@@ -1,23 +1,38 @@
 from __future__ import annotations
 
+import gzip
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from agents_papers.sources.arxiv import fetch_arxiv_raw
+from agents_papers.sources.arxiv import fetch_arxiv_raw, fetch_arxiv_sharded, resolve_window
+from agents_papers.sources.raw_cache import RawPageCache
 
 logger = logging.getLogger(__name__)
 
 
 def _write_raw(records: List[Dict[str, Any]], out_dir: Path, source: str) -> None:
+    # One compressed JSONL snapshot per run; pages already in the raw cache are stored by reference only
     out_dir.mkdir(parents=True, exist_ok=True)
-    for i, rec in enumerate(records):
-        path = out_dir / f"{source}-{i:03d}.json"
-        path.write_text(json.dumps(rec, ensure_ascii=False, indent=2), encoding="utf-8")
+    path = out_dir / f"{source}-pages.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for rec in records:
+            row = {k: v for k, v in rec.items() if k != "payload"} if rec.get("cache_key") else rec
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
 
-def fetch_all_sources(month: str, output_dir: Path, submitted_start: str | None = None, submitted_end: str | None = None) -> List[Dict[str, Any]]:
+def fetch_all_sources(
+    month: str,
+    output_dir: Path,
+    submitted_start: str | None = None,
+    submitted_end: str | None = None,
+    shard_days: int = 7,
+    concurrency: int = 4,
+    min_interval: float = 3.0,
+    cache_dir: Optional[Path] = None,
+    closed_after_days: int = 7,
+) -> List[Dict[str, Any]]:
     all_records: List[Dict[str, Any]] = []
     # arXiv with pagination and institution focus
     institutions = [
@@ -26,17 +41,35 @@ def fetch_all_sources(month: str, output_dir: Path, submitted_start: str | None
         "Tsinghua", "Peking University", "PKU", "USTC", "SJTU",
         "Princeton", "UCLA", "UCSD", "ETH Zurich", "NUS", "NTU",
     ]
-    arxiv_records = fetch_arxiv_raw(
-        month=month,
-        limit=250,
-        page_size=50,
-        max_pages=5,
-        institutions=institutions,
-        categories=["cs.AI", "cs.LG", "cs.MA"],
-        keywords=None,
-        submitted_start=submitted_start,
-        submitted_end=submitted_end,
-    )
+    categories = ["cs.AI", "cs.LG", "cs.MA"]
+    window = resolve_window(month, submitted_start, submitted_end)
+    if window is not None:
+        # Full coverage of the window: submittedDate shards fetched concurrently under one rate limit
+        arxiv_records = fetch_arxiv_sharded(
+            start=window[0],
+            end=window[1],
+            institutions=institutions,
+            categories=categories,
+            keywords=None,
+            shard_days=shard_days,
+            concurrency=concurrency,
+            min_interval=min_interval,
+            cache=RawPageCache(cache_dir) if cache_dir is not None else None,
+            closed_after_days=closed_after_days,
+        )
+    else:
+        logger.warning("No date window for month=%s, falling back to the capped recent-first crawl", month)
+        arxiv_records = fetch_arxiv_raw(
+            month=month,
+            limit=250,
+            page_size=50,
+            max_pages=5,
+            institutions=institutions,
+            categories=categories,
+            keywords=None,
+            submitted_start=submitted_start,
+            submitted_end=submitted_end,
+        )
     _write_raw(arxiv_records, output_dir / "arxiv", "arxiv")
     all_records.extend(arxiv_records)
 
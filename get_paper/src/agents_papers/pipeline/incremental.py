@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import logging
+from hashlib import sha1
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from agents_papers.analysis.llm_analysis import analyze_with_llm
+from agents_papers.models.paper import Paper
+from agents_papers.pipeline.classify import KEYWORDS_TO_TAG, classify_papers
+from agents_papers.pipeline.download import download_pdfs
+from agents_papers.pipeline.features import keyword_sets_hash
+from agents_papers.pipeline.quality_filter import passes_quality, quality_signals
+from agents_papers.pipeline.summarize import summarize_papers
+from agents_papers.storage.paper_store import PaperStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when quality scoring or keyword matching changes in code (weights, word-count cutoffs, matcher
+# semantics); keyword and tag-mapping edits are picked up by stage_rules_hash() automatically
+STAGE_RULES_VERSION = 2
+
+
+def stage_rules_hash() -> str:
+    """Identifies the rules behind stored quality scores and tags; a mismatch makes them recomputed."""
+    raw = json.dumps(
+        {"version": STAGE_RULES_VERSION, "keywords": keyword_sets_hash(), "tags": KEYWORDS_TO_TAG},
+        sort_keys=True,
+    )
+    return sha1(raw.encode("utf-8")).hexdigest()
+
+
+def process_incremental(
+    papers: List[Paper],
+    store: PaperStore,
+    pdf_dir: Path,
+    min_score: int = 2,
+    require_institution: bool = True,
+    llm_budget: int = 20,
+) -> Tuple[List[Paper], List[Dict[str, object]]]:
+    """
+    Quality filter -> classify -> summarize -> download PDFs -> LLM analysis, reusing stored stage outputs.
+
+    Only papers that are new or whose inputs changed are scored and classified; PDFs and analyses are
+    reused from any earlier window. The LLM budget is spent on papers without a current analysis, so
+    repeated runs progressively cover the whole window. Returns (summarized papers, analyses) in the
+    same shapes as the non-incremental pipeline.
+    """
+    stored, dirty = store.sync(papers, rules_hash=stage_rules_hash())
+    logger.info("Paper store: %d papers, %d new or changed", len(papers), len(dirty))
+
+    fresh = []
+    for p in papers:
+        rec = stored[p.paperId]
+        if rec.quality_score is None or rec.has_institution is None:
+            rec.quality_score, rec.has_institution = quality_signals(p)
+            fresh.append((p.paperId, rec.quality_score, rec.has_institution))
+    store.set_quality(fresh)
+    kept = [
+        p
+        for p in papers
+        if passes_quality(
+            stored[p.paperId].quality_score,
+            stored[p.paperId].has_institution,
+            min_score=min_score,
+            require_institution=require_institution,
+        )
+    ]
+    logger.info("Quality filter kept %d / %d papers (%d scored this run)", len(kept), len(papers), len(fresh))
+
+    to_classify = [p for p in kept if stored[p.paperId].tags is None]
+    classify_papers(to_classify)
+    store.set_tags({p.paperId: p.tags for p in to_classify})
+    for p in kept:
+        if stored[p.paperId].tags is not None:
+            p.tags = stored[p.paperId].tags
+    logger.info("Classified %d papers, reused tags for %d", len(to_classify), len(kept) - len(to_classify))
+
+    summarized = summarize_papers(kept)
+
+    known = {p.paperId: stored[p.paperId].pdf_path for p in summarized if stored[p.paperId].pdf_path}
+    mapping = download_pdfs(summarized, pdf_dir, known=known)
+    store.set_pdf_paths({pid: path for pid, path in mapping.items() if known.get(pid) != path})
+
+    current: Dict[str, object] = {
+        p.paperId: stored[p.paperId].analysis
+        for p in summarized
+        if stored[p.paperId].analysis and stored[p.paperId].analysis_hash == stored[p.paperId].input_hash
+    }
+    pending = [p for p in summarized if p.paperId not in current]
+    fresh_analyses = analyze_with_llm(pending, budget=llm_budget) if pending else []
+    new_results = {
+        a["paperId"]: (a["analysis"], stored[a["paperId"]].input_hash)
+        for a in fresh_analyses
+        if a.get("analysis") and a.get("paperId") in stored
+    }
+    # Unparsed fallbacks ({"raw": ...}) are used for this run only so the next run retries them
+    store.set_analyses({pid: v for pid, v in new_results.items() if "raw" not in v[0]})
+    current.update({pid: analysis for pid, (analysis, _) in new_results.items()})
+    logger.info("LLM analyses: %d reused, %d new, %d pending", len(current) - len(new_results), len(new_results), len(summarized) - len(current))
+
+    analyses = [{"paperId": p.paperId, "analysis": current[p.paperId]} for p in summarized if p.paperId in current]
+    return summarized, analyses
@@ -2,47 +2,46 @@ from __future__ import annotations
 
 import logging
 from typing import Any, Dict, Iterable, List
-from datetime import datetime, timezone
 
-import feedparser
+from agents_papers.sources.arxiv_atom import iter_arxiv_entries
 
 logger = logging.getLogger(__name__)
 
 
+def parse_arxiv_page(xml: str) -> List[Dict[str, Any]]:
+    parsed: List[Dict[str, Any]] = []
+    for entry in iter_arxiv_entries(xml):
+        parsed.append(
+            {
+                "source": "arxiv",
+                "title": entry["title"],
+                "authors": entry["authors"],
+                "abstract": entry["summary"],
+                "primaryUrl": entry["link"],
+                "pdfUrl": entry["pdf_url"],
+                "arxiv_id": entry["id"].split("/abs/")[-1],
+                "published": entry["published"] or None,
+                "categories": entry["categories"],
+            }
+        )
+    return parsed
+
+
 def parse_records(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     parsed: List[Dict[str, Any]] = []
+    # Sharded/paged fetches can return the same paper twice (page boundaries shift while paging)
+    seen_ids: set[str] = set()
     for rec in records:
         source = rec.get("source")
         if source == "arxiv":
-            xml = rec["payload"]
-            feed = feedparser.parse(xml)
-            for entry in feed.get("entries", []):
-                authors = [a.get("name", "").strip() for a in entry.get("authors", [])]
-                pdf_url = None
-                for link in entry.get("links", []):
-                    if link.get("type") == "application/pdf":
-                        pdf_url = link.get("href")
-                        break
-                categories = []
-                for t in entry.get("tags", []) or []:
-                    term = t.get("term")
-                    if term:
-                        categories.append(term)
-                parsed.append(
-                    {
-                        "source": "arxiv",
-                        "title": entry.get("title", "").strip(),
-                        "authors": [a for a in authors if a],
-                        "abstract": entry.get("summary", "").strip(),
-                        "primaryUrl": entry.get("link"),
-                        "pdfUrl": pdf_url,
-                        "arxiv_id": entry.get("id", "").split("/abs/")[-1],
-                        "published": entry.get("published"),
-                        "categories": categories,
-                    }
-                )
+            for row in parse_arxiv_page(rec["payload"]):
+                arxiv_id = row["arxiv_id"]
+                base_id = arxiv_id.rsplit("v", 1)[0] if arxiv_id else ""
+                if base_id:
+                    if base_id in seen_ids:
+                        continue
+                    seen_ids.add(base_id)
+                parsed.append(row)
         else:
             logger.warning("Unknown source: %s", source)
     return parsed
-
-
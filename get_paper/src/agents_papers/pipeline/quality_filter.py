@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from typing import List, Tuple
 
 from agents_papers.models.paper import Paper
+from agents_papers.pipeline.features import get_features, register_keyword_set
 
 logger = logging.getLogger(__name__)
 
@@ -26,32 +27,43 @@ NEGATIVE_TERMS = [
     "survey", "review", "tutorial", "position paper", "workshop summary",
 ]
 
+register_keyword_set("institution", INSTITUTION_KEYWORDS)
+register_keyword_set("quality_positive", POSITIVE_TERMS)
+register_keyword_set("quality_negative", NEGATIVE_TERMS)
+
 
 def _score_paper(p: Paper) -> int:
-    text = f"{p.title} {p.abstract}".lower()
+    f = get_features(p)
     score = 0
-    if any(inst in text for inst in INSTITUTION_KEYWORDS):
+    if f.any_of("institution"):
         score += 2
-    if len(p.title.split()) >= 6:
+    if f.title_words >= 6:
         score += 1
-    if len(p.abstract.split()) >= 120:  # ~> 800-1000 chars
+    if f.abstract_words >= 120:  # ~> 800-1000 chars
         score += 1
-    if any(term in text for term in POSITIVE_TERMS):
+    if f.any_of("quality_positive"):
         score += 1
-    if any(term in text for term in NEGATIVE_TERMS):
+    if f.any_of("quality_negative"):
         score -= 1
     return score
 
 
+def quality_signals(p: Paper) -> Tuple[int, bool]:
+    """(score, has_institution) for a paper; passes_quality applies the thresholds"""
+    return _score_paper(p), get_features(p).any_of("institution")
+
+
+def passes_quality(score: int, has_institution: bool, min_score: int = 2, require_institution: bool = True) -> bool:
+    if require_institution and not has_institution:
+        return False
+    return score >= min_score
+
+
 def filter_high_quality(papers: List[Paper], min_score: int = 2, require_institution: bool = True) -> List[Paper]:
     filtered: List[Paper] = []
     for p in papers:
-        text = f"{p.title} {p.abstract}".lower()
-        has_institution = any(inst in text for inst in INSTITUTION_KEYWORDS)
-        score = _score_paper(p)
-        if require_institution and not has_institution:
-            continue
-        if score >= min_score:
+        score, has_institution = quality_signals(p)
+        if passes_quality(score, has_institution, min_score=min_score, require_institution=require_institution):
             filtered.append(p)
     logger.info("Quality filter kept %d / %d papers", len(filtered), len(papers))
     return filtered
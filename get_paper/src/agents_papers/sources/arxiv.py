@@ -2,16 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
+from agents_papers.sources.raw_cache import RawPageCache
+
 logger = logging.getLogger(__name__)
 
 
 ARXIV_API = "https://export.arxiv.org/api/query"
 
+_TOTAL_RESULTS_RE = re.compile(r"<opensearch:totalResults[^>]*>\s*(\d+)\s*<")
+# Shards are minute-granular; submittedDate accepts YYYYMMDDHHMM
+_SHARD_FMT = "%Y%m%d%H%M"
+
 
 def _quote(term: str) -> str:
     term = term.strip()
@@ -121,3 +128,194 @@ def fetch_arxiv_raw(
     return asyncio.run(_run())
 
 
+
+
+class _AsyncRateLimiter:
+    """Global request spacing shared by all shards: overall QPS stays <= 1/min_interval."""
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = max(0.0, min_interval)
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _parse_total_results(xml: str) -> int:
+    m = _TOTAL_RESULTS_RE.search(xml)
+    return int(m.group(1)) if m else 0
+
+
+def resolve_window(
+    month: Optional[str],
+    submitted_start: Optional[str] = None,
+    submitted_end: Optional[str] = None,
+) -> Optional[Tuple[datetime, datetime]]:
+    """Inclusive fetch window from submitted_start/end (YYYYMMDD) or a YYYY-MM month; None if neither is usable."""
+    if submitted_start and submitted_end:
+        start = datetime.strptime(submitted_start, "%Y%m%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(submitted_end, "%Y%m%d").replace(tzinfo=timezone.utc)
+        return start, end + timedelta(days=1) - timedelta(minutes=1)
+    if month:
+        try:
+            start = datetime.strptime(month + "-01", "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+        next_month = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        return start, next_month - timedelta(minutes=1)
+    return None
+
+
+def split_window(start: datetime, end: datetime, shard_days: int) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end] into adjacent, non-overlapping shards of shard_days days."""
+    step = timedelta(days=max(1, shard_days))
+    shards: List[Tuple[datetime, datetime]] = []
+    cur = start
+    while cur <= end:
+        nxt = min(cur + step, end + timedelta(minutes=1))
+        shards.append((cur, nxt - timedelta(minutes=1)))
+        cur = nxt
+    return shards
+
+
+def fetch_arxiv_sharded(
+    start: datetime,
+    end: datetime,
+    institutions: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+    keywords: Optional[List[str]] = None,
+    shard_days: int = 7,
+    page_size: int = 100,
+    max_per_shard: int = 1000,
+    min_shard_span: timedelta = timedelta(hours=1),
+    concurrency: int = 4,
+    min_interval: float = 3.0,
+    attempts: int = 3,
+    cache: Optional[RawPageCache] = None,
+    closed_after_days: int = 7,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch every result in [start, end] by splitting the window into submittedDate shards.
+
+    - Each shard's first page doubles as a probe for opensearch:totalResults
+    - Shards with more than max_per_shard results are halved and re-probed (down to min_shard_span)
+    - All requests share one global rate limiter; concurrency only overlaps network latency
+    - Shards that closed more than closed_after_days ago are immutable: with a cache they are served from it
+      (including remembered splits) and written to it after a complete fetch, so reruns cost no requests
+    - Returns page records in the fetch_arxiv_raw format, ordered by shard and page, plus shard/start keys
+      (and cache_key when the shard is cached)
+    """
+    shards = split_window(start, end, shard_days)
+    logger.info(
+        "arXiv sharded fetch: window=%s..%s shards=%d page_size=%d max_per_shard=%d",
+        start.strftime(_SHARD_FMT), end.strftime(_SHARD_FMT), len(shards), page_size, max_per_shard,
+    )
+
+    async def _run() -> List[Dict[str, Any]]:
+        limiter = _AsyncRateLimiter(min_interval)
+        sem = asyncio.Semaphore(max(1, concurrency))
+        pages: List[Tuple[str, int, str, Optional[str]]] = []
+        closed_before = datetime.now(tz=timezone.utc) - timedelta(days=closed_after_days)
+
+        async with httpx.AsyncClient(headers={"User-Agent": "agents-papers/0.1"}) as client:
+
+            async def _get(query: str, start_at: int) -> str:
+                last_exc: Exception | None = None
+                for attempt in range(1, attempts + 1):
+                    async with sem:
+                        await limiter.wait()
+                        try:
+                            return await _fetch_page(client, query=query, start=start_at, max_results=page_size)
+                        except Exception as exc:
+                            last_exc = exc
+                    if attempt < attempts:
+                        await asyncio.sleep(0.8 * (2 ** (attempt - 1)))
+                raise RuntimeError(f"arXiv request failed after {attempts} attempts: {last_exc}") from last_exc
+
+            async def _shard(lo: datetime, hi: datetime) -> None:
+                key = f"{lo.strftime(_SHARD_FMT)}-{hi.strftime(_SHARD_FMT)}"
+                query = build_query(
+                    keywords=keywords,
+                    categories=categories,
+                    institutions=institutions,
+                    submitted_start=lo.strftime(_SHARD_FMT),
+                    submitted_end=hi.strftime(_SHARD_FMT),
+                )
+                cache_key = cache.key_for(query, page_size) if cache is not None and hi < closed_before else None
+                if cache_key is not None:
+                    entry = cache.get(cache_key)
+                    if entry is not None and entry.get("split_at"):
+                        mid = datetime.strptime(entry["split_at"], _SHARD_FMT).replace(tzinfo=timezone.utc)
+                        await asyncio.gather(_shard(lo, mid), _shard(mid + timedelta(minutes=1), hi))
+                        return
+                    if entry is not None:
+                        pages.extend((key, p["start"], p["payload"], cache_key) for p in entry.get("pages") or [])
+                        return
+                first = await _get(query, 0)
+                total = _parse_total_results(first)
+                if total > max_per_shard and hi - lo > min_shard_span:
+                    mid = lo + (hi - lo) / 2
+                    mid = mid.replace(second=0, microsecond=0)
+                    logger.info("arXiv shard %s total=%d > %d, splitting", key, total, max_per_shard)
+                    if cache_key is not None:
+                        cache.put(cache_key, {"query": query, "split_at": mid.strftime(_SHARD_FMT)})
+                    await asyncio.gather(_shard(lo, mid), _shard(mid + timedelta(minutes=1), hi))
+                    return
+                if total > max_per_shard:
+                    logger.warning("arXiv shard %s total=%d still exceeds %d at minimum span, fetching all pages", key, total, max_per_shard)
+                complete = True
+                shard_pages: List[Tuple[int, str]] = []
+                if "<entry" in first:
+                    shard_pages.append((0, first))
+                elif total > 0 or _TOTAL_RESULTS_RE.search(first) is None:
+                    # An empty first page is final only when arXiv reports zero results for the shard
+                    logger.warning("arXiv shard %s page start=0 returned no entries (total=%d)", key, total)
+                    complete = False
+                rest = list(range(page_size, total, page_size))
+                bodies = await asyncio.gather(*[_get(query, s) for s in rest])
+                for start_at, xml in zip(rest, bodies):
+                    if "<entry" not in xml:
+                        logger.warning("arXiv shard %s page start=%d returned no entries (total=%d)", key, start_at, total)
+                        complete = False
+                        continue
+                    shard_pages.append((start_at, xml))
+                # Only cache shards whose pages all came back, otherwise a transient gap would become permanent
+                if cache_key is not None and complete:
+                    cache.put(
+                        cache_key,
+                        {
+                            "query": query,
+                            "total": total,
+                            "fetched_at": datetime.now(tz=timezone.utc).isoformat(),
+                            "pages": [{"start": s, "payload": xml} for s, xml in shard_pages],
+                        },
+                    )
+                else:
+                    cache_key = None
+                pages.extend((key, s, xml, cache_key) for s, xml in shard_pages)
+                logger.info("arXiv shard %s total=%d pages=%d", key, total, 1 + len(rest) if total else 0)
+
+            await asyncio.gather(*[_shard(lo, hi) for lo, hi in shards])
+
+        pages.sort(key=lambda p: (p[0], p[1]))
+        fetched_at = datetime.now(tz=timezone.utc).isoformat()
+        records: List[Dict[str, Any]] = []
+        for key, start_at, xml, cache_key in pages:
+            rec = {"source": "arxiv", "fetched_at": fetched_at, "shard": key, "start": start_at, "payload": xml}
+            if cache_key is not None:
+                rec["cache_key"] = cache_key
+            records.append(rec)
+        return records
+
+    records = asyncio.run(_run())
+    logger.info("arXiv sharded fetch done: pages=%d", len(records))
+    if cache is not None:
+        logger.info("arXiv raw cache: %s", cache.get_stats())
+    return records
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import io
+import logging
+from typing import Any, Dict, Iterator, List
+
+try:  # lxml is faster; the stdlib parser has the same iterparse API
+    from lxml import etree as _etree
+
+    PARSER_BACKEND = "lxml"
+except ImportError:  # pragma: no cover
+    import xml.etree.ElementTree as _etree
+
+    PARSER_BACKEND = "xml.etree"
+
+logger = logging.getLogger(__name__)
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ENTRY = f"{_ATOM}entry"
+_TEXT_FIELDS = {f"{_ATOM}{name}": name for name in ("id", "title", "summary", "published", "updated")}
+
+
+def _text(elem: Any) -> str:
+    return (elem.text or "").strip()
+
+
+def _entry_to_dict(entry: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {name: "" for name in _TEXT_FIELDS.values()}
+    authors: List[str] = []
+    links: List[Dict[str, str]] = []
+    categories: List[str] = []
+    for child in entry:
+        tag = child.tag
+        if tag in _TEXT_FIELDS:
+            out[_TEXT_FIELDS[tag]] = _text(child)
+        elif tag == f"{_ATOM}author":
+            name = child.find(f"{_ATOM}name")
+            if name is not None and _text(name):
+                authors.append(_text(name))
+        elif tag == f"{_ATOM}link":
+            links.append({k: v for k, v in child.attrib.items() if k in ("href", "rel", "type", "title")})
+        elif tag == f"{_ATOM}category":
+            term = child.get("term")
+            if term:
+                categories.append(term)
+    out["authors"] = authors
+    out["links"] = links
+    out["categories"] = categories
+    # Same rule as feedparser's entry.link: the first rel="alternate" link (rel defaults to alternate)
+    out["link"] = next((ln.get("href") for ln in links if ln.get("rel", "alternate") == "alternate"), None)
+    out["pdf_url"] = next((ln.get("href") for ln in links if ln.get("type") == "application/pdf"), None)
+    return out
+
+
+def iter_arxiv_entries(xml: str | bytes) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the <entry> elements of an arXiv API Atom page as plain dicts.
+
+    Yields id, title, summary, published, updated, authors (names), links (href/rel/type/title),
+    categories (atom:category terms), link (alternate URL) and pdf_url. Each entry is detached from
+    the tree once converted, so memory stays flat regardless of page size. A malformed page stops
+    the stream with a warning after the entries parsed so far.
+    """
+    data = xml.encode("utf-8") if isinstance(xml, str) else xml
+    root = None
+    try:
+        for event, elem in _etree.iterparse(io.BytesIO(data), events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag != _ENTRY:
+                continue
+            yield _entry_to_dict(elem)
+            elem.clear()
+            if root is not None and elem in root:
+                root.remove(elem)
+    except _etree.ParseError as exc:
+        logger.warning("Malformed arXiv Atom page, stopping after partial parse: %s", exc)
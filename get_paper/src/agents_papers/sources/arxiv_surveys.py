@@ -8,8 +8,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-import feedparser
 
+from agents_papers.sources.arxiv_atom import iter_arxiv_entries
 from agents_papers.utils.dates import format_yyyymmdd
 
 
@@ -74,32 +74,18 @@ def _extract_arxiv_id(entry_id: str) -> str:
 
 
 def _parse_entries(xml_text: str) -> List[Dict[str, Any]]:
-	feed = feedparser.parse(xml_text)
 	results: List[Dict[str, Any]] = []
-	for e in feed.entries:
-		arxiv_id = _extract_arxiv_id(getattr(e, "id", ""))
-		published = getattr(e, "published", None)
-		title = getattr(e, "title", "")
-		summary = getattr(e, "summary", "")
-		authors = [a.name for a in getattr(e, "authors", [])] if hasattr(e, "authors") else []
-		categories = [t.term for t in getattr(e, "tags", [])] if hasattr(e, "tags") else []
-		links = getattr(e, "links", [])
-		pdf_url = None
-		for ln in links or []:
-			if isinstance(ln, dict):
-				if ln.get("type") == "application/pdf":
-					pdf_url = ln.get("href")
-					break
+	for e in iter_arxiv_entries(xml_text):
 		results.append(
 			{
-				"arxiv_id": arxiv_id,
-				"entry_id": getattr(e, "id", ""),
-				"title": title,
-				"summary": summary,
-				"authors": authors,
-				"categories": categories,
-				"published": published,
-				"pdf_url": pdf_url,
+				"arxiv_id": _extract_arxiv_id(e["id"]),
+				"entry_id": e["id"],
+				"title": e["title"],
+				"summary": e["summary"],
+				"authors": e["authors"],
+				"categories": e["categories"],
+				"published": e["published"] or None,
+				"pdf_url": e["pdf_url"],
 			}
 		)
 	return results
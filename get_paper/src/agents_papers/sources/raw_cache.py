@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+class RawPageCache:
+    """
+    Content-addressed, gzip-compressed store of raw API pages.
+
+    Entries are keyed by a hash of the exact request (query incl. shard window + page size), one file per
+    shard under <root>/<key[:2]>/<key>.json.gz. Callers decide which windows are immutable enough to reuse.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def key_for(query: str, page_size: int) -> str:
+        raw = json.dumps({"query": query, "page_size": page_size}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.path_for(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception as exc:
+            logger.warning("Ignoring unreadable raw cache entry %s: %s", str(path), exc)
+            self.misses += 1
+            return None
+        if entry.get("version") != _CACHE_VERSION:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({**entry, "version": _CACHE_VERSION}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.writes += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"root": str(self.root), "hits": self.hits, "misses": self.misses, "writes": self.writes}
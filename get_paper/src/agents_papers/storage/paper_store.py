@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from agents_papers.models.paper import Paper
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 500
+
+
+def paper_input_hash(p: Paper) -> str:
+    """Hash of the fields every stage reads (quality, tags, PDF, LLM analysis); a change invalidates stored outputs."""
+    raw = json.dumps(
+        {
+            "title": p.title,
+            "authors": p.authors,
+            "abstract": p.abstract,
+            "venue": p.venue,
+            "pdfUrl": p.pdfUrl,
+            "topics": p.topics,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return sha1(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StoredPaper:
+    paper_id: str
+    input_hash: str
+    quality_score: Optional[int] = None
+    has_institution: Optional[bool] = None
+    tags: Optional[List[str]] = None
+    pdf_url: Optional[str] = None
+    pdf_path: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None
+    analysis_hash: Optional[str] = None
+    rules_hash: Optional[str] = None
+
+
+class PaperStore:
+    """
+    SQLite store of per-paper stage outputs keyed by paperId.
+
+    Each row keeps the normalized paper, the hash of its stage inputs and the outputs of the quality
+    filter, classifier, PDF download and LLM analysis. sync() resets outputs of papers whose inputs
+    changed, so reruns and overlapping windows only recompute new or changed papers. Quality and tags
+    are also reset when the rules they were computed under (rules_hash) differ from the current ones.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY,
+                input_hash TEXT NOT NULL,
+                paper_json TEXT NOT NULL,
+                quality_score INTEGER,
+                has_institution INTEGER,
+                tags_json TEXT,
+                pdf_url TEXT,
+                pdf_path TEXT,
+                analysis_json TEXT,
+                analysis_hash TEXT,
+                rules_hash TEXT,
+                first_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(papers)")}
+        if "rules_hash" not in columns:
+            # Stores created before rules_hash existed: their quality/tags are recomputed on next sync
+            self.conn.execute("ALTER TABLE papers ADD COLUMN rules_hash TEXT")
+        self.conn.commit()
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.rules_reset = 0
+
+    def get_many(self, paper_ids: Iterable[str]) -> Dict[str, StoredPaper]:
+        ids = list(paper_ids)
+        out: Dict[str, StoredPaper] = {}
+        with self._lock:
+            for i in range(0, len(ids), _CHUNK):
+                chunk = ids[i : i + _CHUNK]
+                rows = self.conn.execute(
+                    "SELECT paper_id, input_hash, quality_score, has_institution, tags_json, pdf_url, pdf_path,"
+                    " analysis_json, analysis_hash, rules_hash FROM papers WHERE paper_id IN (%s)" % ",".join("?" * len(chunk)),
+                    chunk,
+                ).fetchall()
+                for pid, ihash, score, inst, tags, pdf_url, pdf, analysis, ahash, rhash in rows:
+                    out[pid] = StoredPaper(
+                        paper_id=pid,
+                        input_hash=ihash,
+                        quality_score=score,
+                        has_institution=None if inst is None else bool(inst),
+                        tags=json.loads(tags) if tags is not None else None,
+                        pdf_url=pdf_url,
+                        pdf_path=pdf,
+                        analysis=json.loads(analysis) if analysis is not None else None,
+                        analysis_hash=ahash,
+                        rules_hash=rhash,
+                    )
+        return out
+
+    def sync(self, papers: List[Paper], rules_hash: str = "") -> Tuple[Dict[str, StoredPaper], Set[str]]:
+        """
+        Register papers; returns stored records for all of them and the ids that are new or changed.
+
+        rules_hash identifies the quality/tagging rules of this run; unchanged papers whose outputs were
+        computed under different rules get their quality and tags reset so the caller recomputes them.
+        """
+        hashes = {p.paperId: paper_input_hash(p) for p in papers}
+        stored = self.get_many(hashes)
+        now = datetime.now(tz=timezone.utc).isoformat()
+        dirty: Set[str] = set()
+        rows = []
+        stale = []
+        for p in papers:
+            h = hashes[p.paperId]
+            prev = stored.get(p.paperId)
+            if prev is not None and prev.input_hash == h:
+                self.unchanged += 1
+                if prev.rules_hash != rules_hash:
+                    prev.quality_score = prev.has_institution = prev.tags = None
+                    prev.rules_hash = rules_hash
+                    stale.append((rules_hash, now, p.paperId))
+                continue
+            if prev is None:
+                self.new += 1
+            else:
+                self.changed += 1
+            dirty.add(p.paperId)
+            # The PDF survives input changes unless its URL changed (e.g. a new arXiv version);
+            # the analysis is kept and analysis_hash tells callers whether it is stale
+            stored[p.paperId] = StoredPaper(
+                paper_id=p.paperId,
+                input_hash=h,
+                pdf_url=p.pdfUrl,
+                pdf_path=prev.pdf_path if prev and prev.pdf_url == p.pdfUrl else None,
+                analysis=prev.analysis if prev else None,
+                analysis_hash=prev.analysis_hash if prev else None,
+                rules_hash=rules_hash,
+            )
+            rows.append((p.paperId, h, p.model_dump_json(), p.pdfUrl, stored[p.paperId].pdf_path, rules_hash, now, now))
+        self.rules_reset += len(stale)
+        with self._lock:
+            self.conn.executemany(
+                """
+                INSERT INTO papers (paper_id, input_hash, paper_json, pdf_url, pdf_path, rules_hash, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(paper_id) DO UPDATE SET
+                    input_hash = excluded.input_hash,
+                    paper_json = excluded.paper_json,
+                    pdf_url = excluded.pdf_url,
+                    pdf_path = excluded.pdf_path,
+                    rules_hash = excluded.rules_hash,
+                    quality_score = NULL,
+                    has_institution = NULL,
+                    tags_json = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+            self.conn.executemany(
+                "UPDATE papers SET quality_score = NULL, has_institution = NULL, tags_json = NULL,"
+                " rules_hash = ?, updated_at = ? WHERE paper_id = ?",
+                stale,
+            )
+            self.conn.commit()
+        return stored, dirty
+
+    def _update(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self.conn.executemany(sql, rows)
+            self.conn.commit()
+
+    def set_quality(self, results: Iterable[Tuple[str, int, bool]]) -> None:
+        now = datetime.now(tz=timezone.utc).isoformat()
+        self._update(
+            "UPDATE papers SET quality_score = ?, has_institution = ?, updated_at = ? WHERE paper_id = ?",
+            [(score, int(inst), now, pid) for pid, score, inst in results],
+        )
+
+    def set_tags(self, tags: Dict[str, List[str]]) -> None:
+        now = datetime.now(tz=timezone.utc).isoformat()
+        self._update(
+            "UPDATE papers SET tags_json = ?, updated_at = ? WHERE paper_id = ?",
+            [(json.dumps(t, ensure_ascii=False), now, pid) for pid, t in tags.items()],
+        )
+
+    def set_pdf_paths(self, paths: Dict[str, str]) -> None:
+        now = datetime.now(tz=timezone.utc).isoformat()
+        self._update(
+            "UPDATE papers SET pdf_path = ?, updated_at = ? WHERE paper_id = ?",
+            [(path, now, pid) for pid, path in paths.items()],
+        )
+
+    def set_analyses(self, analyses: Dict[str, Tuple[Dict[str, Any], str]]) -> None:
+        """paperId -> (analysis, input_hash the analysis was computed from)"""
+        now = datetime.now(tz=timezone.utc).isoformat()
+        self._update(
+            "UPDATE papers SET analysis_json = ?, analysis_hash = ?, updated_at = ? WHERE paper_id = ?",
+            [(json.dumps(a, ensure_ascii=False), h, now, pid) for pid, (a, h) in analyses.items()],
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            analyzed = self.conn.execute("SELECT COUNT(*) FROM papers WHERE analysis_json IS NOT NULL").fetchone()[0]
+        return {
+            "db_path": str(self.db_path),
+            "papers": total,
+            "analyzed": analyzed,
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "rules_reset": self.rules_reset,
+        }
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -40,12 +40,16 @@ def ensure_data_dirs(label: str) -> dict[str, Path]:
     raw_dir = base / "raw" / label
     normalized_dir = base / "normalized" / label
     exports_dir = base / "exports" / label
-    for d in (raw_dir, normalized_dir, exports_dir):
+    cache_dir = base / "cache"
+    state_dir = base / "state"
+    for d in (raw_dir, normalized_dir, exports_dir, cache_dir, state_dir):
         d.mkdir(parents=True, exist_ok=True)
     return {
         "raw": raw_dir,
         "normalized": normalized_dir,
         "exports": exports_dir,
+        "cache": cache_dir,
+        "state": state_dir,
     }
 
 
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w")
+# Plural forms count as the keyword ("agents" -> "agent", "processes" -> "process")
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    # Keywords as a character trie: shared prefixes are matched once, longer keywords are tried first
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def _ends_word(keyword: str, prefix: str) -> bool:
+    # Whether prefix, seen inside keyword, is itself a whole word (or a plural of one)
+    rest = keyword[len(prefix) :]
+    return not _WORD_RE.match(rest[0]) or rest in _PLURAL_SUFFIXES
+
+
+class KeywordMatcher:
+    """
+    Single-pass, word-boundary-aware matcher for many keywords.
+
+    All keywords compile into one trie regex wrapped in a lookahead, so one scan of the lowercased
+    text finds every keyword starting at every position, including overlapping ones ("tool" inside
+    "tool use"). A keyword only matches as whole words (optionally pluralised), so "mit" no longer
+    hits "submit". When several keywords start at the same position the regex returns the longest;
+    shorter keywords that are its whole-word prefixes are added from a precomputed table.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        words = sorted({k.strip().lower() for k in keywords if k and k.strip()})
+        self.keywords: List[str] = words
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            w: tuple(p for p in words if w.startswith(p) and (p == w or _ends_word(w, p))) for w in words
+        }
+        self._pattern: Optional[re.Pattern] = None
+        if words:
+            self._pattern = re.compile(r"(?<!\w)(?=(" + _trie_pattern(words) + r")(?:e?s)?(?!\w))")
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Keywords (lowercase) occurring in text as whole words."""
+        if self._pattern is None or not text:
+            return frozenset()
+        found = set()
+        for longest in set(self._pattern.findall(text.lower())):
+            found.update(self._implied[longest])
+        return frozenset(found)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+_SRC_DIR = Path(__file__).resolve().parent
+if str(_SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(_SRC_DIR))
+
+import feedparser
+
+from agents_papers.pipeline.parse import parse_arxiv_page
+from agents_papers.sources.arxiv_atom import PARSER_BACKEND
+
+DEFAULT_DATA_DIR = _SRC_DIR.parent / "data"
+
+
+def _feedparser_page(xml: str) -> List[Dict[str, Any]]:
+    # Reference: the feedparser-based mapping parse_records used before the streaming parser
+    parsed: List[Dict[str, Any]] = []
+    for entry in feedparser.parse(xml).get("entries", []):
+        authors = [a.get("name", "").strip() for a in entry.get("authors", [])]
+        pdf_url = None
+        for link in entry.get("links", []):
+            if link.get("type") == "application/pdf":
+                pdf_url = link.get("href")
+                break
+        categories = [t.get("term") for t in entry.get("tags", []) or [] if t.get("term")]
+        parsed.append(
+            {
+                "source": "arxiv",
+                "title": entry.get("title", "").strip(),
+                "authors": [a for a in authors if a],
+                "abstract": entry.get("summary", "").strip(),
+                "primaryUrl": entry.get("link"),
+                "pdfUrl": pdf_url,
+                "arxiv_id": entry.get("id", "").split("/abs/")[-1],
+                "published": entry.get("published"),
+                "categories": categories,
+            }
+        )
+    return parsed
+
+
+def load_corpus(data_dir: Path) -> List[str]:
+    """Collect recorded Atom pages: the raw page cache plus per-run raw snapshots (deduplicated by content)"""
+    pages: Dict[str, str] = {}
+
+    def _add(xml: Any) -> None:
+        if isinstance(xml, str) and "<entry" in xml:
+            pages.setdefault(hashlib.sha1(xml.encode("utf-8")).hexdigest(), xml)
+
+    for path in sorted((data_dir / "cache" / "arxiv").glob("*/*.json.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for page in json.load(f).get("pages") or []:
+                _add(page.get("payload"))
+    for path in sorted((data_dir / "raw").glob("*/arxiv/*-pages.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                _add(json.loads(line).get("payload"))
+    for path in sorted((data_dir / "raw").glob("*/arxiv/arxiv-*.json")):
+        _add(json.loads(path.read_text(encoding="utf-8")).get("payload"))
+    return list(pages.values())
+
+
+def _time(fn, pages: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for xml in pages:
+            fn(xml)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_kib(fn, pages: List[str]) -> float:
+    tracemalloc.start()
+    for xml in pages:
+        fn(xml)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming arXiv Atom parser against feedparser")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="get_paper data directory (cache/ and raw/)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing passes over the corpus (best is reported)")
+    parser.add_argument("--min-pages", type=int, default=100, help="Warn when the corpus has fewer pages than this")
+    parser.add_argument("--show-diffs", type=int, default=5, help="Mismatching entries to print")
+    args = parser.parse_args()
+
+    pages = load_corpus(Path(args.data_dir))
+    if not pages:
+        print(f"No recorded Atom pages under {args.data_dir} (run monthly_run for a few past months to populate cache/arxiv)")
+        return 1
+    if len(pages) < args.min_pages:
+        print(f"Warning: corpus has only {len(pages)} pages (< {args.min_pages}); backfill more months for a representative run")
+
+    entries = 0
+    mismatched_pages = 0
+    mismatched_entries = 0
+    shown = 0
+    for xml in pages:
+        expected = _feedparser_page(xml)
+        actual = parse_arxiv_page(xml)
+        entries += len(expected)
+        if expected == actual:
+            continue
+        mismatched_pages += 1
+        if len(expected) != len(actual):
+            mismatched_entries += abs(len(expected) - len(actual))
+            if shown < args.show_diffs:
+                print(f"entry count differs: feedparser={len(expected)} streaming={len(actual)}")
+                shown += 1
+        for exp, act in zip(expected, actual):
+            if exp == act:
+                continue
+            mismatched_entries += 1
+            if shown < args.show_diffs:
+                fields = [k for k in exp if exp.get(k) != act.get(k)]
+                print(f"{exp.get('arxiv_id')}: " + "; ".join(f"{k}: {exp.get(k)!r} != {act.get(k)!r}" for k in fields))
+                shown += 1
+
+    t_ref = _time(_feedparser_page, pages, args.repeat)
+    t_new = _time(parse_arxiv_page, pages, args.repeat)
+    mem_ref = _peak_kib(_feedparser_page, pages)
+    mem_new = _peak_kib(parse_arxiv_page, pages)
+    print(f"pages={len(pages)} entries={entries} backend={PARSER_BACKEND}")
+    print(f"feedparser: {t_ref * 1000 / len(pages):.2f} ms/page  peak {mem_ref:.0f} KiB")
+    print(f"streaming:  {t_new * 1000 / len(pages):.2f} ms/page  peak {mem_new:.0f} KiB  speedup x{t_ref / t_new if t_new else 0:.1f}")
+    print(f"equivalence: mismatched pages={mismatched_pages} entries={mismatched_entries}")
+    return 0 if mismatched_pages == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,6 +20,7 @@ from agents_papers.pipeline.fetch import fetch_all_sources
 from agents_papers.pipeline.parse import parse_records
 from agents_papers.pipeline.normalize import normalize_records
 from agents_papers.pipeline.deduplicate import deduplicate_papers
+from agents_papers.pipeline.features import extract_features
 from agents_papers.pipeline.classify import classify_papers
 from agents_papers.pipeline.quality_filter import filter_high_quality
 from agents_papers.pipeline.summarize import summarize_papers
@@ -29,6 +30,8 @@ from agents_papers.analysis.statistics import generate_statistics, generate_adva
 from agents_papers.analysis.llm_analysis import analyze_with_llm
 from agents_papers.analysis.selector import select_top_k, rank_papers
 from agents_papers.pipeline.download import download_pdfs
+from agents_papers.pipeline.incremental import process_incremental
+from agents_papers.storage.paper_store import PaperStore
 
 
 def configure_logging() -> None:
@@ -43,6 +46,17 @@ def main() -> None:
     parser.add_argument("--month", required=False, help="Month in YYYY-MM format")
     parser.add_argument("--start", required=False, help="Start date YYYY-MM-DD")
     parser.add_argument("--end", required=False, help="End date YYYY-MM-DD")
+    parser.add_argument("--shard-days", type=int, default=7, help="arXiv submittedDate 分片天数（结果过多的分片会继续二分）")
+    parser.add_argument("--arxiv-concurrency", type=int, default=4, help="arXiv 分片并发请求数（只重叠网络延迟，总速率仍由 --arxiv-min-interval 限制）")
+    parser.add_argument(
+        "--arxiv-min-interval",
+        type=float,
+        default=3.0,
+        help="arXiv 全局请求最小间隔（秒，所有分片共享；默认遵循 arXiv API 每 3 秒一次请求的要求，并发只重叠延迟、不提高吞吐）",
+    )
+    parser.add_argument("--no-raw-cache", action="store_true", help="不读写 arXiv 原始页缓存（data/cache/arxiv）")
+    parser.add_argument("--closed-after-days", type=int, default=7, help="分片窗口结束超过 N 天视为不可变，直接使用缓存")
+    parser.add_argument("--no-paper-store", action="store_true", help="不使用论文库（data/state/papers.sqlite3），全部阶段从头计算")
     args = parser.parse_args()
     # 若三者均未提供，后续将使用 utils.dates.derive_label 自动推导标签
 
@@ -65,6 +79,11 @@ def main() -> None:
         output_dir=dirs["raw"],
         submitted_start=submitted_start,
         submitted_end=submitted_end,
+        shard_days=args.shard_days,
+        concurrency=args.arxiv_concurrency,
+        min_interval=args.arxiv_min_interval,
+        cache_dir=None if args.no_raw_cache else dirs["cache"] / "arxiv",
+        closed_after_days=args.closed_after_days,
     )
 
     logger.info("Parsing raw records")
@@ -76,19 +95,36 @@ def main() -> None:
     logger.info("Deduplicating %d papers", len(papers))
     unique_papers = deduplicate_papers(papers)
 
-    logger.info("Filtering high quality and institution-focused papers")
-    high_quality = filter_high_quality(unique_papers, min_score=2, require_institution=True)
-
-    logger.info("Classifying papers")
-    classified = classify_papers(high_quality)
-
-    logger.info("Summarizing papers")
-    summarized = summarize_papers(classified)
+    # 一次扫描提取全部关键词特征，质量筛选、分类、排名与报告复用
+    logger.info("Extracting text features")
+    extract_features(unique_papers)
 
-    # Download PDFs
-    logger.info("Downloading PDFs for finalized papers")
     pdf_dir = dirs["raw"] / "pdfs"
-    download_pdfs(summarized, pdf_dir)
+    analyses = None
+    if not args.no_paper_store:
+        # 增量：仅对新增/变化的论文打分与分类，PDF 与 LLM 分析复用论文库中的结果
+        logger.info("Processing papers incrementally via paper store")
+        store = PaperStore(dirs["state"] / "papers.sqlite3")
+        try:
+            summarized, analyses = process_incremental(
+                unique_papers, store, pdf_dir=pdf_dir, min_score=2, require_institution=True, llm_budget=20
+            )
+            logger.info("Paper store stats: %s", store.get_stats())
+        finally:
+            store.close()
+    else:
+        logger.info("Filtering high quality and institution-focused papers")
+        high_quality = filter_high_quality(unique_papers, min_score=2, require_institution=True)
+
+        logger.info("Classifying papers")
+        classified = classify_papers(high_quality)
+
+        logger.info("Summarizing papers")
+        summarized = summarize_papers(classified)
+
+        # Download PDFs
+        logger.info("Downloading PDFs for finalized papers")
+        download_pdfs(summarized, pdf_dir)
 
     logger.info("Exporting outputs")
     export_all(summarized, export_dir=dirs["exports"], month=label)
@@ -101,8 +137,11 @@ def main() -> None:
     export_statistics(stats, Path(dirs["exports"]) / f"{label}-stats.json")
 
     # LLM analysis + Top10 selection
-    logger.info("Running LLM analysis and selecting Top10")
-    analyses = analyze_with_llm(summarized, budget=20)
+    if analyses is None:
+        logger.info("Running LLM analysis and selecting Top10")
+        analyses = analyze_with_llm(summarized, budget=20)
+    else:
+        logger.info("Selecting Top10 from stored and new LLM analyses")
     top10 = select_top_k(summarized, analyses, k=50)
     export_top10(top10, Path(dirs["exports"]) / f"{label}-top10.json")
     ranked = rank_papers(summarized, analyses)
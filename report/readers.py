@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import gzip
 import json
 import logging
 import re
-from datetime import datetime, timezone
+import sqlite3
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+try:  # 可选依赖：get_agent_news 的 Parquet 列式导出
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+except ImportError:  # pragma: no cover
+    pa = None
+    pa_ds = None
+
+from common.parquet_filters import time_range_filter
 
 from .models import NewsAggItem, PaperItem, ReleaseAggItem
 from .utils import parse_iso_flexible, within_range
@@ -145,6 +156,176 @@ def extract_summaries_from_markdown(content: str, title_to_summary: Dict[str, st
                 title_to_summary[title] = summary
 
 
+def _open_news_score_cache(news_exports_root: Path, logger: logging.Logger) -> Optional[sqlite3.Connection]:
+    """打开 get_agent_news 的 LLM 打分缓存（data/state/llm_scores.sqlite3，与 exports 同级），不存在则返回 None"""
+    db_path = news_exports_root.parent / "state" / "llm_scores.sqlite3"
+    if not db_path.exists():
+        return None
+    try:
+        return sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro", uri=True)
+    except Exception as e:
+        logger.debug("打开打分缓存失败: %s, %s", db_path, e)
+        return None
+
+
+def _lookup_news_score(conn: Optional[sqlite3.Connection], url_hash: str) -> Optional[float]:
+    if conn is None or not url_hash:
+        return None
+    try:
+        row = conn.execute("SELECT score FROM llm_scores WHERE url_hash = ?", (url_hash,)).fetchone()
+    except Exception:
+        return None
+    return float(row[0]) if row else None
+
+
+def _open_news_content_cache(news_exports_root: Path, logger: logging.Logger) -> Optional[sqlite3.Connection]:
+    """打开 get_agent_news 的正文抽取缓存（data/state/article_content.sqlite3），不存在则返回 None"""
+    db_path = news_exports_root.parent / "state" / "article_content.sqlite3"
+    if not db_path.exists():
+        return None
+    try:
+        return sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro", uri=True)
+    except Exception as e:
+        logger.debug("打开正文缓存失败: %s, %s", db_path, e)
+        return None
+
+
+def _lookup_news_text(conn: Optional[sqlite3.Connection], url_hash: str, limit: int = 300) -> str:
+    """按 url_hash 读取缓存正文的开头部分（作为摘要补充）"""
+    if conn is None or not url_hash:
+        return ""
+    try:
+        row = conn.execute(
+            "SELECT substr(text, 1, ?) FROM article_content WHERE url_hash = ? AND status = 'ok'",
+            (limit * 2, url_hash),
+        ).fetchone()
+    except Exception:
+        return ""
+    if not row or not row[0]:
+        return ""
+    flat = " ".join(row[0].split())
+    return flat if len(flat) <= limit else flat[:limit].rstrip() + "…"
+
+
+# 与 get_agent_news 的 runs.json 索引版本保持一致
+_RUNS_INDEX_VERSION = 1
+
+_NEWS_COLUMNS = ["title", "url", "published_at", "fetched_at", "source", "source_type", "tags", "score", "url_hash", "summary"]
+
+
+def _iter_news_parquet(parquet_dir: Path, start_dt: datetime, end_dt: datetime) -> Iterator[Dict[str, Any]]:
+    """读取 parquet/date=YYYY-MM-DD/ 分区导出：只读所需列，日期分区与时间范围谓词下推到扫描层"""
+    expr = time_range_filter(start_dt, end_dt, "date")
+    dataset = pa_ds.dataset(
+        str(parquet_dir),
+        format="parquet",
+        partitioning=pa_ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+    )
+    for row in dataset.to_table(columns=_NEWS_COLUMNS, filter=expr).to_pylist():
+        for key in ("published_at", "fetched_at"):
+            if row.get(key) is not None:
+                row[key] = row[key].isoformat()
+        yield row
+
+
+def _iter_news_jsonl(jsonl: Path) -> Iterator[Dict[str, Any]]:
+    opener = gzip.open if jsonl.suffix == ".gz" else open
+    with opener(jsonl, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
+
+def _load_news_compaction_manifest(news_exports_root: Path, logger: logging.Logger) -> Dict[str, Any]:
+    """读取 get_agent_news 压缩分区清单（_compacted/manifest.json），不存在时返回空清单"""
+    manifest_path = news_exports_root / "_compacted" / "manifest.json"
+    if not manifest_path.exists():
+        return {"runs": {}, "partitions": {}}
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8")) or {}
+    except Exception as e:
+        logger.warning("读取压缩清单失败，忽略压缩分区: %s", e)
+        return {"runs": {}, "partitions": {}}
+    return {"runs": data.get("runs") or {}, "partitions": data.get("partitions") or {}}
+
+
+def _list_news_runs(
+    news_exports_root: Path,
+    start_dt: datetime,
+    end_dt: datetime,
+    logger: logging.Logger,
+) -> List[Path]:
+    """列出可能包含时间范围内条目的运行目录
+
+    有运行索引（runs.json）时直接由索引条目生成运行列表：按每次运行记录的条目日期范围裁剪（前后各放宽一天，
+    未记录范围的运行照常读取），并跳过没有导出产物的运行（导出前失败的运行只留下清单）。
+    索引缺失或无法解析时才遍历导出根目录。
+    """
+    index_path = news_exports_root / "runs.json"
+    runs: Optional[List[Dict[str, Any]]] = None
+    if index_path.exists():
+        try:
+            data = json.loads(index_path.read_text(encoding="utf-8")) or {}
+            if data.get("version") == _RUNS_INDEX_VERSION and isinstance(data.get("runs"), list):
+                runs = data["runs"]
+            else:
+                logger.warning("运行索引版本不符，改为遍历运行目录: %s", index_path)
+        except Exception as e:
+            logger.warning("读取运行索引失败，改为遍历运行目录: %s", e)
+    if runs is None:
+        return [p for p in sorted(news_exports_root.iterdir()) if p.is_dir() and p.name != "_compacted"]
+
+    lo_day = (start_dt - timedelta(days=1)).strftime("%Y-%m-%d")
+    hi_day = (end_dt + timedelta(days=1)).strftime("%Y-%m-%d")
+    selected: List[Path] = []
+    for entry in sorted((r for r in runs if isinstance(r, dict) and r.get("run")), key=lambda r: r["run"]):
+        # formats 为空表示该运行没有任何导出产物；旧索引条目没有该字段，照常读取
+        if entry.get("formats") == []:
+            continue
+        date_range = entry.get("date_range")
+        if date_range and (date_range[1][:10] < lo_day or date_range[0][:10] > hi_day):
+            continue
+        run_dir = news_exports_root / entry["run"]
+        if run_dir.is_dir():
+            selected.append(run_dir)
+    logger.debug("运行索引裁剪: 索引运行 %s 个，读取 %s 个", len(runs), len(selected))
+    return selected
+
+
+def _iter_news_rows(
+    news_exports_root: Path,
+    start_dt: datetime,
+    end_dt: datetime,
+    logger: logging.Logger,
+) -> Iterator[Dict[str, Any]]:
+    """按时间顺序产出资讯导出行：先读与时间范围重叠的月度压缩分区，再读未压缩的运行目录
+
+    已并入压缩分区的运行目录（在保留期内尚未删除）会被跳过，避免重复。
+    """
+    manifest = _load_news_compaction_manifest(news_exports_root, logger)
+    compacted_runs = set(manifest["runs"])
+    # 前后各放宽一天，避免时区差异导致月初/月末条目被误裁剪
+    lo_month = (start_dt - timedelta(days=1)).strftime("%Y-%m")
+    hi_month = (end_dt + timedelta(days=1)).strftime("%Y-%m")
+    for month in sorted(manifest["partitions"]):
+        if not (lo_month <= month <= hi_month):
+            continue
+        part = news_exports_root / "_compacted" / manifest["partitions"][month].get("file", "")
+        if part.is_file():
+            yield from _iter_news_jsonl(part)
+    for run_dir in _list_news_runs(news_exports_root, start_dt, end_dt, logger):
+        if run_dir.name in compacted_runs:
+            continue
+        parquet_dir = run_dir / "parquet"
+        jsonl = run_dir / "news.jsonl"
+        if pa is not None and parquet_dir.is_dir():
+            yield from _iter_news_parquet(parquet_dir, start_dt, end_dt)
+        elif jsonl.exists():
+            yield from _iter_news_jsonl(jsonl)
+
+
 def read_news(
     news_exports_root: Path,
     start_dt: datetime,
@@ -162,9 +343,7 @@ def read_news(
     
     # 先读取markdown文件提取摘要
     try:
-        for run_dir in sorted(news_exports_root.iterdir()):
-            if not run_dir.is_dir():
-                continue
+        for run_dir in _list_news_runs(news_exports_root, start_dt, end_dt, logger):
             markdown_root = run_dir / "markdown" / "news"
             if markdown_root.exists():
                 # 遍历日期目录结构 YYYY/MM/DD/YYYY-MM-DD.md
@@ -188,46 +367,51 @@ def read_news(
     except Exception as e:
         logger.warning("读取markdown摘要失败: %s", e)
     
-    # 读取jsonl文件
+    # 读取导出数据：月度压缩分区 + 未压缩的运行目录；运行目录有 Parquet 分区且安装了 pyarrow 时
+    # 按列与时间范围下推读取，否则逐行解析jsonl（分数优先取导出字段，缺失时查询打分缓存）
+    score_conn = _open_news_score_cache(news_exports_root, logger)
+    content_conn = _open_news_content_cache(news_exports_root, logger)
     try:
-        for run_dir in sorted(news_exports_root.iterdir()):
-            if not run_dir.is_dir():
-                continue
-            jsonl = run_dir / "news.jsonl"
-            if not jsonl.exists():
-                continue
-            with jsonl.open("r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        row = json.loads(line)
-                    except Exception:
-                        continue
-                    pub_dt = parse_iso_flexible(row.get("published_at") or "")
-                    fetched_dt = parse_iso_flexible(row.get("fetched_at") or "")
-                    basis = pub_dt or fetched_dt
-                    if within_range(basis, start_dt, end_dt):
-                        title = row.get("title") or ""
-                        # 添加摘要信息到tags（临时存储，后续会提取）
-                        summary = title_to_summary.get(title, "")
-                        tags = row.get("tags") or []
-                        if summary:
-                            # 将完整摘要作为额外信息存储（不截断，后续在显示时再截断）
-                            tags.append(f"摘要: {summary}")
-                        
-                        items.append(
-                            NewsAggItem(
-                                title=title,
-                                url=row.get("url") or "",
-                                published_at=row.get("published_at"),
-                                fetched_at=row.get("fetched_at") or "",
-                                source=row.get("source") or "",
-                                source_type=row.get("source_type") or "",
-                                tags=tags,
-                                score=None,
-                            )
-                        )
+        for row in _iter_news_rows(news_exports_root, start_dt, end_dt, logger):
+            pub_dt = parse_iso_flexible(row.get("published_at") or "")
+            fetched_dt = parse_iso_flexible(row.get("fetched_at") or "")
+            basis = pub_dt or fetched_dt
+            if within_range(basis, start_dt, end_dt):
+                title = row.get("title") or ""
+                # 添加摘要信息到tags（临时存储，后续会提取）
+                # Markdown 中没有摘要时依次使用导出行自带的摘要（运行目录被清理后压缩分区仍保留）、正文补全阶段缓存的正文
+                summary = (
+                    title_to_summary.get(title, "")
+                    or (row.get("summary") or "").strip()
+                    or _lookup_news_text(content_conn, row.get("url_hash") or "")
+                )
+                tags = row.get("tags") or []
+                if summary:
+                    # 将完整摘要作为额外信息存储（不截断，后续在显示时再截断）
+                    tags.append(f"摘要: {summary}")
+                
+                score = row.get("score")
+                if score is None:
+                    score = _lookup_news_score(score_conn, row.get("url_hash") or "")
+                items.append(
+                    NewsAggItem(
+                        title=title,
+                        url=row.get("url") or "",
+                        published_at=row.get("published_at"),
+                        fetched_at=row.get("fetched_at") or "",
+                        source=row.get("source") or "",
+                        source_type=row.get("source_type") or "",
+                        tags=tags,
+                        score=score,
+                    )
+                )
     except Exception as e:
         logger.exception("Failed reading news: %s", e)
+    finally:
+        if score_conn is not None:
+            score_conn.close()
+        if content_conn is not None:
+            content_conn.close()
     return items
 
 